@@ -22,10 +22,13 @@ See class prolog below for details.
 import json
 import re
 import sys
+import time
 from json.decoder import JSONDecodeError
 
 import func_args as fa
 import gen_print as gp
+import redfish_enumeration as rfe
+import redfish_fleet as rfl
 from redfish.rest.v1 import InvalidCredentialsError
 from redfish_plus import redfish_plus
 from robot.libraries.BuiltIn import BuiltIn
@@ -33,6 +36,12 @@ from urllib.parse import urlparse
 
 MTLS_ENABLED = BuiltIn().get_variable_value("${MTLS_ENABLED}")
 
+# JsonSchemas, SessionService or URLs containing # are not required in enumeration.
+# Example: '/redfish/v1/JsonSchemas/' and sub resources.
+#          '/redfish/v1/SessionService'
+#          '/redfish/v1/Managers/${BMC_ID}/Oem'
+enumeration_skip_list = ["JsonSchemas", "SessionService", "#"]
+
 
 class bmc_redfish(redfish_plus):
     r"""
@@ -58,8 +67,12 @@ class bmc_redfish(redfish_plus):
         likewise be deleted.
         """
         self.__inited__ = False
+        self.__level_timings = []
+        self.__protocol_features = None
+        self.__fleet = None
         try:
             if MTLS_ENABLED == "True":
+                self.set_mtls_base_url(args[0] if args else kwargs["base_url"])
                 self.__inited__ = True
             else:
                 super(bmc_redfish, self).__init__(*args, **kwargs, default_prefix='/redfish/v1')
@@ -96,6 +109,8 @@ class bmc_redfish(redfish_plus):
         username, args, kwargs = fa.pop_arg(bmc_username, *args, **kwargs)
         password, args, kwargs = fa.pop_arg(bmc_password, *args, **kwargs)
         auth, args, kwargs = fa.pop_arg("session", *args, **kwargs)
+        # Cached responses may not be visible to the user logging in.
+        self.clear_response_cache()
 
         try:
             super(bmc_redfish, self).login(
@@ -137,6 +152,7 @@ class bmc_redfish(redfish_plus):
         if MTLS_ENABLED == "True":
             return None
         else:
+            self.clear_response_cache()
             super(bmc_redfish, self).logout()
 
     def get_properties(self, *args, **kwargs):
@@ -213,66 +229,69 @@ class bmc_redfish(redfish_plus):
         return self.get_session_key(), self.get_session_location()
 
     def enumerate(
-        self, resource_path, return_json=1, include_dead_resources=False
+        self,
+        resource_path,
+        return_json=1,
+        include_dead_resources=False,
+        max_workers=1,
+        expand=0,
+        output_file=None,
     ):
         r"""
         Perform a GET enumerate request and return available resource paths.
 
+        The tree is walked breadth-first.  The time taken by each level of the
+        walk is saved and may be retrieved with get_enumeration_timings().
+
+        If expand is set and the BMC supports the $expand query (see
+        get_protocol_features), each resource is fetched along with its
+        subordinate resources so that, for example, a whole collection is
+        obtained with one request.  The result is the same as that of a walk
+        without $expand.
+
         Description of argument(s):
         resource_path               URI resource absolute path (e.g. "/redfish/v1/SessionService/Sessions").
         return_json                 Indicates whether the result should be returned as a json string or as a
                                     dictionary.
         include_dead_resources      Check and return a list of dead/broken URI resources.
+        max_workers                 The maximum number of concurrent GET requests used to fetch each level
+                                    of the tree.  The default of 1 fetches resources one at a time.
+        expand                      The number of levels of subordinate resources to request with each GET
+                                    when the BMC supports $expand.  The default of 0 disables the use of
+                                    $expand.
+        output_file                 The path of a file to which each resource is written as a line of
+                                    newline-delimited JSON as soon as it is fetched (see
+                                    redfish_enumeration.write_ndjson).  The resources are not kept in
+                                    memory and output_file is returned in place of the result.
+
+        Example robot code:
+
+        ${resources}=  Redfish.Enumerate  /redfish/v1  max_workers=8
+        ${timings}=  Redfish.Get Enumeration Timings
+        Redfish.Enumerate  /redfish/v1  output_file=${EXECDIR}/redfish_tree.ndjson
         """
 
         gp.qprint_executing(style=gp.func_line_style_short)
         # Set quiet variable to keep subordinate get() calls quiet.
         quiet = 1
 
-        self.__result = {}
-        # Variable to hold the pending list of resources for which enumeration is yet to be obtained.
-        self.__pending_enumeration = set()
-        self.__pending_enumeration.add(resource_path)
-
-        # Variable having resources for which enumeration is completed.
-        enumerated_resources = set()
         dead_resources = {}
-        resources_to_be_enumerated = (resource_path,)
-        while resources_to_be_enumerated:
-            for resource in resources_to_be_enumerated:
-                # JsonSchemas, SessionService or URLs containing # are not required in enumeration.
-                # Example: '/redfish/v1/JsonSchemas/' and sub resources.
-                #          '/redfish/v1/SessionService'
-                #          '/redfish/v1/Managers/${BMC_ID}/Oem'
-                if (
-                    ("JsonSchemas" in resource)
-                    or ("SessionService" in resource)
-                    or ("#" in resource)
-                ):
-                    continue
+        resources = self.enumerate_iter(
+            resource_path,
+            dead_resources if include_dead_resources else None,
+            max_workers,
+            expand,
+        )
 
-                self._rest_response_ = self.get(
-                    resource, valid_status_codes=[200, 404, 500]
-                )
-                # Enumeration is done for available resources ignoring the ones for which response is not
-                # obtained.
-                if self._rest_response_.status != 200:
-                    if include_dead_resources:
-                        try:
-                            dead_resources[self._rest_response_.status].append(
-                                resource
-                            )
-                        except KeyError:
-                            dead_resources[self._rest_response_.status] = [
-                                resource
-                            ]
-                    continue
-                self.walk_nested_dict(self._rest_response_.dict, url=resource)
+        if output_file is not None:
+            rfe.write_ndjson(resources, output_file)
+            gp.lprint_varx("enumeration_level_timings", self.__level_timings)
+            if include_dead_resources:
+                return output_file, dead_resources
+            return output_file
 
-            enumerated_resources.update(set(resources_to_be_enumerated))
-            resources_to_be_enumerated = tuple(
-                self.__pending_enumeration - enumerated_resources
-            )
+        self.__result = dict(resources)
+        gp.lprint_varx("enumeration_level_timings", self.__level_timings)
 
         if return_json:
             if include_dead_resources:
@@ -298,9 +317,218 @@ class bmc_redfish(redfish_plus):
             else:
                 return self.__result
 
+    def enumerate_iter(
+        self, resource_path, dead_resources=None, max_workers=1, expand=0
+    ):
+        r"""
+        Perform a GET enumerate request and yield a (resource path, resource)
+        tuple for each resource as soon as it has been fetched.
+
+        Only the resource paths seen so far are kept in memory.  See
+        enumerate() for details of the walk.
+
+        Description of argument(s):
+        resource_path               URI resource absolute path (e.g. "/redfish/v1/SessionService/Sessions").
+        dead_resources              A dictionary to which dead/broken URI resources are added, keyed by
+                                    status code, or None.
+        max_workers                 See enumerate() for details.
+        expand                      See enumerate() for details.
+
+        Example code:
+
+        for resource, data in bmc_redfish.enumerate_iter("/redfish/v1"):
+            ...
+        """
+
+        # Set quiet variable to keep subordinate get() calls quiet.
+        quiet = 1
+
+        self.__result = {}
+        # Variable to hold the pending list of resources for which enumeration is yet to be obtained.
+        self.__pending_enumeration = set()
+        self.__pending_enumeration.add(resource_path)
+        self.__level_timings = []
+        query = ""
+        if int(expand):
+            query = rfe.get_expand_query(
+                self.get_protocol_features(), levels=expand
+            )
+
+        # Variable having resources for which enumeration is completed.
+        enumerated_resources = set()
+        resources_to_be_enumerated = (resource_path,)
+        while resources_to_be_enumerated:
+            start_time = time.time()
+            expanded_resources = {}
+            resources_to_fetch = [
+                resource
+                for resource in resources_to_be_enumerated
+                if not rfe.skip_resource(resource, enumeration_skip_list)
+            ]
+            responses = rfe.fetch_resources(
+                self.get,
+                resources_to_fetch,
+                [200, 404, 500],
+                max_workers,
+                query,
+            )
+            for resource, response in responses:
+                self._rest_response_ = response
+                # Enumeration is done for available resources ignoring the ones for which response is not
+                # obtained.
+                if self._rest_response_.status != 200:
+                    if dead_resources is not None:
+                        try:
+                            dead_resources[self._rest_response_.status].append(
+                                resource
+                            )
+                        except KeyError:
+                            dead_resources[self._rest_response_.status] = [
+                                resource
+                            ]
+                    continue
+                data = self._rest_response_.dict
+                if "$expand" in query:
+                    data, embedded_resources = rfe.split_expanded_resource(
+                        data
+                    )
+                    expanded_resources.update(embedded_resources)
+                self.walk_nested_dict(data, url=resource)
+                # walk_nested_dict saves the resource in self.__result.  Hand it to the caller instead of
+                # keeping it.
+                while self.__result:
+                    yield self.__result.popitem()
+
+            rfe.add_level_timing(
+                self.__level_timings, len(resources_to_fetch), start_time
+            )
+            enumerated_resources.update(
+                rfe.normalize_uri(resource)
+                for resource in resources_to_be_enumerated
+            )
+            rfe.walk_expanded_resources(
+                self.walk_nested_dict,
+                expanded_resources,
+                self.__pending_enumeration,
+                enumerated_resources,
+                enumeration_skip_list,
+            )
+            while self.__result:
+                yield self.__result.popitem()
+            resources_to_be_enumerated = rfe.next_frontier(
+                self.__pending_enumeration, enumerated_resources
+            )
+
+    def get_enumeration_timings(self):
+        r"""
+        Return the list of per-level timings recorded by the last call to
+        enumerate().
+
+        Example result:
+
+        [
+            {'level': 0, 'resources': 1, 'seconds': 0.212},
+            {'level': 1, 'resources': 14, 'seconds': 0.934},
+            ...
+        ]
+        """
+
+        return self.__level_timings
+
+    def get_protocol_features(self):
+        r"""
+        Return the ProtocolFeaturesSupported dictionary from the service root.
+
+        The result is obtained once per object and is used to decide whether
+        the $expand and $select queries may be used.  An empty dictionary is
+        returned if the service root does not have ProtocolFeaturesSupported.
+
+        Example result:
+
+        {
+            'ExpandQuery': {'ExpandAll': True, 'Levels': True, 'Links': True,
+                            'MaxLevels': 6, 'NoLinks': True},
+            'SelectQuery': True,
+            ...
+        }
+        """
+
+        if self.__protocol_features is None:
+            # Set quiet variable to keep subordinate get() calls quiet.
+            quiet = 1
+            resp = self.get("/redfish/v1", valid_status_codes=[])
+            if resp.status == 200:
+                self.__protocol_features = resp.dict.get(
+                    "ProtocolFeaturesSupported", {}
+                )
+            else:
+                self.__protocol_features = {}
+
+        return self.__protocol_features
+
+    def fleet_request(
+        self, method_name, *args, hosts=None, max_workers=16, timeout=None, **kwargs
+    ):
+        r"""
+        Run the same read-only query concurrently against many BMCs and return a host-keyed result table.
+        See redfish_fleet.py for details.
+
+        Each BMC gets its own bmc_redfish object, which is logged in on first use and kept for later calls
+        until fleet_logout is called.
+
+        Example robot code:
+
+        ${versions}=  Redfish.Fleet Request  get_attribute  /redfish/v1/Managers/${BMC_ID}
+        ...  FirmwareVersion  hosts=${EXECDIR}/rack1_inventory.txt
+        Rprint Vars  versions
+
+        Output:
+
+        versions:
+          [bmc-rack1-01]:
+            [result]:                                 2.14.0
+            [error]:                                  None
+            [seconds]:                                0.231
+          [bmc-rack1-02]:
+            [result]:                                 None
+            [error]:                                  ConnectionError: ...
+            [seconds]:                                10.012
+
+        Description of argument(s):
+        method_name                 The name of the bmc_redfish method to be called for each BMC: one of
+                                    "get", "head", "get_properties", "get_attribute", "get_members_list" or
+                                    "enumerate" (see redfish_fleet.fleet_methods).  Any other name
+                                    raises ValueError.  Responses are replaced by their dictionaries in the
+                                    result table.
+        args                        The positional arguments of the method.
+        hosts                       The BMCs: a list of hosts, a comma or space separated string of hosts or
+                                    the path of an inventory file.  The default is ${BMC_HOSTS}.
+        max_workers                 The maximum number of BMCs queried at once.
+        timeout                     The timeout in seconds for each request, or None for the default (see
+                                    redfish_retry_policy.py).
+        kwargs                      The keyword arguments of the method.
+        """
+
+        if self.__fleet is None:
+            self.__fleet = rfl.fleet_class(self.__class__)
+        self.__fleet.max_workers = int(max_workers)
+        results = self.__fleet.run(hosts, method_name, args, kwargs, timeout)
+        gp.lprint_varx("fleet_results", results)
+
+        return results
+
+    def fleet_logout(self):
+        r"""
+        Log out of the BMCs logged in to by fleet_request.
+        """
+
+        if self.__fleet is not None:
+            self.__fleet.logout()
+
     def walk_nested_dict(self, data, url=""):
         r"""
-        Parse through the nested dictionary and get the resource id paths.
+        Parse through the nested dictionary and get the resource id paths.  See
+        redfish_enumeration.index_links for details.
 
         Description of argument(s):
         data                        Nested dictionary data from response message.
@@ -308,34 +536,24 @@ class bmc_redfish(redfish_plus):
         """
         url = url.rstrip("/")
 
-        for key, value in data.items():
-            # Recursion if nested dictionary found.
-            if isinstance(value, dict):
-                self.walk_nested_dict(value)
-            else:
-                # Value contains a list of dictionaries having member data.
-                if "Members" == key:
-                    if isinstance(value, list):
-                        for memberDict in value:
-                            self.__pending_enumeration.add(
-                                memberDict["@odata.id"]
-                            )
-                if "@odata.id" == key:
-                    value = value.rstrip("/")
-                    # Data for the given url.
-                    if value == url:
-                        self.__result[url] = data
-                    # Data still needs to be looked up,
-                    else:
-                        self.__pending_enumeration.add(value)
-
-    def get_members_list(self, resource_path, filter=None):
+        if rfe.index_links(data, url, self.__pending_enumeration):
+            self.__result[url] = data
+
+    def get_members_list(
+        self, resource_path, filter=None, prefetch=False, max_workers=4
+    ):
         r"""
         Return members list in a given URL.
 
+        Collections which are split into pages are followed through each
+        Members@odata.nextLink so that all members are returned.
+
         Description of argument(s):
         resource_path    URI resource absolute path (e.g. "/redfish/v1/AccountService/Accounts").
         filter           strings or regex
+        prefetch         If the BMC pages with $skip and reports Members@odata.count, compute the
+                         remaining page links and fetch them concurrently rather than one after another.
+        max_workers      The maximum number of pages to fetch concurrently when prefetch is set.
 
         /redfish/v1/AccountService/Accounts/
         {
@@ -364,19 +582,15 @@ class bmc_redfish(redfish_plus):
         Calling from robot code:
            ${resp}=  Redfish.Get Members List  /redfish/v1/AccountService/Accounts
            ${resp}=  Redfish.Get Members List  /redfish/v1/AccountService/Accounts  filter=root
+           ${resp}=  Redfish.Get Members List  ${LOG_ENTRIES_URI}  prefetch=${True}
         """
 
-        member_list = []
         self._rest_response_ = self.get(
             resource_path, valid_status_codes=[200]
         )
-
-        try:
-            for member in self._rest_response_.dict["Members"]:
-                member_list.append(member["@odata.id"])
-        except KeyError:
-            # Non Members child objects at the top level, ignore.
-            pass
+        member_list = self.get_paged_members(
+            self._rest_response_.dict, prefetch, max_workers
+        )
 
         # Filter elements in the list and return matched elements.
         if filter is not None:
@@ -384,3 +598,145 @@ class bmc_redfish(redfish_plus):
             return [x for x in member_list if re.match(regex, x)]
 
         return member_list
+
+    def get_paged_members(
+        self, page, prefetch=False, max_workers=4, expanded_resources=None
+    ):
+        r"""
+        Return the list of member URIs of a collection, following
+        Members@odata.nextLink through all of its pages.
+
+        Description of argument(s):
+        page                        The dictionary of the first page of the
+                                    collection.
+        prefetch                    See get_members_list for details.
+        max_workers                 See get_members_list for details.
+        expanded_resources          A dictionary to which expanded members
+                                    (see redfish_enumeration.split_expanded_resource)
+                                    are added, or None if the pages were not
+                                    fetched with $expand.
+        """
+
+        # Set quiet variable to keep subordinate get() calls quiet.
+        quiet = 1
+        member_list = []
+        pages = [page]
+        while pages:
+            for page in pages:
+                if expanded_resources is not None:
+                    page, embedded_resources = rfe.split_expanded_resource(
+                        page
+                    )
+                    expanded_resources.update(embedded_resources)
+                try:
+                    for member in page["Members"]:
+                        member_list.append(member["@odata.id"])
+                except KeyError:
+                    # Non Members child objects at the top level, ignore.
+                    pass
+            next_link = page.get("Members@odata.nextLink", None)
+            if next_link is None:
+                break
+            page_links = [next_link]
+            if prefetch:
+                page_links = rfe.predict_page_links(
+                    next_link,
+                    len(page.get("Members", [])),
+                    page.get("Members@odata.count", None),
+                )
+            pages = [
+                response.dict
+                for page_link, response in rfe.fetch_resources(
+                    self.get, page_links, [200], max_workers
+                )
+            ]
+
+        return member_list
+
+    def get_members_bodies(
+        self, resource_path, filter=None, select=None, max_workers=4, expand=0
+    ):
+        r"""
+        Return a dictionary of member URI: member resource for the members of a
+        given collection.
+
+        If expand is set, no filter is specified and the BMC supports the
+        $expand query, the collection and all of its members are fetched with
+        as few requests as possible.  Otherwise, the member list is obtained first (see
+        get_members_list), the filter is applied and only the matching members
+        are fetched, up to max_workers at a time.
+
+        Description of argument(s):
+        resource_path    URI resource absolute path (e.g. "/redfish/v1/AccountService/Accounts").
+        filter           strings or regex (see get_members_list).
+        select           A list of property names.  If specified, only these properties (and the
+                         "@odata" annotations) are returned for each member.  The $select query is
+                         used when the BMC supports it.
+        max_workers      The maximum number of member GET requests to have in flight at one time.
+        expand           If set, the $expand query is used (when the BMC supports it).
+
+        Example result:
+
+        {
+            '/redfish/v1/AccountService/Accounts/root': {
+                '@odata.id': '/redfish/v1/AccountService/Accounts/root',
+                'UserName': 'root',
+                ...
+            },
+            ...
+        }
+
+        Calling from robot code:
+           ${members}=  Redfish.Get Members Bodies  /redfish/v1/AccountService/Accounts
+           ${members}=  Redfish.Get Members Bodies  /redfish/v1/Systems  select=${['PowerState']}
+           ${members}=  Redfish.Get Members Bodies  ${LOG_ENTRIES_URI}  filter=1[0-9]  max_workers=8
+        """
+
+        # Set quiet variable to keep subordinate get() calls quiet.
+        quiet = 1
+        protocol_features = self.get_protocol_features()
+        expanded_resources = {}
+        member_list = None
+        if filter is None and int(expand):
+            query = rfe.get_expand_query(protocol_features)
+            if "$expand" in query:
+                self._rest_response_ = self.get(
+                    resource_path + query, valid_status_codes=[]
+                )
+                if self._rest_response_.status == 200:
+                    member_list = self.get_paged_members(
+                        self._rest_response_.dict,
+                        max_workers=max_workers,
+                        expanded_resources=expanded_resources,
+                    )
+        if member_list is None:
+            member_list = self.get_members_list(
+                resource_path, filter, max_workers=max_workers
+            )
+
+        select_query = rfe.get_expand_query(
+            protocol_features, levels=0, select=select
+        )
+        members = {}
+        resources_to_fetch = []
+        for member in member_list:
+            body = expanded_resources.get(rfe.normalize_uri(member), None)
+            if body is None:
+                resources_to_fetch.append(member)
+            else:
+                members[member] = body
+        for member, response in rfe.fetch_resources(
+            self.get, resources_to_fetch, [200], max_workers, select_query
+        ):
+            members[member] = response.dict
+
+        if select:
+            for member, body in members.items():
+                members[member] = {
+                    key: value
+                    for key, value in body.items()
+                    if key in select or key.startswith("@odata.")
+                }
+
+        # Return the members in collection order.
+        return {member: members[member] for member in member_list}
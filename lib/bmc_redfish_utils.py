@@ -19,10 +19,16 @@ r"""
 BMC redfish utility functions.
 """
 
+import heapq
 import json
+import random
 import re
+import time
 
+import func_args as fa
 import gen_print as gp
+import redfish_enumeration as rfe
+import redfish_snapshot as rs
 from robot.libraries.BuiltIn import BuiltIn
 
 MTLS_ENABLED = BuiltIn().get_variable_value("${MTLS_ENABLED}")
@@ -30,6 +36,194 @@ host = BuiltIn().get_variable_value("${BMC_HOST}")
 
 BMC_ID = BuiltIn().get_variable_value("${BMC_ID}", "bmc")
 
+# JsonSchemas, SessionService or URLs containing # are not required in
+# enumeration.
+# Example: '/redfish/v1/JsonSchemas/' and sub resources.
+#          '/redfish/v1/SessionService'
+#          '/redfish/v1/Managers/bmc#/Oem'
+enumeration_skip_list = [
+    "JsonSchemas",
+    "SessionService",
+    "PostCodes",
+    "Registries",
+    "Journal",
+    "#",
+]
+
+
+# Task states after which a task will not change state again.
+task_terminal_states = [
+    "Completed",
+    "Exception",
+    "Killed",
+    "Cancelled",
+]
+
+
+class task_monitor:
+    r"""
+    Follow one redfish task until it reaches an expected or terminal state.
+
+    The task is polled through its task monitor URI (the Location header of
+    the 202 response which started it) when one is known, so that the BMC's
+    Retry-After header can be honored.  Otherwise the Task resource itself is
+    polled.  Without Retry-After, the poll interval grows exponentially (with
+    random jitter) from min_interval up to max_interval.
+
+    See bmc_redfish_utils.wait_for_tasks_completion for an example.
+    """
+
+    def __init__(
+        self,
+        redfish,
+        task,
+        expected_states=None,
+        allowed_states=None,
+        min_interval=1,
+        max_interval=30,
+    ):
+        r"""
+        Create a task_monitor object.
+
+        Description of argument(s):
+        redfish                     The redfish object used to poll (e.g. a
+                                    bmc_redfish object).
+        task                        The task to be followed.  This may be a
+                                    task ID (e.g. "5"), a Task resource URI, a
+                                    task monitor URI or the response of the
+                                    request which started the task.
+        expected_states             A list of task states which end the wait.
+                                    Defaults to task_terminal_states.
+        allowed_states              A list of task states which are valid
+                                    while waiting or None.  If the task enters
+                                    any other state, ValueError is raised.
+        min_interval                The initial poll interval in seconds.
+        max_interval                The maximum poll interval in seconds.
+        """
+
+        self.__redfish = redfish
+        self.expected_states = expected_states or task_terminal_states
+        self.allowed_states = allowed_states
+        self.__min_interval = float(min_interval)
+        self.__max_interval = float(max_interval)
+        self.task_uri, self.monitor_uri = self.get_task_uris(task)
+        self.start_time = time.time()
+        self.polls = 0
+        self.task_state = None
+        self.result = None
+
+    @staticmethod
+    def get_task_uris(task):
+        r"""
+        Return a tuple of the Task resource URI and the task monitor URI for
+        the task (either may be None).
+
+        Description of argument(s):
+        task                        See __init__ for details.
+        """
+
+        if hasattr(task, "getheader"):
+            monitor_uri = task.getheader("Location")
+            try:
+                task_uri = task.dict.get("@odata.id", None)
+            except (AttributeError, ValueError):
+                task_uri = None
+            return task_uri, monitor_uri
+
+        task = str(task)
+        if not task.startswith("/"):
+            return "/redfish/v1/TaskService/Tasks/" + task, None
+        if "/TaskService/Tasks/" in task:
+            return task, None
+        return None, task
+
+    def get_delay(self, response):
+        r"""
+        Return the number of seconds to wait before the next poll.
+
+        Description of argument(s):
+        response                    The response to the last poll.
+        """
+
+        retry_after = response.getheader("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0)
+            except ValueError:
+                # An HTTP date rather than a number of seconds.
+                pass
+        interval = min(
+            self.__max_interval,
+            self.__min_interval * 2 ** max(self.polls - 1, 0),
+        )
+        return random.uniform(interval / 2, interval)
+
+    def poll(self):
+        r"""
+        Poll the task once.  Return None if the task has finished (see
+        self.result) or the number of seconds to wait before polling again.
+        """
+
+        # Set quiet variable to keep subordinate get() calls quiet.
+        quiet = 1
+        self.polls += 1
+        uri = self.monitor_uri or self.task_uri
+        response = self.__redfish.get(uri, valid_status_codes=[])
+        task = {}
+        if response.status in [200, 202]:
+            task = response.dict
+        if "TaskState" not in task:
+            if response.status == 202:
+                # Still running, but the BMC did not include the Task.
+                return self.get_delay(response)
+            if uri == self.task_uri:
+                raise ValueError(
+                    "The task could not be read:\n"
+                    + gp.sprint_vars(uri, response.status)
+                )
+            if self.task_uri is None:
+                if response.status not in [200, 201, 204, 404]:
+                    raise ValueError(
+                        "The task monitor returned an unexpected status:\n"
+                        + gp.sprint_vars(uri, response.status)
+                    )
+                # The task monitor now returns the operation's response
+                # (or has been deleted), so the task has completed.
+                task = {"TaskState": "Completed"}
+            else:
+                # The task monitor is gone.  Read the Task resource instead.
+                self.monitor_uri = None
+                response = self.__redfish.get(
+                    self.task_uri, valid_status_codes=[200]
+                )
+                task = response.dict
+
+        task_state = task.get("TaskState", "")
+        self.task_state = task_state
+        if (
+            self.allowed_states is not None
+            and task_state not in self.allowed_states
+        ):
+            raise ValueError(
+                "The task entered a state which is not allowed:\n"
+                + gp.sprint_vars(uri, task_state)
+            )
+        if task_state in self.expected_states or (
+            task_state in task_terminal_states
+        ):
+            self.result = {
+                "TaskState": task_state,
+                "TaskStatus": task.get("TaskStatus", None),
+                "Messages": task.get("Messages", []),
+                "PercentComplete": task.get("PercentComplete", None),
+                "task_uri": self.task_uri or task.get("@odata.id", None),
+                "elapsed_seconds": round(time.time() - self.start_time, 3),
+                "polls": self.polls,
+            }
+            return None
+
+        return self.get_delay(response)
+
 
 class bmc_redfish_utils(object):
     ROBOT_LIBRARY_SCOPE = "TEST SUITE"
@@ -40,6 +234,9 @@ class bmc_redfish_utils(object):
         """
         # Obtain a reference to the global redfish object.
         self.__inited__ = False
+        self.__level_timings = []
+        self.__etags = {}
+        self.__enumeration_diff = {}
         self._redfish_ = BuiltIn().get_library_instance("redfish")
 
         if host != "redfish-localhost":
@@ -191,16 +388,12 @@ class bmc_redfish_utils(object):
         }
         """
 
-        global target_list
-        target_list = []
-
         resp_dict = self.get_attribute(resource_path, "Actions")
         if resp_dict is None:
             return None
 
         # Recursively search the "target" key in the nested dictionary.
-        # Populate the target_list of target entries.
-        self.get_key_value_nested_dict(resp_dict, "target")
+        target_list = self.get_key_value_nested_dict(resp_dict, "target")
         # Return the matching target URL entry.
         for target in target_list:
             # target "/redfish/v1/Systems/${SYSTEM_ID}/Actions/ComputerSystem.Reset"
@@ -239,43 +432,83 @@ class bmc_redfish_utils(object):
 
         return member_list
 
-    def list_request(self, resource_path):
+    def list_request(self, resource_path, expand=0):
         r"""
         Perform a GET list request and return available resource paths.
+
+        If expand is set and the BMC supports the $expand query, the
+        subordinate resources of resource_path are obtained with the first
+        request rather than being fetched one at a time.
+
         Description of argument(s):
         resource_path  URI resource absolute path
                        (e.g. "/redfish/v1/SessionService/Sessions").
+        expand         If set, the $expand query is used (when the BMC
+                       supports it).
         """
         gp.qprint_executing(style=gp.func_line_style_short)
         # Set quiet variable to keep subordinate get() calls quiet.
         quiet = 1
         self.__pending_enumeration = set()
-        self._rest_response_ = self._redfish_.get(
-            resource_path, valid_status_codes=[200, 404, 500]
+        query = ""
+        if int(expand):
+            query = rfe.get_expand_query(
+                self._redfish_.get_protocol_features()
+            )
+        self._rest_response_ = rfe.fetch_resource(
+            self._redfish_.get, resource_path, [200, 404, 500], query
         )
 
         # Return empty list.
         if self._rest_response_.status != 200:
             return self.__pending_enumeration
-        self.walk_nested_dict(self._rest_response_.dict)
+        data = self._rest_response_.dict
+        expanded_resources = {}
+        if "$expand" in query:
+            data, expanded_resources = rfe.split_expanded_resource(data)
+        expanded_resources[rfe.normalize_uri(resource_path)] = data
+        self.walk_nested_dict(data)
         if not self.__pending_enumeration:
             return resource_path
         for resource in self.__pending_enumeration.copy():
-            self._rest_response_ = self._redfish_.get(
-                resource, valid_status_codes=[200, 404, 500]
-            )
+            data = expanded_resources.get(rfe.normalize_uri(resource), None)
+            if data is None:
+                self._rest_response_ = self._redfish_.get(
+                    resource, valid_status_codes=[200, 404, 500]
+                )
 
-            if self._rest_response_.status != 200:
-                continue
-            self.walk_nested_dict(self._rest_response_.dict)
+                if self._rest_response_.status != 200:
+                    continue
+                data = self._rest_response_.dict
+            self.walk_nested_dict(data)
         return list(sorted(self.__pending_enumeration))
 
     def enumerate_request(
-        self, resource_path, return_json=1, include_dead_resources=False
+        self,
+        resource_path,
+        return_json=1,
+        include_dead_resources=False,
+        max_workers=1,
+        expand=0,
+        output_file=None,
+        snapshot_file=None,
     ):
         r"""
         Perform a GET enumerate request and return available resource paths.
 
+        The tree is walked breadth-first.  The time taken by each level of the
+        walk is saved and may be retrieved with get_enumeration_timings().
+
+        If expand is set and the BMC supports the $expand query, each resource
+        is fetched along with its subordinate resources.  The result is the
+        same as that of a walk without $expand.
+
+        If snapshot_file is specified, the tree saved there by an earlier
+        enumeration is used to revalidate each resource with a conditional
+        GET, so that only new and changed resources are downloaded.  The new
+        tree is then saved to snapshot_file and the differences between the
+        two may be retrieved with get_enumeration_diff().
+
         Description of argument(s):
         resource_path               URI resource absolute path (e.g.
                                     "/redfish/v1/SessionService/Sessions").
@@ -284,6 +517,31 @@ class bmc_redfish_utils(object):
                                     dictionary.
         include_dead_resources      Check and return a list of dead/broken URI
                                     resources.
+        max_workers                 The maximum number of concurrent GET
+                                    requests used to fetch each level of the
+                                    tree.  The default of 1 fetches resources
+                                    one at a time.
+        expand                      The number of levels of subordinate
+                                    resources to request with each GET when
+                                    the BMC supports $expand.  The default of
+                                    0 disables the use of $expand.
+        output_file                 The path of a file to which each resource
+                                    is written as a line of newline-delimited
+                                    JSON as soon as it is fetched.  The
+                                    resources are not kept in memory and
+                                    output_file is returned in place of the
+                                    result.
+        snapshot_file               The path of a snapshot file (see
+                                    redfish_snapshot.py) to be revalidated
+                                    against and then updated.  $expand is not
+                                    used with a snapshot because conditional
+                                    GETs need the ETag of each resource.
+
+        Example robot code:
+
+        ${resources}=  redfish_utils.Enumerate Request  /redfish/v1
+        ...  snapshot_file=${EXECDIR}/redfish_snapshot.json
+        ${diff}=  redfish_utils.Get Enumeration Diff
         """
 
         gp.qprint_executing(style=gp.func_line_style_short)
@@ -293,7 +551,114 @@ class bmc_redfish_utils(object):
         # Set quiet variable to keep subordinate get() calls quiet.
         quiet = 1
 
-        # Variable to hold enumerated data.
+        snapshot = None
+        if snapshot_file is not None:
+            snapshot = rs.load_snapshot(snapshot_file)
+        dead_resources = {}
+        resources = self.enumerate_iter(
+            resource_path,
+            dead_resources if include_dead_resources else None,
+            max_workers,
+            expand,
+            snapshot,
+        )
+        new_snapshot = {}
+        if snapshot is not None:
+            resources = self.snapshot_resources(resources, new_snapshot)
+
+        if output_file is not None:
+            rfe.write_ndjson(resources, output_file)
+            result = output_file
+        else:
+            # Variable to hold enumerated data.
+            self.__result = dict(resources)
+            result = self.__result
+
+        gp.lprint_varx("enumeration_level_timings", self.__level_timings)
+
+        if snapshot is not None:
+            self.__enumeration_diff = rs.diff_snapshots(snapshot, new_snapshot)
+            rs.save_snapshot(new_snapshot, snapshot_file)
+            gp.lprint_varx("enumeration_diff", self.__enumeration_diff)
+
+        if output_file is not None:
+            if include_dead_resources:
+                return result, dead_resources
+            return result
+
+        if return_json:
+            if include_dead_resources:
+                return (
+                    json.dumps(
+                        self.__result,
+                        sort_keys=True,
+                        indent=4,
+                        separators=(",", ": "),
+                    ),
+                    dead_resources,
+                )
+            else:
+                return json.dumps(
+                    self.__result,
+                    sort_keys=True,
+                    indent=4,
+                    separators=(",", ": "),
+                )
+        else:
+            if include_dead_resources:
+                return self.__result, dead_resources
+            else:
+                return self.__result
+
+    def enumerate_iter(
+        self,
+        resource_path,
+        dead_resources=None,
+        max_workers=1,
+        expand=0,
+        snapshot=None,
+    ):
+        r"""
+        Perform a GET enumerate request and yield a (resource path, resource)
+        tuple for each resource as soon as it has been fetched.
+
+        Only the resource paths seen so far are kept in memory.  See
+        enumerate_request() for details of the walk.  The ETag of each
+        resource is saved for use by snapshot_resources().
+
+        Description of argument(s):
+        resource_path               URI resource absolute path (e.g.
+                                    "/redfish/v1/SessionService/Sessions").
+        dead_resources              A dictionary to which dead/broken URI
+                                    resources are added, keyed by status code,
+                                    or None.
+        max_workers                 See enumerate_request() for details.
+        expand                      See enumerate_request() for details.
+        snapshot                    A snapshot dictionary (see
+                                    redfish_snapshot.py) or None.  Resources
+                                    with an ETag in the snapshot are fetched
+                                    with a conditional GET and, if they have
+                                    not been modified, their snapshot body is
+                                    used.
+        """
+
+        # Set quiet variable to keep subordinate get() calls quiet.
+        quiet = 1
+
+        self.__etags = {}
+        etags = None
+        if snapshot is not None:
+            expand = 0
+            snapshot = {
+                rfe.normalize_uri(uri): entry for uri, entry in snapshot.items()
+            }
+            etags = {
+                uri: entry["etag"]
+                for uri, entry in snapshot.items()
+                if entry["etag"] is not None
+            }
+
+        # Variable to hold enumerated data until it is yielded.
         self.__result = {}
 
         # Variable to hold the pending list of resources for which enumeration.
@@ -302,38 +667,49 @@ class bmc_redfish_utils(object):
 
         self.__pending_enumeration.add(resource_path)
 
+        self.__level_timings = []
+
+        query = ""
+        if int(expand):
+            query = rfe.get_expand_query(
+                self._redfish_.get_protocol_features(), levels=expand
+            )
+
         # Variable having resources for which enumeration is completed.
         enumerated_resources = set()
 
-        if include_dead_resources:
-            dead_resources = {}
-
         resources_to_be_enumerated = (resource_path,)
 
         while resources_to_be_enumerated:
-            for resource in resources_to_be_enumerated:
-                # JsonSchemas, SessionService or URLs containing # are not
-                # required in enumeration.
-                # Example: '/redfish/v1/JsonSchemas/' and sub resources.
-                #          '/redfish/v1/SessionService'
-                #          '/redfish/v1/Managers/bmc#/Oem'
-                if (
-                    ("JsonSchemas" in resource)
-                    or ("SessionService" in resource)
-                    or ("PostCodes" in resource)
-                    or ("Registries" in resource)
-                    or ("Journal" in resource)
-                    or ("#" in resource)
-                ):
+            start_time = time.time()
+            expanded_resources = {}
+            resources_to_fetch = [
+                resource
+                for resource in resources_to_be_enumerated
+                if not rfe.skip_resource(resource, enumeration_skip_list)
+            ]
+            responses = rfe.fetch_resources(
+                self._redfish_.get,
+                resources_to_fetch,
+                [200, 404, 405, 500],
+                max_workers,
+                query,
+                etags,
+            )
+            for resource, response in responses:
+                self._rest_response_ = response
+                if self._rest_response_.status == 304:
+                    # Not modified since the snapshot was taken.
+                    uri = rfe.normalize_uri(resource)
+                    self.__etags[uri] = etags[uri]
+                    self.walk_nested_dict(snapshot[uri]["body"], url=resource)
+                    while self.__result:
+                        yield self.__result.popitem()
                     continue
-
-                self._rest_response_ = self._redfish_.get(
-                    resource, valid_status_codes=[200, 404, 405, 500]
-                )
                 # Enumeration is done for available resources ignoring the
                 # ones for which response is not obtained.
                 if self._rest_response_.status != 200:
-                    if include_dead_resources:
+                    if dead_resources is not None:
                         try:
                             dead_resources[self._rest_response_.status].append(
                                 resource
@@ -344,83 +720,240 @@ class bmc_redfish_utils(object):
                             ]
                     continue
 
-                self.walk_nested_dict(self._rest_response_.dict, url=resource)
+                data = self._rest_response_.dict
+                if "$expand" in query:
+                    data, embedded_resources = rfe.split_expanded_resource(
+                        data
+                    )
+                    expanded_resources.update(embedded_resources)
+                self.__etags[
+                    rfe.normalize_uri(resource)
+                ] = self._rest_response_.getheader("ETag")
+                self.walk_nested_dict(data, url=resource)
+                while self.__result:
+                    yield self.__result.popitem()
+
+            rfe.add_level_timing(
+                self.__level_timings, len(resources_to_fetch), start_time
+            )
+            enumerated_resources.update(
+                rfe.normalize_uri(resource)
+                for resource in resources_to_be_enumerated
+            )
+            rfe.walk_expanded_resources(
+                self.walk_nested_dict,
+                expanded_resources,
+                self.__pending_enumeration,
+                enumerated_resources,
+                enumeration_skip_list,
+            )
+            while self.__result:
+                yield self.__result.popitem()
+            resources_to_be_enumerated = rfe.next_frontier(
+                self.__pending_enumeration, enumerated_resources
+            )
+
+    def snapshot_resources(self, resources, snapshot):
+        r"""
+        Add a snapshot entry for each (resource path, resource) tuple from
+        enumerate_iter() to snapshot and yield the tuple unchanged.
+
+        Description of argument(s):
+        resources                   An iterable of (resource path, resource)
+                                    tuples.
+        snapshot                    The snapshot dictionary to be filled in.
+        """
 
-            enumerated_resources.update(set(resources_to_be_enumerated))
-            resources_to_be_enumerated = tuple(
-                self.__pending_enumeration - enumerated_resources
+        for resource, data in resources:
+            snapshot[resource] = rs.create_entry(
+                data, self.__etags.get(rfe.normalize_uri(resource), None)
             )
+            yield resource, data
 
-        if return_json:
-            if include_dead_resources:
-                return (
-                    json.dumps(
-                        self.__result,
-                        sort_keys=True,
-                        indent=4,
-                        separators=(",", ": "),
-                    ),
-                    dead_resources,
-                )
-            else:
-                return json.dumps(
-                    self.__result,
-                    sort_keys=True,
-                    indent=4,
-                    separators=(",", ": "),
-                )
-        else:
-            if include_dead_resources:
-                return self.__result, dead_resources
-            else:
-                return self.__result
+    def get_enumeration_diff(self):
+        r"""
+        Return the differences found by the last call to enumerate_request()
+        with a snapshot_file.  See redfish_snapshot.diff_snapshots for the
+        format.
+        """
+
+        return self.__enumeration_diff
+
+    def get_enumeration_timings(self):
+        r"""
+        Return the list of per-level timings recorded by the last call to
+        enumerate_request().
+
+        Example result:
+
+        [
+            {'level': 0, 'resources': 1, 'seconds': 0.212},
+            {'level': 1, 'resources': 14, 'seconds': 0.934},
+            ...
+        ]
+        """
+
+        return self.__level_timings
 
     def walk_nested_dict(self, data, url=""):
         r"""
         Parse through the nested dictionary and get the resource id paths.
+        See redfish_enumeration.index_links for details.
+
         Description of argument(s):
         data    Nested dictionary data from response message.
         url     Resource for which the response is obtained in data.
         """
         url = url.rstrip("/")
 
-        for key, value in data.items():
-            # Recursion if nested dictionary found.
-            if isinstance(value, dict):
-                self.walk_nested_dict(value)
-            else:
-                # Value contains a list of dictionaries having member data.
-                if "Members" == key:
-                    if isinstance(value, list):
-                        for memberDict in value:
-                            if isinstance(memberDict, str):
-                                self.__pending_enumeration.add(memberDict)
-                            else:
-                                self.__pending_enumeration.add(
-                                    memberDict["@odata.id"]
-                                )
-
-                if "@odata.id" == key:
-                    value = value.rstrip("/")
-                    # Data for the given url.
-                    if value == url:
-                        self.__result[url] = data
-                    # Data still needs to be looked up,
-                    else:
-                        self.__pending_enumeration.add(value)
+        if rfe.index_links(data, url, self.__pending_enumeration):
+            self.__result[url] = data
 
     def get_key_value_nested_dict(self, data, key):
         r"""
-        Parse through the nested dictionary and get the searched key value.
+        Parse through the nested dictionary and return a list of the values
+        of the searched key.  To look up many keys in an enumerated tree, use
+        redfish_index.py instead.
 
         Description of argument(s):
         data    Nested dictionary data from response message.
         key     Search dictionary key element.
         """
 
+        values = []
         for k, v in data.items():
             if isinstance(v, dict):
-                self.get_key_value_nested_dict(v, key)
+                values += self.get_key_value_nested_dict(v, key)
 
             if k == key:
-                target_list.append(v)
+                values.append(v)
+
+        return values
+
+    def wait_for_tasks_completion(
+        self,
+        tasks,
+        expected_states=None,
+        timeout=1500,
+        allowed_states=None,
+        fail_on_timeout=True,
+        min_interval=1,
+        max_interval=30,
+    ):
+        r"""
+        Wait for each of the tasks to reach one of the expected states (or a
+        terminal state) and return a list of completion dictionaries in the
+        same order as tasks.
+
+        The tasks are polled from a single schedule, each at its own pace (see
+        task_monitor), so waiting on many tasks costs no more polls than
+        waiting on each of them alone.
+
+        Example result:
+
+        [
+            {
+                'TaskState': 'Completed',
+                'TaskStatus': 'OK',
+                'Messages': [...],
+                'PercentComplete': 100,
+                'task_uri': '/redfish/v1/TaskService/Tasks/5',
+                'elapsed_seconds': 41.28,
+                'polls': 9,
+            },
+        ]
+
+        Description of argument(s):
+        tasks                       A list of tasks.  See task_monitor for the
+                                    forms a task may take.
+        expected_states             A list of task states which end the wait.
+                                    Defaults to task_terminal_states.
+        timeout                     The maximum number of seconds to wait.
+        allowed_states              A list of task states which are valid
+                                    while waiting or None.
+        fail_on_timeout             If set, raise ValueError when the timeout
+                                    expires.  Otherwise, the entry for each
+                                    unfinished task shows its last known state.
+        min_interval                See task_monitor for details.
+        max_interval                See task_monitor for details.
+
+        Example robot code:
+
+        ${results}=  redfish_utils.Wait For Tasks Completion  ${task_ids}
+        ...  expected_states=['Completed']  timeout=600
+        """
+
+        gp.qprint_executing(style=gp.func_line_style_short)
+        expected_states = fa.source_to_object(expected_states)
+        if isinstance(expected_states, str):
+            expected_states = [expected_states]
+        allowed_states = fa.source_to_object(allowed_states)
+        end_time = time.time() + float(timeout)
+
+        monitors = [
+            task_monitor(
+                self._redfish_,
+                task,
+                expected_states,
+                allowed_states,
+                min_interval,
+                max_interval,
+            )
+            for task in tasks
+        ]
+        schedule = [(0, ix) for ix in range(len(monitors))]
+        while schedule:
+            poll_time, ix = heapq.heappop(schedule)
+            if poll_time > end_time:
+                heapq.heappush(schedule, (poll_time, ix))
+                break
+            time.sleep(max(poll_time - time.time(), 0))
+            delay = monitors[ix].poll()
+            if delay is not None:
+                heapq.heappush(schedule, (time.time() + delay, ix))
+
+        if schedule:
+            unfinished = [
+                monitors[ix].task_uri or monitors[ix].monitor_uri
+                for poll_time, ix in schedule
+            ]
+            if fail_on_timeout:
+                raise ValueError(
+                    "The tasks did not complete within the timeout:\n"
+                    + gp.sprint_vars(unfinished, timeout)
+                )
+            for poll_time, ix in schedule:
+                monitors[ix].result = {
+                    "TaskState": monitors[ix].task_state,
+                    "TaskStatus": None,
+                    "Messages": [],
+                    "PercentComplete": None,
+                    "task_uri": monitors[ix].task_uri,
+                    "elapsed_seconds": round(
+                        time.time() - monitors[ix].start_time, 3
+                    ),
+                    "polls": monitors[ix].polls,
+                }
+
+        return [monitor.result for monitor in monitors]
+
+    def wait_for_task_completion(self, task, *args, **kwargs):
+        r"""
+        Wait for one task and return its completion dictionary.  See
+        wait_for_tasks_completion for details.
+
+        Description of argument(s):
+        task                        See task_monitor for the forms a task may
+                                    take.
+        args                        See wait_for_tasks_completion.
+        kwargs                      See wait_for_tasks_completion.
+
+        Example robot code:
+
+        ${resp}=  Redfish.Post  ${dump_action_uri}  body=${payload}
+        ...  valid_status_codes=[${HTTP_ACCEPTED}]
+        ${task}=  redfish_utils.Wait For Task Completion  ${resp}
+        Should Be Equal  ${task['TaskState']}  Completed
+        """
+
+        return self.wait_for_tasks_completion([task], *args, **kwargs)[0]
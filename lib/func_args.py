@@ -151,6 +151,10 @@ def source_to_object(value):
     # Strip white space prior to attempting to interpret the string as python code.
     value = value.strip()
 
+    # A python object definition cannot begin with "/", so skip the eval of paths (e.g. redfish URIs).
+    if value.startswith("/"):
+        return value
+
     # Try special case of collections.OrderedDict which accepts a list of tuple pairs.
     if value.startswith("[("):
         try:
@@ -1907,16 +1907,18 @@ def get_stack_var(var_name, default="", init_stack_ix=2):
                                     function calling this function, etc.
     """
 
-    work_around_inspect_stack_cwd_failure()
-    default = get_var_value(var_name=var_name, default=default)
-    return next(
-        (
-            frame[0].f_locals[var_name]
-            for frame in inspect.stack()[init_stack_ix:]
-            if var_name in frame[0].f_locals
-        ),
-        default,
-    )
+    # Walk the frame objects directly rather than calling inspect.stack(), which reads source context for
+    # every frame and is therefore expensive for a function called on every print.
+    try:
+        frame = sys._getframe(init_stack_ix)
+    except ValueError:
+        frame = None
+    while frame is not None:
+        if var_name in frame.f_locals:
+            return frame.f_locals[var_name]
+        frame = frame.f_back
+
+    return get_var_value(var_name=var_name, default=default)
 
 
 # hidden_text is a list of passwords which are to be replaced with asterisks by print functions defined in
@@ -22,7 +22,7 @@ programs.
 
 import re
 
-from robot.libraries.BuiltIn import BuiltIn
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
 
 
 def my_import_resource(path):
@@ -89,3 +89,20 @@ def my_import_resource(path):
                 BuiltIn().set_global_variable(
                     global_var_name, pre_var_dict[key]
                 )
+
+
+def get_robot_var_value(var_name, default=None):
+    r"""
+    Return the value of a robot variable, or default if it is not set or if
+    robot is not running (e.g. when a library module is used from a python
+    program or a doctest).
+
+    Description of arguments:
+    var_name   The variable name (e.g. "${OUTPUT DIR}").
+    default    The default value.
+    """
+
+    try:
+        return BuiltIn().get_variable_value(var_name, default)
+    except RobotNotRunningError:
+        return default
@@ -43,7 +43,10 @@ import gen_robot_keyword as grk
 import gen_robot_plug_in as grpi
 import gen_valid as gv
 import logging_utils as log
+import redfish_sse as rsse
+import redfish_state_probe as rsp
 import state as st
+import state_timeline as stl
 import var_stack as vs
 from boot_data import *
 from robot.libraries.BuiltIn import BuiltIn
@@ -93,6 +96,10 @@ redfish_delete_sessions = int(
     BuiltIn().get_variable_value("${REDFISH_DELETE_SESSIONS}", 1)
 )
 
+# Use the Redfish SSE listener to end state waits as soon as the BMC reports
+# a change.
+redfish_sse = int(BuiltIn().get_variable_value("${REDFISH_SSE}", 0))
+
 redfish = BuiltIn().get_library_instance("redfish")
 default_power_on = "Redfish Power On"
 default_power_off = "Redfish Hard Power Off"
@@ -382,6 +389,8 @@ def setup():
     gp.qprintn()
 
     redfish.login()
+    if redfish_sse:
+        rsse.start_redfish_sse_listener()
 
     set_default_siguser1()
     transitional_boot_selected = False
@@ -766,6 +775,7 @@ def run_boot(boot):
                 wait_time=state_change_timeout,
                 interval="10 seconds",
                 invert=1,
+                history_key=boot + " state change",
             )
 
         gp.qprintn()
@@ -777,6 +787,7 @@ def run_boot(boot):
             boot_table[boot]["end"],
             wait_time=boot_timeout,
             interval="10 seconds",
+            history_key=boot,
         )
 
     plug_in_setup()
@@ -818,10 +829,15 @@ def test_loop_body():
     boot_count += 1
     gp.qprint_timen("Starting boot " + str(boot_count) + ".")
 
+    # Record every state sample taken during the boot.
+    stl.start_state_timeline(next_boot)
     cmd_buf = ["run_boot", next_boot]
     boot_status, msg = BuiltIn().run_keyword_and_ignore_error(*cmd_buf)
     if boot_status == "FAIL":
         gp.qprint(msg)
+    phases = stl.stop_state_timeline(boot_status)
+    if phases is not None:
+        gp.qprint_var(phases)
 
     gp.qprintn()
     if boot_status == "PASS":
@@ -898,6 +914,9 @@ def obmc_boot_test_teardown():
             call_point="cleanup", stop_on_plug_in_failure=0
         )
 
+    stl.stop_state_timeline("FAIL")
+    stl.print_state_timeline_summary()
+
     if "boot_results_file_path" in globals():
         # Save boot_results and boot_history objects to a file in case they are
         # needed again.
@@ -947,6 +966,8 @@ def test_teardown():
     BuiltIn().run_keyword_if_timeout_occurred(*cmd_buf)
 
     redfish.logout()
+    rsp.close_redfish_state_probe()
+    rsse.stop_redfish_sse_listener()
 
     gp.qprint_pgm_footer()
 
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides the polling schedules used by state.wait_state.
+
+A schedule decides how long to wait before each poll.  The strategies are:
+
+fixed                               Poll every interval.
+exponential                         Poll after min_interval, then double the
+                                    delay after each poll, up to interval.
+learned                             Use the durations of earlier waits with
+                                    the same history key (e.g. the boot
+                                    type).  Polls are spaced out, by halving
+                                    the remaining time (but never beyond
+                                    interval), until the earliest expected
+                                    completion.  Then the state is
+                                    polled every min_interval until the
+                                    latest expected completion.  After that,
+                                    the delay doubles up to interval.  With
+                                    no history this is the same as fixed.
+
+Each delay is jittered by up to +/- jitter (a fraction) so that many
+machines polled at once do not stay in step.  No delay exceeds interval.
+
+The durations of successful waits are kept in a JSON history file so that
+the learned strategy improves from run to run.
+
+The defaults may be set in the robot config file:
+
+-v WAIT_STATE_POLL_STRATEGY:learned
+-v WAIT_STATE_MIN_INTERVAL:1
+-v WAIT_STATE_POLL_JITTER:0.1
+-v WAIT_STATE_HISTORY_FILE:<path>
+
+The default history file is wait_state_history.json in ${OUTPUT DIR}.
+"""
+
+import json
+import os
+import random
+import threading
+
+import gen_robot_utils as gru
+
+valid_strategies = ["fixed", "exponential", "learned"]
+
+# The number of durations kept for each history key.
+max_history = 20
+
+# The expected completion window of the learned strategy is widened by this
+# fraction on each side.
+window_margin = 0.2
+
+history_file_name = "wait_state_history.json"
+
+
+class poll_history_class:
+    r"""
+    The durations of earlier waits, keyed by history key and saved in a JSON
+    file.
+    """
+
+    def __init__(self, file_path):
+        r"""
+        Description of argument(s):
+        file_path                   The path of the history file.  It need
+                                    not exist.
+        """
+
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.durations = {}
+        if os.path.exists(file_path):
+            try:
+                with open(file_path, "r") as file:
+                    self.durations = json.load(file)
+            except ValueError:
+                self.durations = {}
+
+    def get_durations(self, key):
+        r"""
+        Return the list of durations (in seconds) recorded for key.
+
+        Description of argument(s):
+        key                         The history key (e.g. the boot type).
+        """
+
+        return list(self.durations.get(key, []))
+
+    def add_duration(self, key, seconds):
+        r"""
+        Record the duration of a successful wait and save the history file.
+
+        Description of argument(s):
+        key                         The history key.
+        seconds                     The duration of the wait.
+        """
+
+        with self.lock:
+            durations = self.durations.setdefault(key, [])
+            durations.append(round(seconds, 3))
+            del durations[:-max_history]
+            temp_file_path = self.file_path + ".tmp"
+            with open(temp_file_path, "w") as file:
+                json.dump(self.durations, file, indent=4, sort_keys=True)
+            os.replace(temp_file_path, self.file_path)
+
+
+# The history shared by all waits.  None until first used.
+history = None
+
+
+def get_poll_history():
+    r"""
+    Return the shared poll history, loading it on first use.
+    """
+
+    global history
+
+    if history is None:
+        file_path = gru.get_robot_var_value(
+            "${WAIT_STATE_HISTORY_FILE}", None
+        )
+        if file_path is None:
+            file_path = os.path.join(
+                gru.get_robot_var_value("${OUTPUT DIR}", "."),
+                history_file_name,
+            )
+        history = poll_history_class(file_path)
+
+    return history
+
+
+class poll_scheduler_class:
+    r"""
+    A polling schedule for one wait.  See the module description for
+    details.
+
+    Example code:
+
+    scheduler = poll_scheduler_class("learned", 10, history_key="Reboot")
+    while not done():
+        time.sleep(scheduler.next_delay(time.time() - start_time))
+    scheduler.record_success(time.time() - start_time)
+    """
+
+    def __init__(
+        self,
+        strategy=None,
+        interval=10,
+        min_interval=None,
+        jitter=None,
+        history_key="",
+    ):
+        r"""
+        Description of argument(s):
+        strategy                    One of valid_strategies.  The default is
+                                    ${WAIT_STATE_POLL_STRATEGY} or "learned".
+        interval                    The longest delay between polls in
+                                    seconds.
+        min_interval                The shortest delay between polls in
+                                    seconds.  The default is
+                                    ${WAIT_STATE_MIN_INTERVAL} or 1.
+        jitter                      The fraction by which each delay is
+                                    randomly varied.  The default is
+                                    ${WAIT_STATE_POLL_JITTER} or 0.1.
+        history_key                 The key under which the durations of
+                                    these waits are recorded (e.g. the boot
+                                    type).  If "", no history is used.
+        """
+
+        if strategy is None:
+            strategy = gru.get_robot_var_value(
+                "${WAIT_STATE_POLL_STRATEGY}", "learned"
+            )
+        if strategy not in valid_strategies:
+            raise ValueError(
+                "Invalid poll strategy \"" + str(strategy) + "\".  Valid"
+                " strategies are: " + ", ".join(valid_strategies) + "."
+            )
+        if min_interval is None:
+            min_interval = gru.get_robot_var_value(
+                "${WAIT_STATE_MIN_INTERVAL}", 1
+            )
+        if jitter is None:
+            jitter = gru.get_robot_var_value(
+                "${WAIT_STATE_POLL_JITTER}", 0.1
+            )
+        self.strategy = strategy
+        self.interval = float(interval)
+        self.min_interval = min(float(min_interval), self.interval)
+        self.jitter = float(jitter)
+        self.history_key = history_key
+        self.polls = 0
+        self.window = None
+        if strategy == "learned" and history_key:
+            durations = get_poll_history().get_durations(history_key)
+            if durations:
+                self.window = (
+                    min(durations) * (1 - window_margin),
+                    max(durations) * (1 + window_margin),
+                )
+
+    def get_delay(self, elapsed):
+        r"""
+        Return the unjittered delay in seconds before the next poll.
+
+        Description of argument(s):
+        elapsed                     The number of seconds since the wait
+                                    began.
+        """
+
+        if self.strategy == "exponential":
+            return min(
+                self.interval, self.min_interval * 2 ** (self.polls - 1)
+            )
+        if self.window is None:
+            return self.interval
+
+        window_start, window_end = self.window
+        if elapsed < window_start:
+            # Halve the time to the window, so that it is never overshot, but
+            # still poll at least every interval in case this boot is early.
+            return min(
+                self.interval,
+                max(self.min_interval, (window_start - elapsed) / 2),
+            )
+        if elapsed < window_end:
+            return self.min_interval
+        # Later than ever before: back off towards interval.
+        return min(
+            self.interval,
+            self.min_interval * 2 ** ((elapsed - window_end) / self.interval),
+        )
+
+    def next_delay(self, elapsed):
+        r"""
+        Count a poll which did not succeed and return the jittered delay in
+        seconds before the next poll.
+
+        Description of argument(s):
+        elapsed                     The number of seconds since the wait
+                                    began.
+        """
+
+        self.polls += 1
+        delay = self.get_delay(elapsed)
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        return min(self.interval, max(0.0, delay))
+
+    def record_success(self, seconds):
+        r"""
+        Record the duration of a successful wait in the history (if there is
+        a history key).
+
+        Description of argument(s):
+        seconds                     The duration of the wait.
+        """
+
+        if self.history_key:
+            get_poll_history().add_duration(self.history_key, seconds)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides an in-process host reachability prober, used by
+state.py for the ping, packet_loss and os_ping sub-states in place of
+running the ping program.
+
+Each probe of a host is one of the following, whichever answers first:
+
+- An ICMP echo request sent from an unprivileged ICMP datagram socket.  On
+  Linux these are permitted when the process's group is in
+  net.ipv4.ping_group_range.  Where they are not permitted, this is skipped.
+- A TCP connection attempt to each of the probe ports.  A completed
+  connection and a refused connection both show that the host is up.
+
+The ports and the use of ICMP may be set in the robot config file:
+
+-v REACHABILITY_PORTS:443,22,623
+-v REACHABILITY_ICMP:1
+"""
+
+import errno
+import itertools
+import re
+import select
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gen_robot_utils as gru
+
+default_ports = [443, 22, 623]
+
+# The errno values of a connection attempt which show that the host is up.
+up_errnos = [0, errno.EISCONN, errno.ECONNREFUSED]
+
+# The errno values of a non-blocking connection attempt which has not yet
+# finished.
+in_progress_errnos = [errno.EINPROGRESS, errno.EWOULDBLOCK]
+
+# Whether unprivileged ICMP datagram sockets are permitted for each address
+# family.  Set on first use.
+icmp_permitted = {}
+
+# ICMP echo request sequence numbers.
+sequence_numbers = itertools.count(1)
+sequence_lock = threading.Lock()
+
+
+def get_ports(ports=None):
+    r"""
+    Return a list of the TCP ports to probe.
+
+    Description of argument(s):
+    ports                           A list of ports, a comma or space
+                                    separated string of ports or None for
+                                    ${REACHABILITY_PORTS} (default
+                                    443, 22 and 623).
+    """
+
+    if ports is None:
+        ports = gru.get_robot_var_value(
+            "${REACHABILITY_PORTS}", default_ports
+        )
+    if isinstance(ports, str):
+        ports = re.split(r"[,\s]+", ports.strip())
+
+    return [int(port) for port in ports]
+
+
+def get_address(host):
+    r"""
+    Return the (family, address) of a host, or (None, None) if it cannot be
+    resolved.
+
+    Description of argument(s):
+    host                            The DNS name or IP address of the host.
+    """
+
+    try:
+        family, _, _, _, sockaddr = socket.getaddrinfo(
+            host, None, proto=socket.IPPROTO_TCP
+        )[0]
+    except (socket.gaierror, UnicodeError):
+        return None, None
+
+    return family, sockaddr[0]
+
+
+def open_icmp_socket(family):
+    r"""
+    Return an unprivileged ICMP datagram socket for the address family, or
+    None if they are not permitted.
+
+    Description of argument(s):
+    family                          socket.AF_INET or socket.AF_INET6.
+    """
+
+    if not int(gru.get_robot_var_value("${REACHABILITY_ICMP}", 1)):
+        return None
+    if icmp_permitted.get(family, True) is False:
+        return None
+    protocol = (
+        socket.IPPROTO_ICMP
+        if family == socket.AF_INET
+        else socket.IPPROTO_ICMPV6
+    )
+    try:
+        icmp_socket = socket.socket(family, socket.SOCK_DGRAM, protocol)
+    except OSError:
+        icmp_permitted[family] = False
+        return None
+    icmp_permitted[family] = True
+
+    return icmp_socket
+
+
+def checksum(data):
+    r"""
+    Return the internet checksum of data.
+
+    Description of argument(s):
+    data                            The bytes to be checksummed.
+    """
+
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+
+    return ~total & 0xFFFF
+
+
+def send_echo_request(icmp_socket, family, address):
+    r"""
+    Send an ICMP echo request and return its sequence number, or None if it
+    could not be sent.
+
+    Description of argument(s):
+    icmp_socket                     The socket returned by open_icmp_socket.
+    family                          The address family.
+    address                         The IP address of the host.
+    """
+
+    with sequence_lock:
+        sequence = next(sequence_numbers) & 0xFFFF
+    echo_type = 8 if family == socket.AF_INET else 128
+    payload = struct.pack("!d", time.time())
+    # The kernel sets the identifier (and, for IPv6, the checksum).
+    header = struct.pack("!BBHHH", echo_type, 0, 0, 0, sequence)
+    header = struct.pack(
+        "!BBHHH", echo_type, 0, checksum(header + payload), 0, sequence
+    )
+    try:
+        icmp_socket.sendto(header + payload, (address, 0))
+    except OSError:
+        return None
+
+    return sequence
+
+
+def is_echo_reply(data, family, sequence):
+    r"""
+    Return True if data is the ICMP echo reply with the given sequence
+    number.
+
+    Description of argument(s):
+    data                            The bytes received on the ICMP socket.
+    family                          The address family.
+    sequence                        The sequence number of the request.
+    """
+
+    if len(data) < 8:
+        return False
+    reply_type, _, _, _, reply_sequence = struct.unpack("!BBHHH", data[:8])
+
+    return reply_type == (
+        0 if family == socket.AF_INET else 129
+    ) and reply_sequence == sequence
+
+
+def open_tcp_sockets(family, address, ports):
+    r"""
+    Start a non-blocking TCP connection attempt to each port and return a
+    (port, tcp_sockets) tuple.  port is the first port whose attempt showed
+    at once that the host is up (or None) and tcp_sockets is a dictionary of
+    socket: port for the attempts still in progress.  Attempts which failed
+    at once (e.g. with ENETUNREACH) are closed.
+
+    Description of argument(s):
+    family                          The address family.
+    address                         The IP address of the host.
+    ports                           The list of ports.
+    """
+
+    tcp_sockets = {}
+    for port in ports:
+        tcp_socket = socket.socket(family, socket.SOCK_STREAM)
+        tcp_socket.setblocking(False)
+        try:
+            error = tcp_socket.connect_ex((address, port))
+        except OSError as exception:
+            error = exception.errno
+        if error in in_progress_errnos:
+            tcp_sockets[tcp_socket] = port
+            continue
+        tcp_socket.close()
+        if error in up_errnos:
+            for pending_socket in tcp_sockets:
+                pending_socket.close()
+            return port, {}
+
+    return None, tcp_sockets
+
+
+def probe_once(family, address, ports, timeout):
+    r"""
+    Probe a host once and return the round trip time in seconds and the
+    method which answered ("icmp" or "tcp/<port>"), or (None, None) if the
+    host did not answer within timeout.
+
+    Description of argument(s):
+    family                          The address family.
+    address                         The IP address of the host.
+    ports                           The list of TCP ports.
+    timeout                         The number of seconds to wait.
+    """
+
+    start_time = time.time()
+    end_time = start_time + timeout
+    icmp_socket = open_icmp_socket(family)
+    sequence = None
+    if icmp_socket is not None:
+        sequence = send_echo_request(icmp_socket, family, address)
+    tcp_sockets = {}
+    try:
+        port, tcp_sockets = open_tcp_sockets(family, address, ports)
+        if port is not None:
+            return time.time() - start_time, "tcp/" + str(port)
+        while True:
+            read_sockets = [icmp_socket] if sequence is not None else []
+            write_sockets = list(tcp_sockets)
+            remaining = end_time - time.time()
+            if remaining <= 0 or not (read_sockets or write_sockets):
+                return None, None
+            readable, writable, _ = select.select(
+                read_sockets, write_sockets, [], remaining
+            )
+            now = time.time()
+            for ready_socket in readable:
+                try:
+                    data = ready_socket.recv(1024)
+                except OSError:
+                    # An ICMP error (e.g. host unreachable) was reported.
+                    sequence = None
+                    continue
+                if is_echo_reply(data, family, sequence):
+                    return now - start_time, "icmp"
+            for ready_socket in writable:
+                error = ready_socket.getsockopt(
+                    socket.SOL_SOCKET, socket.SO_ERROR
+                )
+                if error in up_errnos:
+                    return now - start_time, "tcp/" + str(
+                        tcp_sockets[ready_socket]
+                    )
+                # Unreachable, so stop watching this socket.
+                ready_socket.close()
+                del tcp_sockets[ready_socket]
+    finally:
+        if icmp_socket is not None:
+            icmp_socket.close()
+        for tcp_socket in tcp_sockets:
+            tcp_socket.close()
+
+
+def probe_host(host, count=1, timeout=2, interval=0.2, ports=None):
+    r"""
+    Probe a host count times and return a dictionary of statistics with
+    these keys:
+
+    host                            The host.
+    sent                            The number of probes sent.
+    received                        The number of probes answered.
+    loss                            The percentage of probes not answered
+                                    (an integer, as reported by ping).
+    rtt_min, rtt_avg, rtt_max       The round trip time statistics in
+                                    milliseconds (None if no probe was
+                                    answered).
+    methods                         The list of methods which answered (see
+                                    probe_once).
+
+    Description of argument(s):
+    host                            The DNS name or IP address of the host.
+    count                           The number of probes to send.
+    timeout                         The number of seconds to wait for each
+                                    probe.
+    interval                        The number of seconds between the start
+                                    of one probe and the next.
+    ports                           See get_ports.
+    """
+
+    ports = get_ports(ports)
+    count = int(count)
+    rtts = []
+    methods = []
+    family, address = get_address(host)
+    for ix in range(count):
+        if address is None:
+            break
+        start_time = time.time()
+        rtt, method = probe_once(family, address, ports, float(timeout))
+        if rtt is not None:
+            rtts.append(rtt * 1000)
+            if method not in methods:
+                methods.append(method)
+        if ix < count - 1:
+            time.sleep(max(0, float(interval) - (time.time() - start_time)))
+
+    stats = {
+        "host": host,
+        "sent": count,
+        "received": len(rtts),
+        "loss": (count - len(rtts)) * 100 // count if count else 0,
+        "rtt_min": None,
+        "rtt_avg": None,
+        "rtt_max": None,
+        "methods": methods,
+    }
+    if rtts:
+        stats["rtt_min"] = round(min(rtts), 3)
+        stats["rtt_avg"] = round(sum(rtts) / len(rtts), 3)
+        stats["rtt_max"] = round(max(rtts), 3)
+
+    return stats
+
+
+def probe_hosts(hosts, count=1, timeout=2, interval=0.2, ports=None):
+    r"""
+    Probe many hosts concurrently and return a dictionary of host: statistics
+    (see probe_host), in the order in which the hosts were given.
+
+    Description of argument(s):
+    hosts                           A list of hosts or a comma or space
+                                    separated string of hosts.
+    count                           See probe_host.
+    timeout                         See probe_host.
+    interval                        See probe_host.
+    ports                           See get_ports.
+    """
+
+    if isinstance(hosts, str):
+        hosts = re.split(r"[,\s]+", hosts.strip())
+    ports = get_ports(ports)
+    with ThreadPoolExecutor(max_workers=max(1, min(64, len(hosts)))) as pool:
+        futures = [
+            pool.submit(probe_host, host, count, timeout, interval, ports)
+            for host in hosts
+        ]
+        return {
+            host: future.result() for host, future in zip(hosts, futures)
+        }
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides an asyncio based redfish client for python code which
+needs to issue many redfish requests at once (e.g. sensor sweeps, log
+harvesting, account checks).
+
+async_redfish_client offers the same request surface as redfish_plus (get,
+post, put, patch, delete with valid_status_codes processing) but each
+request is a coroutine.  Each request holds a slot of the BMC's governor
+(see redfish_governor.py) while it is in flight, so async requests share
+the BMC's in-flight and rate limits with all other redfish requests.
+
+redfish_async is a synchronous facade which runs an async_redfish_client on
+an event loop in a background thread so that robot keywords and ordinary
+python code can call it.
+
+Example robot code:
+
+Library  redfish_async.py  https://${BMC_HOST}:${HTTPS_PORT}  ${BMC_USERNAME}  ${BMC_PASSWORD}
+...  WITH NAME  Redfish_Async
+
+Redfish_Async.Login
+${responses}=  Redfish_Async.Get Many  @{sensor_uris}
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import aiohttp
+import func_args as fa
+import gen_print as gp
+import redfish_governor as rgov
+from redfish_plus import valid_http_status_code
+from robot.libraries.BuiltIn import BuiltIn
+
+# The methods which may be resent after a timeout or a dropped connection.
+# Other requests (e.g. POST or PATCH) may already have been acted on by the
+# BMC, so they are retried only when the connection could not be made.
+retry_methods = ["GET", "HEAD"]
+
+
+class async_response:
+    r"""
+    A redfish response with the attributes that callers of redfish_plus
+    responses commonly use (status, text, dict, getheader).
+    """
+
+    def __init__(self, status, headers, text):
+        r"""
+        Create an async_response object.
+
+        Description of argument(s):
+        status                      The HTTP status code (e.g. 200).
+        headers                     The response headers (a case-insensitive
+                                    mapping).
+        text                        The response body as a string.
+        """
+
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    @property
+    def dict(self):
+        r"""
+        Return the response body decoded as a dictionary.  An empty
+        dictionary is returned if the body is not valid JSON.
+        """
+
+        try:
+            return json.loads(self.text)
+        except ValueError:
+            return {}
+
+    def getheader(self, name):
+        r"""
+        Return the value of the named header or None.
+
+        Description of argument(s):
+        name                        The header name (case-insensitive).
+        """
+
+        return self.headers.get(name, None)
+
+
+class async_redfish_client:
+    r"""
+    An asyncio redfish client for one BMC.
+
+    Example code:
+
+    client = async_redfish_client("https://bmc:443", "root", "password")
+    await client.login()
+    responses = await client.get_many(uris)
+    await client.logout()
+    """
+
+    def __init__(
+        self,
+        base_url,
+        username,
+        password,
+        max_concurrency=None,
+        timeout=30,
+        max_retry=10,
+    ):
+        r"""
+        Create an async_redfish_client object.  No connection is made until
+        the first request.
+
+        Description of argument(s):
+        base_url                    The BMC URL (e.g. "https://bmc:443").
+        username                    The redfish user name.
+        password                    The redfish password.
+        max_concurrency             The maximum number of this client's
+                                    requests in flight to the BMC at one
+                                    time.  The default is the governor's
+                                    max_in_flight.
+        timeout                     The default timeout in seconds for each
+                                    request.
+        max_retry                   The default number of times a request is
+                                    retried on connection failure.
+        """
+
+        self.__base_url = base_url.rstrip("/")
+        self.__username = username
+        self.__password = password
+        self.__governor = rgov.get_governor(self.__base_url)
+        if max_concurrency is None:
+            max_concurrency = self.__governor.max_in_flight
+        self.__max_concurrency = int(max_concurrency)
+        self.__timeout = int(timeout)
+        self.__max_retry = int(max_retry)
+        self.__session = None
+        self.__semaphore = None
+        self.__session_key = None
+        self.__session_location = None
+        gp.register_passwords(password)
+
+    def get_session_info(self):
+        r"""
+        Return a tuple of the session key and session location.
+        """
+
+        return self.__session_key, self.__session_location
+
+    async def open(self):
+        r"""
+        Create the HTTP session and the concurrency semaphore.  These must be
+        created on the event loop which will run the requests.
+        """
+
+        if self.__session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.__max_concurrency, ssl=False
+        )
+        self.__session = aiohttp.ClientSession(connector=connector)
+        self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+
+    async def close(self):
+        r"""
+        Close the HTTP session.
+        """
+
+        if self.__session is None:
+            return
+        await self.__session.close()
+        self.__session = None
+        self.__semaphore = None
+
+    async def rest_request(self, method, path, **kwargs):
+        r"""
+        Perform a redfish rest request and return an async_response.
+
+        Description of argument(s):
+        method                      The HTTP method (e.g. "GET").
+        path                        The resource path (e.g. "/redfish/v1/Systems").
+        kwargs                      The following keyword arguments are
+                                    processed:
+                                    body - A dictionary to be sent as JSON.
+                                    headers - A dictionary of extra headers.
+                                    valid_status_codes - See
+                                    redfish_plus.valid_http_status_code.  The
+                                    default is [200, 201, 202, 204].
+                                    timeout - The timeout in seconds.
+                                    max_retry - The number of times to retry on
+                                    connection failure.  Only GET and HEAD
+                                    requests are retried after a timeout (see
+                                    retry_methods).
+        """
+
+        body = kwargs.pop("body", None)
+        headers = dict(kwargs.pop("headers", None) or {})
+        valid_status_codes = kwargs.pop(
+            "valid_status_codes", [200, 201, 202, 204]
+        )
+        timeout = int(kwargs.pop("timeout", self.__timeout))
+        max_retry = int(kwargs.pop("max_retry", self.__max_retry))
+
+        await self.open()
+        if self.__session_key is not None:
+            headers["X-Auth-Token"] = self.__session_key
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            body = json.dumps(body)
+
+        attempts = 0
+        while True:
+            try:
+                async with self.__semaphore:
+                    await self.__governor.acquire_async()
+                    status = None
+                    start_time = time.time()
+                    try:
+                        async with self.__session.request(
+                            method,
+                            self.__base_url + path,
+                            data=body,
+                            headers=headers,
+                            timeout=aiohttp.ClientTimeout(total=timeout),
+                        ) as resp:
+                            text = await resp.text()
+                            status = resp.status
+                            response = async_response(
+                                resp.status, resp.headers, text
+                            )
+                    finally:
+                        self.__governor.release(
+                            status, time.time() - start_time
+                        )
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                attempts += 1
+                resendable = method.upper() in retry_methods or isinstance(
+                    ex, aiohttp.ClientConnectorError
+                )
+                if attempts > max_retry or not resendable:
+                    raise ValueError(
+                        gp.replace_passwords(
+                            "The " + method + " " + path + " request failed"
+                            " after " + str(attempts) + " attempts: "
+                            + str(ex)
+                        )
+                    )
+                await asyncio.sleep(1)
+
+        valid_http_status_code(response.status, valid_status_codes)
+        return response
+
+    async def login(self):
+        r"""
+        Create a redfish session and save its key and location.
+        """
+
+        response = await self.rest_request(
+            "POST",
+            "/redfish/v1/SessionService/Sessions",
+            body={"UserName": self.__username, "Password": self.__password},
+            valid_status_codes=[200, 201],
+        )
+        self.__session_key = response.getheader("X-Auth-Token")
+        self.__session_location = response.getheader("Location")
+
+    async def logout(self):
+        r"""
+        Delete the redfish session (if any) and close the HTTP session.
+        """
+
+        try:
+            if self.__session_location is not None:
+                location = self.__session_location
+                if location.startswith(self.__base_url):
+                    location = location[len(self.__base_url):]
+                await self.rest_request(
+                    "DELETE", location, valid_status_codes=[]
+                )
+        finally:
+            self.__session_key = None
+            self.__session_location = None
+            await self.close()
+
+    # Define rest function wrappers.
+    async def get(self, path, **kwargs):
+        return await self.rest_request("GET", path, **kwargs)
+
+    async def head(self, path, **kwargs):
+        return await self.rest_request("HEAD", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.rest_request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.rest_request("PUT", path, **kwargs)
+
+    async def patch(self, path, **kwargs):
+        return await self.rest_request("PATCH", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.rest_request("DELETE", path, **kwargs)
+
+    async def get_many(self, paths, **kwargs):
+        r"""
+        GET each of the paths concurrently and return a list of responses in
+        the same order as paths.
+
+        Description of argument(s):
+        paths                       A list of resource paths.
+        kwargs                      See rest_request for details.  These are
+                                    applied to every request.
+        """
+
+        return await asyncio.gather(
+            *[self.rest_request("GET", path, **dict(kwargs)) for path in paths]
+        )
+
+
+class redfish_async:
+    r"""
+    A synchronous facade for async_redfish_client.
+
+    The client runs on an event loop in a background thread.  Each method
+    blocks until its request(s) complete.
+    """
+
+    ROBOT_LIBRARY_SCOPE = "TEST SUITE"
+
+    def __init__(self, base_url, username, password, max_concurrency=None):
+        r"""
+        Create a redfish_async object.
+
+        Description of argument(s):
+        base_url                    The BMC URL (e.g. "https://bmc:443").
+        username                    The redfish user name.
+        password                    The redfish password.
+        max_concurrency             The maximum number of requests in flight to
+                                    the BMC at one time.  The default is
+                                    ${REDFISH_ASYNC_MAX_CONCURRENCY} or the
+                                    governor's max_in_flight (see
+                                    redfish_governor.py).
+        """
+
+        if max_concurrency is None:
+            max_concurrency = BuiltIn().get_variable_value(
+                "${REDFISH_ASYNC_MAX_CONCURRENCY}", None
+            )
+        self.__client = async_redfish_client(
+            base_url, username, password, max_concurrency
+        )
+        self.__loop = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def run(self, coroutine):
+        r"""
+        Run the coroutine on the background event loop and return its result.
+
+        Description of argument(s):
+        coroutine                   The coroutine object to be run.
+        """
+
+        with self.__lock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                self.__thread = threading.Thread(
+                    target=self.__loop.run_forever, daemon=True
+                )
+                self.__thread.start()
+        return asyncio.run_coroutine_threadsafe(
+            coroutine, self.__loop
+        ).result()
+
+    def login(self):
+        r"""
+        Create a redfish session and return a tuple of the session key and
+        session location.
+        """
+
+        gp.qprint_executing(style=gp.func_line_style_short)
+        self.run(self.__client.login())
+        return self.__client.get_session_info()
+
+    def logout(self):
+        r"""
+        Delete the redfish session and stop the background event loop.
+        """
+
+        gp.qprint_executing(style=gp.func_line_style_short)
+        if self.__loop is None:
+            return
+        try:
+            self.run(self.__client.logout())
+        finally:
+            with self.__lock:
+                loop, thread = self.__loop, self.__thread
+                self.__loop, self.__thread = None, None
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def rest_request(self, method, path, **kwargs):
+        r"""
+        Perform a redfish rest request and return the response.
+
+        Description of argument(s):
+        method                      The HTTP method (e.g. "GET").
+        path                        The resource path.
+        kwargs                      See async_redfish_client.rest_request for
+                                    details.  Python string object definitions
+                                    (e.g. valid_status_codes=[200, 404]) are
+                                    converted to objects.
+        """
+
+        gp.qprint_executing(stack_frame_ix=3, style=gp.func_line_style_short)
+        kwargs = fa.args_to_objects(kwargs)
+        return self.run(self.__client.rest_request(method, path, **kwargs))
+
+    # Define rest function wrappers.
+    def get(self, path, **kwargs):
+        return self.rest_request("GET", path, **kwargs)
+
+    def head(self, path, **kwargs):
+        return self.rest_request("HEAD", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.rest_request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.rest_request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.rest_request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.rest_request("DELETE", path, **kwargs)
+
+    def get_many(self, *paths, **kwargs):
+        r"""
+        GET each of the paths concurrently and return a list of responses in
+        the same order as paths.
+
+        Description of argument(s):
+        paths                       One or more resource paths.
+        kwargs                      See async_redfish_client.rest_request for
+                                    details.
+        """
+
+        gp.qprint_executing(style=gp.func_line_style_short)
+        kwargs = fa.args_to_objects(kwargs)
+        return self.run(self.__client.get_many(list(paths), **kwargs))
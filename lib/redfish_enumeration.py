@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+Redfish tree enumeration helpers shared by bmc_redfish.py and
+bmc_redfish_utils.py.
+
+The enumerators in those modules walk the resource tree breadth-first.  Each
+pass over the pending resources is one "level" (or frontier) of the tree.  The
+functions in this module fetch a level, optionally with a bounded pool of
+worker threads, and keep track of how long each level took.
+
+When the service advertises support for the OData $expand query (see
+ServiceRoot ProtocolFeaturesSupported), a resource may be fetched together
+with its subordinate resources.  split_expanded_resource() separates such a
+response back into the individual resource documents.
+"""
+
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def normalize_uri(uri):
+    r"""
+    Return the uri with any trailing slash removed.
+
+    Description of argument(s):
+    uri                             A resource path (e.g. "/redfish/v1/Systems/").
+    """
+
+    return uri.rstrip("/") or uri
+
+
+def normalize_link(uri):
+    r"""
+    Return the resource path of a link, i.e. uri with any fragment (e.g.
+    "#/Fans/0") and trailing slash removed.
+
+    Description of argument(s):
+    uri                             An @odata.id value (e.g.
+                                    "/redfish/v1/Chassis/chassis/Thermal#/Fans/0").
+    """
+
+    return normalize_uri(uri.split("#", 1)[0])
+
+
+def extract_links(data):
+    r"""
+    Return the set of resource paths linked to from data.
+
+    Every @odata.id found in data (in nested dictionaries and in lists at
+    any depth, e.g. Members, Links/Chassis or Oem lists) is included, as are
+    plain strings in a Members list.  The paths are normalized with
+    normalize_link.  The data is walked iteratively so that deeply nested
+    responses cannot exhaust the stack.
+
+    Description of argument(s):
+    data                            The dictionary from a response.
+    """
+
+    links = set()
+    stack = [(None, data)]
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if sub_key == "@odata.id":
+                    if isinstance(sub_value, str):
+                        links.add(normalize_link(sub_value))
+                elif isinstance(sub_value, (dict, list)):
+                    stack.append((sub_key, sub_value))
+        elif isinstance(value, list):
+            for element in value:
+                if isinstance(element, (dict, list)):
+                    stack.append((key, element))
+                elif key == "Members" and isinstance(element, str):
+                    links.add(normalize_link(element))
+    links.discard("")
+
+    return links
+
+
+def index_links(data, url, uri_index):
+    r"""
+    Add the resource paths linked to from data (see extract_links), other
+    than url itself, to uri_index.  Return True if data is the resource at
+    url (i.e. its @odata.id is url).
+
+    This is the walk_nested_dict of the enumerators in bmc_redfish.py and
+    bmc_redfish_utils.py.
+
+    Description of argument(s):
+    data                            The dictionary from a response.
+    url                             The resource path for which data was
+                                    obtained or "".
+    uri_index                       The set of resource paths discovered so
+                                    far.
+    """
+
+    url = normalize_uri(url) if url else url
+    links = extract_links(data)
+    is_resource = bool(url) and (
+        normalize_link(str(data.get("@odata.id", ""))) == url
+    )
+    if is_resource:
+        links.discard(url)
+    uri_index.update(links)
+
+    return is_resource
+
+
+def next_frontier(pending_resources, enumerated_resources):
+    r"""
+    Return a sorted tuple of the pending resources which have not yet been
+    enumerated.
+
+    Resources which differ only by a trailing slash are considered to be the
+    same resource so that they are fetched only once.
+
+    Description of argument(s):
+    pending_resources               The set of resource paths discovered so far.
+    enumerated_resources            The set of normalized resource paths which
+                                    have already been fetched (or skipped).
+    """
+
+    return tuple(
+        sorted(
+            set(normalize_uri(uri) for uri in pending_resources)
+            - enumerated_resources
+        )
+    )
+
+
+def skip_resource(resource, skip_list):
+    r"""
+    Return True if the resource path contains any of the strings in skip_list.
+
+    Description of argument(s):
+    resource                        A resource path.
+    skip_list                       A list of strings (e.g. ["JsonSchemas", "#"]).
+    """
+
+    for skip_string in skip_list:
+        if skip_string in resource:
+            return True
+    return False
+
+
+def get_expand_query(protocol_features, levels=1, select=None):
+    r"""
+    Return a query string which expands subordinate resources (and selects
+    properties) as far as the service supports it.  An empty string is
+    returned if the service supports neither.
+
+    Example results:
+    "?$expand=.($levels=1)"
+    "?$expand=.&$select=Name,Status"
+    ""
+
+    Description of argument(s):
+    protocol_features               The ServiceRoot ProtocolFeaturesSupported
+                                    dictionary.
+    levels                          The number of levels of subordinate
+                                    resources to expand.  This is reduced to
+                                    the service's MaxLevels.  A value of 0
+                                    disables expansion.
+    select                          A list of property names to be selected or
+                                    None.
+    """
+
+    query = []
+    expand_query = protocol_features.get("ExpandQuery", {})
+    levels = int(levels)
+    if levels > 0 and expand_query.get("NoLinks", False):
+        if expand_query.get("Levels", False):
+            levels = min(levels, int(expand_query.get("MaxLevels", 1)))
+            query.append("$expand=.($levels=" + str(levels) + ")")
+        else:
+            query.append("$expand=.")
+    if select and protocol_features.get("SelectQuery", False):
+        query.append("$select=" + ",".join(select))
+
+    if not query:
+        return ""
+    return "?" + "&".join(query)
+
+
+def is_expanded_resource(data):
+    r"""
+    Return True if data is the body of an expanded resource (rather than a
+    simple {"@odata.id": ...} link or an inline object).
+
+    Description of argument(s):
+    data                            A dictionary found within a response.
+    """
+
+    return (
+        "@odata.id" in data
+        and "@odata.type" in data
+        and "#" not in data["@odata.id"]
+    )
+
+
+def split_expanded_resource(data):
+    r"""
+    Separate a response obtained with $expand into the top level resource
+    and the expanded subordinate resources.
+
+    Each expanded subordinate resource is replaced with a link of the form
+    {"@odata.id": uri}, so the returned top level resource looks exactly like
+    one fetched without $expand.  A tuple of (top level resource, dictionary
+    of normalized uri: resource) is returned.
+
+    Description of argument(s):
+    data                            The dictionary from a response.
+    """
+
+    expanded_resources = {}
+
+    def collapse(value):
+        if isinstance(value, dict):
+            if is_expanded_resource(value):
+                uri = value["@odata.id"]
+                expanded_resources[normalize_uri(uri)] = {
+                    k: collapse(v) for k, v in value.items()
+                }
+                return {"@odata.id": uri}
+            return {k: collapse(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [collapse(element) for element in value]
+        return value
+
+    resource = {k: collapse(v) for k, v in data.items()}
+    return resource, expanded_resources
+
+
+def walk_expanded_resources(
+    walk_func,
+    expanded_resources,
+    pending_resources,
+    enumerated_resources,
+    skip_list,
+):
+    r"""
+    Walk each expanded resource which has been discovered (i.e. which is in
+    pending_resources) as though it had been fetched, and add it to
+    enumerated_resources so that it is not fetched again.  Walked resources
+    are removed from expanded_resources.
+
+    Description of argument(s):
+    walk_func                       The function to be called for each resource
+                                    (e.g. bmc_redfish.walk_nested_dict).  It is
+                                    called as walk_func(data, url=uri).
+    expanded_resources              A dictionary of uri: resource as returned by
+                                    split_expanded_resource.
+    pending_resources               The set of resource paths discovered so far.
+    enumerated_resources            The set of normalized resource paths which
+                                    have already been fetched (or skipped).
+    skip_list                       See skip_resource for details.
+    """
+
+    walked = True
+    while walked:
+        walked = False
+        discovered_resources = set(
+            normalize_uri(uri) for uri in pending_resources
+        )
+        for uri in list(expanded_resources.keys()):
+            if (
+                uri in enumerated_resources
+                or uri not in discovered_resources
+                or skip_resource(uri, skip_list)
+            ):
+                continue
+            walk_func(expanded_resources.pop(uri), url=uri)
+            enumerated_resources.add(uri)
+            walked = True
+
+
+def predict_page_links(next_link, page_size, total):
+    r"""
+    Return a list of the links of all remaining pages of a collection.
+
+    If next_link pages with $skip (e.g.
+    "/redfish/v1/Systems/system/LogServices/EventLog/Entries?$skip=50") and the
+    collection's Members@odata.count is known, the remaining pages can be
+    computed so that they may be fetched concurrently.  Otherwise a list
+    containing only next_link is returned.
+
+    Description of argument(s):
+    next_link                       The Members@odata.nextLink of the first
+                                    page.
+    page_size                       The number of members in the first page.
+    total                           The Members@odata.count of the collection
+                                    or None.
+    """
+
+    match = re.search(r"([?&]\$skip=)([0-9]+)", next_link)
+    if match is None or total is None or int(page_size) <= 0:
+        return [next_link]
+
+    return [
+        next_link[: match.start(2)] + str(skip) + next_link[match.end(2):]
+        for skip in range(int(match.group(2)), int(total), int(page_size))
+    ]
+
+
+def fetch_resource(
+    get_func, resource, valid_status_codes, query="", etags=None
+):
+    r"""
+    GET one resource and return the response.
+
+    Description of argument(s):
+    get_func                        The get function to be called (e.g.
+                                    bmc_redfish.get).
+    resource                        The resource path to be fetched.
+    valid_status_codes              See redfish_plus.rest_request for details.
+    query                           A query string (see get_expand_query) to be
+                                    appended to the resource path.  If the
+                                    request fails, the resource is fetched
+                                    again without the query.
+    etags                           A dictionary of normalized resource path:
+                                    ETag or None.  If the resource has an ETag,
+                                    it is fetched with an If-None-Match header
+                                    and a status of 304 (Not Modified) is
+                                    accepted.
+    """
+
+    # Set quiet variable to keep subordinate get() calls quiet.  This must be
+    # set here rather than in the enumerating function because worker threads
+    # do not share the caller's stack.
+    quiet = 1
+    if etags:
+        etag = etags.get(normalize_uri(resource), None)
+        if etag is not None:
+            return get_func(
+                resource,
+                valid_status_codes=list(valid_status_codes) + [304],
+                headers={"If-None-Match": etag},
+            )
+    if query:
+        response = get_func(resource + query, valid_status_codes=[])
+        if response.status == 200:
+            return response
+    return get_func(resource, valid_status_codes=valid_status_codes)
+
+
+def fetch_resources(
+    get_func,
+    resources,
+    valid_status_codes,
+    max_workers=1,
+    query="",
+    etags=None,
+):
+    r"""
+    GET each of the resources and yield (resource, response) tuples in the
+    same order as resources.
+
+    Each tuple is yielded as soon as its response (and those of the
+    resources before it) is available so that callers may process results
+    while the remaining resources are being fetched.
+
+    Description of argument(s):
+    get_func                        The get function to be called (e.g.
+                                    bmc_redfish.get).
+    resources                       A list of resource paths to be fetched.
+    valid_status_codes              See redfish_plus.rest_request for details.
+    max_workers                     The maximum number of GET requests to have in
+                                    flight at one time.  A value of 1 fetches
+                                    the resources serially.
+    query                           See fetch_resource for details.
+    etags                           See fetch_resource for details.
+    """
+
+    max_workers = int(max_workers)
+    if max_workers <= 1 or len(resources) <= 1:
+        for resource in resources:
+            yield resource, fetch_resource(
+                get_func, resource, valid_status_codes, query, etags
+            )
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(resources))
+    ) as executor:
+        responses = executor.map(
+            lambda resource: fetch_resource(
+                get_func, resource, valid_status_codes, query, etags
+            ),
+            resources,
+        )
+        for resource, response in zip(resources, responses):
+            yield resource, response
+
+
+def write_ndjson(resources, file_path):
+    r"""
+    Write each (resource path, resource) tuple to file_path as one line of
+    newline-delimited JSON and return the number of lines written.
+
+    Each line is a JSON object with the resource path as its only key, e.g.
+    {"/redfish/v1/Systems": {"@odata.id": "/redfish/v1/Systems", ...}}
+
+    The file is flushed after every line so that the resources written so far
+    survive if the enumeration is interrupted.
+
+    Description of argument(s):
+    resources                       An iterable of (resource path, resource)
+                                    tuples (e.g. from bmc_redfish.enumerate_iter).
+    file_path                       The path of the file to be written.
+    """
+
+    num_lines = 0
+    with open(file_path, "w") as file:
+        for resource, data in resources:
+            file.write(json.dumps({resource: data}, sort_keys=True) + "\n")
+            file.flush()
+            num_lines += 1
+
+    return num_lines
+
+
+def add_level_timing(level_timings, num_resources, start_time):
+    r"""
+    Append a timing entry for one enumeration level to level_timings.
+
+    Each entry is a dictionary such as:
+    {'level': 2, 'resources': 37, 'seconds': 1.804}
+
+    Description of argument(s):
+    level_timings                   The list of timing entries to be appended to.
+    num_resources                   The number of resources fetched for the level.
+    start_time                      The time.time() value when the level was
+                                    started.
+    """
+
+    level_timings.append(
+        {
+            "level": len(level_timings),
+            "resources": num_resources,
+            "seconds": round(time.time() - start_time, 3),
+        }
+    )
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides the fleet mode of bmc_redfish.py, in which the same
+read-only query is run concurrently against many BMCs (see
+bmc_redfish.fleet_request).
+
+The BMCs may be given as a list, as a comma or space separated string or as
+the path of an inventory file.  The default is ${BMC_HOSTS}.
+
+An inventory file is either a JSON list (of host strings or of dictionaries
+with host, port, username and password keys) or a text file with one BMC
+per line:
+
+# host[:port]       [username  [password]]
+bmc-rack1-01
+bmc-rack1-02:8443   admin      secret
+
+Missing values default to ${HTTPS_PORT}, ${BMC_USERNAME} and
+${BMC_PASSWORD}.
+
+Each BMC gets its own client (and so its own session, retry policy circuit
+and concurrency governor), which is logged in on first use and kept for
+later queries.
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import func_args as fa
+import gen_robot_utils as gru
+
+# The client methods which may be run against a fleet.  Fleet queries are
+# read-only, so methods which change a BMC (post, patch, delete, etc.) are
+# not permitted.
+fleet_methods = [
+    "get",
+    "head",
+    "get_properties",
+    "get_attribute",
+    "get_members_list",
+    "enumerate",
+]
+
+
+def check_fleet_method(method_name, client_class=None):
+    r"""
+    Raise ValueError if method_name is not one of fleet_methods or is not a
+    method of client_class.
+
+    Description of argument(s):
+    method_name                     The name of a client method (e.g.
+                                    "get_attribute").
+    client_class                    The class of the fleet's clients or None.
+    """
+
+    if method_name not in fleet_methods:
+        raise ValueError(
+            "Invalid fleet method \"" + str(method_name) + "\".  Valid"
+            " methods are: " + ", ".join(fleet_methods) + "."
+        )
+    if client_class is not None and not callable(
+        getattr(client_class, method_name, None)
+    ):
+        raise ValueError(
+            "The fleet client class " + client_class.__name__ + " has no \""
+            + method_name + "\" method."
+        )
+
+
+def parse_host_entry(entry):
+    r"""
+    Return a BMC dictionary (with host, port, username and password keys)
+    for one host entry.  Missing values are None.
+
+    Description of argument(s):
+    entry                           A dictionary with a host key, a string
+                                    such as "bmc1:8443" or a list such as
+                                    ["bmc1:8443", "admin", "secret"].
+    """
+
+    if isinstance(entry, dict):
+        bmc = dict(entry)
+    else:
+        if isinstance(entry, str):
+            entry = entry.split()
+        bmc = dict(zip(["host", "username", "password"], entry))
+    bmc.setdefault("port", None)
+    bmc.setdefault("username", None)
+    bmc.setdefault("password", None)
+    host = str(bmc["host"])
+    match = re.match(r"^(\[[^\]]+\]|[^:]+):([0-9]+)$", host)
+    if match:
+        bmc["host"], bmc["port"] = match.group(1), match.group(2)
+
+    return bmc
+
+
+def load_inventory(file_path):
+    r"""
+    Return a list of BMC dictionaries (see parse_host_entry) read from an
+    inventory file (see the module description).
+
+    Description of argument(s):
+    file_path                       The path of the inventory file.
+    """
+
+    with open(file_path, "r") as file:
+        text = file.read()
+    try:
+        entries = json.loads(text)
+    except ValueError:
+        entries = []
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                entries.append(line)
+
+    return [parse_host_entry(entry) for entry in entries]
+
+
+def get_bmcs(hosts=None):
+    r"""
+    Return a list of BMC dictionaries (see parse_host_entry) with all
+    defaults filled in.
+
+    Description of argument(s):
+    hosts                           A list of host entries (see
+                                    parse_host_entry), a comma or space
+                                    separated string of hosts, the path of
+                                    an inventory file or None for
+                                    ${BMC_HOSTS}.
+    """
+
+    if hosts is None:
+        hosts = gru.get_robot_var_value("${BMC_HOSTS}", None)
+        if hosts is None:
+            raise ValueError(
+                "No BMC hosts were given and ${BMC_HOSTS} is not set."
+            )
+    if isinstance(hosts, str):
+        if os.path.isfile(hosts):
+            bmcs = load_inventory(hosts)
+        else:
+            hosts = fa.source_to_object(hosts)
+            if isinstance(hosts, str):
+                hosts = re.split(r"[,\s]+", hosts.strip())
+            bmcs = [parse_host_entry(entry) for entry in hosts]
+    else:
+        bmcs = [parse_host_entry(entry) for entry in hosts]
+
+    port = gru.get_robot_var_value("${HTTPS_PORT}", 443)
+    username = gru.get_robot_var_value("${BMC_USERNAME}", None)
+    password = gru.get_robot_var_value("${BMC_PASSWORD}", None)
+    for bmc in bmcs:
+        bmc["port"] = bmc["port"] or port
+        bmc["username"] = bmc["username"] or username
+        bmc["password"] = bmc["password"] or password
+
+    return bmcs
+
+
+def get_result_value(result):
+    r"""
+    Return the value to be put in the fleet result table for the result of
+    a query.  Responses are replaced by their dictionaries.
+
+    Description of argument(s):
+    result                          The result of the query.
+    """
+
+    if hasattr(result, "status") and hasattr(result, "dict"):
+        return result.dict
+    return result
+
+
+class fleet_class:
+    r"""
+    Run queries concurrently against many BMCs.  See the module description
+    for details.
+    """
+
+    def __init__(self, client_class, max_workers=16):
+        r"""
+        Description of argument(s):
+        client_class                The class of the client created for each
+                                    BMC (e.g. bmc_redfish).  It is called
+                                    with the BMC's base URL, username and
+                                    password.  Its set_default_timeout
+                                    method is called when a timeout is
+                                    given (see redfish_plus).
+        max_workers                 The maximum number of BMCs queried at
+                                    once.
+        """
+
+        self.client_class = client_class
+        self.max_workers = int(max_workers)
+        # The logged in client for each (base URL, username) tuple.
+        self.clients = {}
+
+    def get_client(self, bmc, timeout=None):
+        r"""
+        Return the logged in client for a BMC, creating it on first use.
+
+        Description of argument(s):
+        bmc                         A BMC dictionary (see parse_host_entry).
+        timeout                     The timeout in seconds for the
+                                    connectivity check and login.
+        """
+
+        base_url = "https://" + str(bmc["host"]) + ":" + str(bmc["port"])
+        key = (base_url, bmc["username"])
+        client = self.clients.get(key, None)
+        if client is None:
+            kwargs = {}
+            if timeout is not None:
+                kwargs["timeout"] = int(timeout)
+            client = self.client_class(
+                base_url, bmc["username"], bmc["password"], **kwargs
+            )
+            client.login(bmc["username"], bmc["password"])
+            self.clients[key] = client
+
+        return client
+
+    def run_one(self, bmc, method_name, args, kwargs, timeout):
+        r"""
+        Run one query against one BMC and return its result table entry.
+
+        Description of argument(s):
+        bmc                         A BMC dictionary (see parse_host_entry).
+        method_name                 See run.
+        args                        See run.
+        kwargs                      See run.
+        timeout                     See run.
+        """
+
+        check_fleet_method(method_name, self.client_class)
+        # Set quiet variable to keep the client's calls quiet.
+        quiet = 1
+        start_time = time.time()
+        entry = {"result": None, "error": None}
+        try:
+            client = self.get_client(bmc, timeout)
+            # Not every method takes a timeout argument (e.g.
+            # get_members_list), so the timeout is set on the client.
+            client.set_default_timeout(timeout)
+            entry["result"] = get_result_value(
+                getattr(client, method_name)(*args, **kwargs)
+            )
+        except Exception as exception:
+            entry["error"] = type(exception).__name__ + ": " + str(exception)
+        entry["seconds"] = round(time.time() - start_time, 3)
+
+        return entry
+
+    def run(self, hosts, method_name, args=(), kwargs=None, timeout=None):
+        r"""
+        Run the same query against each BMC concurrently and return a
+        dictionary of host: entry, in the order in which the hosts were
+        given.  Each entry is a dictionary with these keys:
+
+        result                      The query's result (or the dictionary of
+                                    a response) or None on error.
+        error                       A description of the exception raised or
+                                    None.
+        seconds                     The time taken for the BMC.
+
+        Description of argument(s):
+        hosts                       See get_bmcs.
+        method_name                 The name of the client method to be
+                                    called (e.g. "get_attribute").  It must
+                                    be one of fleet_methods.
+        args                        The positional arguments of the method.
+        kwargs                      The keyword arguments of the method.
+        timeout                     The timeout in seconds for each request
+                                    (see redfish_plus.rest_request) or None.
+        """
+
+        check_fleet_method(method_name, self.client_class)
+        bmcs = get_bmcs(hosts)
+        kwargs = kwargs or {}
+        results = {}
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(bmcs)))
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.run_one, bmc, method_name, args, kwargs, timeout
+                )
+                for bmc in bmcs
+            ]
+            for bmc, future in zip(bmcs, futures):
+                host = str(bmc["host"])
+                default_port = gru.get_robot_var_value("${HTTPS_PORT}", 443)
+                if str(bmc["port"]) != str(default_port):
+                    host += ":" + str(bmc["port"])
+                results[host] = future.result()
+
+        return results
+
+    def logout(self):
+        r"""
+        Log out of every BMC and discard the clients.
+        """
+
+        clients = list(self.clients.values())
+        self.clients = {}
+        for client in clients:
+            try:
+                client.logout()
+            except Exception:
+                pass
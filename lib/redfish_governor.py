@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides a process-wide governor for the redfish requests sent
+to each BMC host by redfish_plus.py (including its mTLS helpers),
+redfish_request.py, redfish_async.py and redfish_sse.py.
+
+The governor for a host limits the number of requests in flight and,
+optionally, the number of requests started per second.  Callers over the
+limits wait in first come, first served order.
+
+The in-flight limit adapts to the BMC: it is halved when the BMC returns
+503 or 429 or when the average latency rises well above its usual level,
+and it grows back by one for each limit's worth of healthy responses, up
+to the configured maximum.
+
+The governor may be configured from the robot config file:
+
+-v REDFISH_MAX_IN_FLIGHT:8
+-v REDFISH_MAX_RPS:0
+-v REDFISH_ADAPTIVE_CONCURRENCY:1
+
+A REDFISH_MAX_RPS of 0 means no rate limit.  Otherwise, after a quiet
+period up to one second's worth of requests may be started at once.
+"""
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+# The latency average is considered to be rising when it exceeds its usual
+# level by this factor.
+latency_factor = 3.0
+
+# The weight of each new latency in the latency average.
+latency_weight = 0.2
+
+
+class bmc_governor_class:
+    r"""
+    Limit the requests in flight and the request rate for one BMC host.
+
+    Example code:
+
+    governor.acquire()
+    status = None
+    start_time = time.time()
+    try:
+        response = ...
+        status = response.status
+    finally:
+        governor.release(status, time.time() - start_time)
+    """
+
+    def __init__(self, host, max_in_flight=8, max_rps=0, adaptive=1):
+        r"""
+        Description of argument(s):
+        host                        The BMC host name.
+        max_in_flight               The maximum number of requests in flight.
+        max_rps                     The maximum number of requests started per
+                                    second (0 for no limit).
+        adaptive                    If 1, the in-flight limit is adapted as
+                                    described in the module description.
+        """
+
+        self.host = host
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_rps = float(max_rps)
+        self.adaptive = int(adaptive)
+        self.limit = float(self.max_in_flight)
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.next_ticket = 0
+        self.serving = 0
+        self.tokens = max(1.0, self.max_rps)
+        self.token_time = time.time()
+        self.latency_average = None
+        self.latency_baseline = None
+        self.last_decrease = 0
+        self.decreases = 0
+        self.requests = 0
+        self.wait_seconds = 0.0
+
+    def get_token_delay(self):
+        r"""
+        Take a rate limit token and return 0, or return the number of seconds
+        until one is available.  The caller must hold the condition.
+        """
+
+        if self.max_rps <= 0:
+            return 0
+        now = time.time()
+        self.tokens = min(
+            max(1.0, self.max_rps),
+            self.tokens + (now - self.token_time) * self.max_rps,
+        )
+        self.token_time = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.max_rps
+
+    def acquire(self):
+        r"""
+        Wait until the caller may send a request.  Callers are admitted in
+        the order in which they called acquire.  Each call must be followed
+        by a call to release.
+        """
+
+        start_time = time.time()
+        with self.condition:
+            ticket = self.next_ticket
+            self.next_ticket += 1
+            while True:
+                if ticket == self.serving and self.in_flight < int(self.limit):
+                    delay = self.get_token_delay()
+                    if delay <= 0:
+                        break
+                    self.condition.wait(delay)
+                else:
+                    self.condition.wait()
+            self.serving += 1
+            self.in_flight += 1
+            self.requests += 1
+            self.wait_seconds += time.time() - start_time
+            self.condition.notify_all()
+
+    async def acquire_async(self):
+        r"""
+        The asyncio version of acquire.  The wait is made in a worker thread
+        so that the event loop keeps running.
+        """
+
+        future = asyncio.get_running_loop().run_in_executor(None, self.acquire)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The wait goes on in its thread, so give back the slot it takes.
+            future.add_done_callback(
+                lambda done: done.exception() or self.release(None, 0)
+            )
+            raise
+
+    def release(self, status, seconds):
+        r"""
+        Mark a request as complete and adapt the in-flight limit to the
+        result.
+
+        Description of argument(s):
+        status                      The HTTP status of the response or None if
+                                    the request raised an exception.
+        seconds                     The time taken by the request.
+        """
+
+        with self.condition:
+            self.in_flight -= 1
+            if self.adaptive and status is not None:
+                self.adapt(status, seconds)
+            self.condition.notify_all()
+
+    def adapt(self, status, seconds):
+        r"""
+        Adapt the in-flight limit to one response.  The caller must hold the
+        condition.
+
+        Description of argument(s):
+        status                      See release for details.
+        seconds                     See release for details.
+        """
+
+        if self.latency_average is None:
+            self.latency_average = seconds
+            self.latency_baseline = seconds
+        else:
+            self.latency_average += latency_weight * (
+                seconds - self.latency_average
+            )
+            # The baseline follows the average down at once but up slowly.
+            self.latency_baseline = min(
+                self.latency_average, self.latency_baseline * 1.01
+            )
+
+        overloaded = status in (429, 503) or (
+            self.latency_average > latency_factor * self.latency_baseline
+        )
+        now = time.time()
+        if overloaded:
+            # Decrease at most once per round trip so that one burst of
+            # errors does not collapse the limit.
+            if now - self.last_decrease > max(1.0, self.latency_average):
+                self.limit = max(1.0, self.limit / 2)
+                self.last_decrease = now
+                self.decreases += 1
+        elif self.limit < self.max_in_flight:
+            self.limit = min(self.max_in_flight, self.limit + 1 / self.limit)
+
+    def get_stats(self):
+        r"""
+        Return a dictionary of the governor's current settings and counters.
+        """
+
+        with self.condition:
+            return {
+                "limit": int(self.limit),
+                "max_in_flight": self.max_in_flight,
+                "max_rps": self.max_rps,
+                "in_flight": self.in_flight,
+                "waiting": self.next_ticket - self.serving,
+                "requests": self.requests,
+                "decreases": self.decreases,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "latency_average": round(self.latency_average or 0, 6),
+            }
+
+
+# The governor for each BMC host.
+governors = {}
+governors_lock = threading.Lock()
+
+
+def get_config():
+    r"""
+    Return a dictionary of the bmc_governor_class arguments set in the robot
+    config file (see the module description).
+    """
+
+    config = {
+        "max_in_flight": "${REDFISH_MAX_IN_FLIGHT}",
+        "max_rps": "${REDFISH_MAX_RPS}",
+        "adaptive": "${REDFISH_ADAPTIVE_CONCURRENCY}",
+    }
+    kwargs = {}
+    try:
+        for name, var_name in config.items():
+            value = BuiltIn().get_variable_value(var_name, None)
+            if value is not None:
+                kwargs[name] = value
+    except RobotNotRunningError:
+        pass
+
+    return kwargs
+
+
+def get_governor(url):
+    r"""
+    Return the governor for the host in url, creating it on first use.
+
+    Description of argument(s):
+    url                             A URL (e.g. "https://bmc:443/redfish/v1")
+                                    or host name.
+    """
+
+    host = urlparse(url).hostname or url
+    governor = governors.get(host, None)
+    if governor is not None:
+        return governor
+    kwargs = get_config()
+    with governors_lock:
+        return governors.setdefault(host, bmc_governor_class(host, **kwargs))
+
+
+def get_governor_stats():
+    r"""
+    Return a dictionary of host: governor statistics (see
+    bmc_governor_class.get_stats).
+    """
+
+    return {host: governor.get_stats() for host, governor in governors.items()}
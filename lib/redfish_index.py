@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides an in-memory index of an enumerated redfish tree (e.g.
+the result of redfish_utils.Enumerate Request) so that values can be looked
+up without rescanning the whole tree for each query, as nested_get and
+filter_struct do.
+
+The index is built once and records each resource by:
+- Resource path, in a tree of path segments so that a path pattern such as
+  "/redfish/v1/Chassis/*/Sensors/*" only visits the matching resources.
+- @odata.type, both as given (e.g. "#Sensor.v1_2_0.Sensor") and without its
+  version (e.g. "Sensor").
+- Property name, at any depth within the resource.
+
+A query consists of a resource path pattern and an optional property path.
+
+In the resource path pattern, "*" matches any one segment and "**" matches
+any number of segments (including none).
+
+The property path is a dotted list of property names (e.g. "Status.Health")
+in which "*" matches any property and "[n]" or "[*]" selects one or every
+element of a list (e.g. "Temperatures[*].ReadingCelsius").
+
+Query results are dictionaries keyed by resource path.  When the property
+path contains a wildcard, the location of each value within the resource is
+added to the key as a JSON pointer fragment, as redfish does for
+@odata.id values of nested objects (e.g.
+"/redfish/v1/Chassis/chassis/Thermal#/Temperatures/0/ReadingCelsius").
+
+Example robot code:
+
+${resources}=  redfish_utils.Enumerate Request  /redfish/v1  return_json=0
+${index}=  Build Redfish Index  ${resources}
+${health}=  Query Redfish Index  ${index}  /redfish/v1/Chassis/*/Sensors/*
+...  Status.Health
+${sensors}=  Get Redfish Resources By Type  ${index}  Sensor
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+
+import redfish_enumeration as rfe
+import redfish_snapshot as rs
+
+# Matches one element of a property path: a name, "[n]" or "[*]".
+property_path_regex = re.compile(r"([^.\[\]]+)|\[(\*|[0-9]+)\]")
+
+
+@lru_cache(maxsize=1024)
+def parse_property_path(property_path):
+    r"""
+    Return a tuple of the elements of property_path.  Each element is a
+    property name, a list index (int) or "*".
+
+    Example:
+
+    parse_property_path("Temperatures[0].Status.Health")
+
+    Returns:
+
+    ('Temperatures', 0, 'Status', 'Health')
+
+    Description of argument(s):
+    property_path                   A property path (see the module
+                                    description).
+    """
+
+    elements = []
+    for name, index in property_path_regex.findall(property_path):
+        if name:
+            elements.append(name)
+        elif index == "*":
+            elements.append("*")
+        else:
+            elements.append(int(index))
+
+    return tuple(elements)
+
+
+def get_base_type(odata_type):
+    r"""
+    Return the @odata.type value without its leading "#" and its version.
+
+    Example:
+
+    get_base_type("#Sensor.v1_2_0.Sensor")
+
+    Returns:
+
+    "Sensor"
+
+    Description of argument(s):
+    odata_type                      An @odata.type value.
+    """
+
+    return odata_type.lstrip("#").split(".", 1)[0]
+
+
+class redfish_index_class:
+    r"""
+    An index of the resources of an enumerated redfish tree.  See the module
+    description for details.
+
+    The index refers to the resource dictionaries rather than copying them,
+    so they should not be modified once indexed.
+    """
+
+    def __init__(self, resources=None):
+        r"""
+        Description of argument(s):
+        resources                   A dictionary of resource path: resource
+                                    or an iterable of (resource path,
+                                    resource) tuples.
+        """
+
+        self.resources = {}
+        # Each node of the path tree is a dictionary of segment: node.  The
+        # resource path of a node which is itself a resource is kept under
+        # the None key.
+        self.path_tree = {}
+        self.types = {}
+        self.properties = {}
+        if resources is not None:
+            if isinstance(resources, dict):
+                resources = resources.items()
+            for resource_path, data in resources:
+                self.add_resource(resource_path, data)
+
+    def add_resource(self, resource_path, data):
+        r"""
+        Add one resource to the index.
+
+        Description of argument(s):
+        resource_path               The resource path (e.g.
+                                    "/redfish/v1/Chassis/chassis").
+        data                        The resource dictionary.
+        """
+
+        resource_path = rfe.normalize_uri(resource_path)
+        if resource_path in self.resources:
+            self.remove_resource(resource_path)
+        self.resources[resource_path] = data
+
+        node = self.path_tree
+        for segment in resource_path.strip("/").split("/"):
+            node = node.setdefault(segment, {})
+        node[None] = resource_path
+
+        odata_type = data.get("@odata.type", None)
+        if isinstance(odata_type, str):
+            for type_name in {odata_type, get_base_type(odata_type)}:
+                self.types.setdefault(type_name, []).append(resource_path)
+
+        # Walk the resource iteratively, recording the location of each
+        # property.
+        stack = [((), data)]
+        while stack:
+            location, value = stack.pop()
+            if isinstance(value, dict):
+                for name, sub_value in value.items():
+                    sub_location = location + (name,)
+                    self.properties.setdefault(name, []).append(
+                        (resource_path, sub_location)
+                    )
+                    if isinstance(sub_value, (dict, list)):
+                        stack.append((sub_location, sub_value))
+            elif isinstance(value, list):
+                for ix, element in enumerate(value):
+                    if isinstance(element, (dict, list)):
+                        stack.append((location + (ix,), element))
+
+    def remove_resource(self, resource_path):
+        r"""
+        Remove one resource from the index.
+
+        Description of argument(s):
+        resource_path               The resource path.
+        """
+
+        resource_path = rfe.normalize_uri(resource_path)
+        data = self.resources.pop(resource_path, None)
+        if data is None:
+            return
+
+        node = self.path_tree
+        for segment in resource_path.strip("/").split("/"):
+            node = node.get(segment, {})
+        node.pop(None, None)
+
+        for type_name, resource_paths in list(self.types.items()):
+            if resource_path in resource_paths:
+                resource_paths.remove(resource_path)
+                if not resource_paths:
+                    del self.types[type_name]
+        for name, locations in list(self.properties.items()):
+            locations = [x for x in locations if x[0] != resource_path]
+            if locations:
+                self.properties[name] = locations
+            else:
+                del self.properties[name]
+
+    def match_paths(self, path_pattern):
+        r"""
+        Return a list of the indexed resource paths which match path_pattern
+        (see the module description).
+
+        Description of argument(s):
+        path_pattern                A resource path pattern (e.g.
+                                    "/redfish/v1/Chassis/*/Sensors/*").
+        """
+
+        segments = rfe.normalize_uri(path_pattern).strip("/").split("/")
+        if segments == [""]:
+            segments = []
+        matches = []
+        # With "**", a node may be reached by more than one route.
+        seen = set() if "**" in segments else None
+        stack = [(self.path_tree, 0)]
+        while stack:
+            node, ix = stack.pop()
+            if seen is not None:
+                if (id(node), ix) in seen:
+                    continue
+                seen.add((id(node), ix))
+            if ix == len(segments):
+                if None in node:
+                    matches.append(node[None])
+                continue
+            segment = segments[ix]
+            if segment == "**":
+                # Match no segments, or one segment and stay on "**".
+                stack.append((node, ix + 1))
+                stack.extend(
+                    (child, ix) for key, child in node.items() if key is not None
+                )
+            elif segment == "*":
+                stack.extend(
+                    (child, ix + 1)
+                    for key, child in node.items()
+                    if key is not None
+                )
+            elif segment in node:
+                stack.append((node[segment], ix + 1))
+
+        return sorted(matches)
+
+    def get_by_type(self, resource_type):
+        r"""
+        Return a dictionary of resource path: resource for each resource of
+        the given type.
+
+        Description of argument(s):
+        resource_type               An @odata.type value with or without its
+                                    version (e.g. "Sensor" or
+                                    "#Sensor.v1_2_0.Sensor").
+        """
+
+        return {
+            resource_path: self.resources[resource_path]
+            for resource_path in self.types.get(resource_type, [])
+        }
+
+    def get_property(self, name, path_pattern=None):
+        r"""
+        Return a dictionary of location: value for each property with the
+        given name at any depth, as nested_get does for one structure.  Each
+        location is a resource path with a JSON pointer fragment (e.g.
+        "/redfish/v1/Systems/system#/Status/Health").
+
+        Description of argument(s):
+        name                        The property name (e.g. "Health").
+        path_pattern                A resource path pattern to which the
+                                    search is limited.
+        """
+
+        resource_paths = None
+        if path_pattern is not None:
+            resource_paths = set(self.match_paths(path_pattern))
+        result = {}
+        for resource_path, location in self.properties.get(name, []):
+            if resource_paths is not None and resource_path not in resource_paths:
+                continue
+            value = self.resources[resource_path]
+            for element in location:
+                value = value[element]
+            result[resource_path + to_json_pointer(location)] = value
+
+        return result
+
+    def query(self, path_pattern, property_path=None, resource_type=None):
+        r"""
+        Return a dictionary of the values selected by the query.  See the
+        module description for details.
+
+        Description of argument(s):
+        path_pattern                A resource path pattern (e.g.
+                                    "/redfish/v1/Chassis/*/Sensors/*").
+        property_path               A property path (e.g. "Status.Health").
+                                    If None, the whole resources are
+                                    returned.
+        resource_type               If specified, only resources of this
+                                    type (see get_by_type) are selected.
+        """
+
+        resource_paths = self.match_paths(path_pattern)
+        if resource_type is not None:
+            resource_paths = set(resource_paths)
+            resource_paths = [
+                x
+                for x in self.types.get(resource_type, [])
+                if x in resource_paths
+            ]
+        if not property_path:
+            return {x: self.resources[x] for x in resource_paths}
+
+        elements = parse_property_path(property_path)
+        has_wildcard = "*" in elements
+        result = {}
+        for resource_path in resource_paths:
+            for location, value in select_values(
+                self.resources[resource_path], elements
+            ):
+                if has_wildcard:
+                    result[resource_path + to_json_pointer(location)] = value
+                else:
+                    result[resource_path] = value
+
+        return result
+
+
+def to_json_pointer(location):
+    r"""
+    Return the JSON pointer fragment for a location within a resource (e.g.
+    "#/Temperatures/0/ReadingCelsius").
+
+    Description of argument(s):
+    location                        A tuple of property names and list
+                                    indexes.
+    """
+
+    return "#/" + "/".join(
+        str(x).replace("~", "~0").replace("/", "~1") for x in location
+    )
+
+
+def select_values(data, elements):
+    r"""
+    Return a list of (location, value) tuples for the values in data selected
+    by the property path elements (see parse_property_path).
+
+    Description of argument(s):
+    data                            A resource dictionary.
+    elements                        A tuple of property path elements.
+    """
+
+    values = [((), data)]
+    for element in elements:
+        next_values = []
+        for location, value in values:
+            if element == "*":
+                if isinstance(value, dict):
+                    items = value.items()
+                elif isinstance(value, list):
+                    items = enumerate(value)
+                else:
+                    continue
+                next_values.extend(
+                    (location + (key,), sub_value) for key, sub_value in items
+                )
+            elif isinstance(element, int):
+                if isinstance(value, list) and element < len(value):
+                    next_values.append((location + (element,), value[element]))
+            elif isinstance(value, dict) and element in value:
+                next_values.append((location + (element,), value[element]))
+        values = next_values
+
+    return values
+
+
+def build_redfish_index(resources):
+    r"""
+    Build and return an index (a redfish_index_class object) of the
+    resources.
+
+    Description of argument(s):
+    resources                       The resources to be indexed.  This may be
+                                    a dictionary of resource path: resource
+                                    (e.g. from Enumerate Request with
+                                    return_json=0), the equivalent JSON
+                                    string (Enumerate Request's default
+                                    result) or the path of a tree file in
+                                    one of the formats accepted by
+                                    redfish_snapshot.load_tree (JSON,
+                                    NDJSON, snapshot or mockup directory).
+    """
+
+    if isinstance(resources, str):
+        if os.path.exists(resources):
+            resources = rs.load_tree(resources)
+        else:
+            resources = json.loads(resources)
+
+    return redfish_index_class(resources)
+
+
+def query_redfish_index(
+    index, path_pattern, property_path=None, resource_type=None
+):
+    r"""
+    Return a dictionary of the values selected by the query.  See the module
+    description and redfish_index_class.query for details.
+
+    Example robot code:
+
+    ${health}=  Query Redfish Index  ${index}  /redfish/v1/Chassis/*/Sensors/*
+    ...  Status.Health
+
+    Example result:
+
+    health:
+      [/redfish/v1/Chassis/chassis/Sensors/temp0]:      OK
+      [/redfish/v1/Chassis/chassis/Sensors/temp1]:      Warning
+
+    Description of argument(s):
+    index                           An index from build_redfish_index.
+    path_pattern                    A resource path pattern.
+    property_path                   A property path.
+    resource_type                   A resource type.
+    """
+
+    return index.query(path_pattern, property_path, resource_type)
+
+
+def get_redfish_resources_by_type(index, resource_type):
+    r"""
+    Return a dictionary of resource path: resource for each indexed resource
+    of the given type.  See redfish_index_class.get_by_type for details.
+
+    Description of argument(s):
+    index                           An index from build_redfish_index.
+    resource_type                   A resource type (e.g. "Sensor").
+    """
+
+    return index.get_by_type(resource_type)
+
+
+def get_redfish_property_values(index, name, path_pattern=None):
+    r"""
+    Return a dictionary of location: value for each indexed property with the
+    given name.  See redfish_index_class.get_property for details.
+
+    Description of argument(s):
+    index                           An index from build_redfish_index.
+    name                            The property name (e.g. "Health").
+    path_pattern                    A resource path pattern to which the
+                                    search is limited.
+    """
+
+    return index.get_property(name, path_pattern)
@@ -0,0 +1,930 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides a local HTTPS Redfish service which serves a resource
+tree from a file so that the redfish keywords in this directory can be run
+(and timed) without a BMC.
+
+The tree may be any of:
+- The JSON output of bmc_redfish_utils.enumerate_request.
+- The NDJSON output_file of enumerate_request.
+- A snapshot_file of enumerate_request (see redfish_snapshot.py).
+- A DMTF mockup directory (e.g. from Redfish-Mockup-Creator) containing
+  index.json files.
+
+The service supports sessions (with a limit on concurrent sessions), basic
+authentication, GET/HEAD with ETags and If-None-Match, $expand, $select,
+$skip/$top, PATCH (with If-Match), POST to collections and actions,
+DELETE, and configurable latency and error injection.  Changes are kept in
+memory only.
+
+Example robot code:
+
+Suite Setup  Start Redfish Mock Server  ${EXECDIR}/tree.json  port=8443
+Suite Teardown  Stop Redfish Mock Server
+
+Example command line:
+
+python3 lib/redfish_mock_server.py tree.json --port 8443 --latency 0.05
+"""
+
+import argparse
+import base64
+import copy
+import http.server
+import json
+import os
+import random
+import re
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import func_args as fa
+import redfish_snapshot as rs
+from robot.libraries.BuiltIn import BuiltIn
+
+session_service_uri = "/redfish/v1/SessionService"
+sessions_uri = "/redfish/v1/SessionService/Sessions"
+
+# Properties kept by $select in addition to those selected.
+select_keep_properties = ["@odata.id", "@odata.type", "@odata.context"]
+
+# ResetType: resulting PowerState for ComputerSystem.Reset actions.
+reset_power_states = {
+    "On": "On",
+    "ForceOn": "On",
+    "ForceOff": "Off",
+    "GracefulShutdown": "Off",
+    "PushPowerButton": None,
+    "ForceRestart": "On",
+    "GracefulRestart": "On",
+    "PowerCycle": "On",
+    "Nmi": "On",
+}
+
+
+def normalize_uri(uri):
+    r"""
+    Return the uri with any trailing slash removed.
+
+    Description of argument(s):
+    uri                             A resource path.
+    """
+
+    return uri.rstrip("/") or uri
+
+
+def create_certificate(dir_path):
+    r"""
+    Create a self-signed certificate and key in dir_path with openssl and
+    return a tuple of their paths.
+
+    Description of argument(s):
+    dir_path                        The directory in which to create the files.
+    """
+
+    cert_file = os.path.join(dir_path, "cert.pem")
+    key_file = os.path.join(dir_path, "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "30",
+            "-subj",
+            "/CN=localhost",
+            "-keyout",
+            key_file,
+            "-out",
+            cert_file,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    return cert_file, key_file
+
+
+class redfish_mock_server_class(http.server.ThreadingHTTPServer):
+    r"""
+    A threaded HTTPS server holding the mock resource tree.
+
+    Example code:
+
+    server = redfish_mock_server_class(rs.load_tree("tree.json"), port=8443)
+    server.start()
+    ...
+    server.stop()
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        tree,
+        port=0,
+        username="admin",
+        password="password",
+        max_sessions=16,
+        expand=1,
+        page_size=0,
+        latency=0,
+        jitter=0,
+        error_rate=0,
+        error_status=503,
+        error_uri_regex="",
+        cert_file=None,
+        key_file=None,
+        host="127.0.0.1",
+    ):
+        r"""
+        Create the server and bind it to host:port.
+
+        Description of argument(s):
+        tree                        A dictionary of resource path: resource
+                                    (see redfish_snapshot.load_tree).
+        port                        The port to listen on.  A value of 0
+                                    selects a free port (see get_port).
+        username                    The user name accepted for basic
+                                    authentication and session creation.
+        password                    The password for username.
+        max_sessions                The maximum number of concurrent sessions.
+        expand                      If 1, $expand and $select are supported
+                                    and advertised in the service root.
+        page_size                   The number of members returned per page of
+                                    a collection (with a
+                                    Members@odata.nextLink).  A value of 0
+                                    returns all members.
+        latency                     The number of seconds by which each
+                                    response is delayed.
+        jitter                      A maximum number of seconds randomly added
+                                    to latency.
+        error_rate                  The probability (0 to 1) that a request is
+                                    failed with error_status.
+        error_status                The HTTP status of injected errors.
+        error_uri_regex             Errors are only injected for resource paths
+                                    matching this regular expression.
+        cert_file                   The server certificate file.  If None, a
+                                    self-signed certificate is created.
+        key_file                    The server key file.
+        host                        The address to listen on.
+        """
+
+        self.tree = {}
+        self.etags = {}
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.username = username
+        self.password = password
+        self.max_sessions = int(max_sessions)
+        self.expand = int(expand)
+        self.page_size = int(page_size)
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.error_rate = float(error_rate)
+        self.error_status = int(error_status)
+        self.error_uri_regex = error_uri_regex
+        self.__thread = None
+        for uri, data in tree.items():
+            self.set_resource(uri, copy.deepcopy(data))
+        self.add_session_service()
+
+        super(redfish_mock_server_class, self).__init__(
+            (host, int(port)), redfish_mock_handler_class
+        )
+        if cert_file is None:
+            cert_file, key_file = create_certificate(tempfile.mkdtemp())
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    def get_port(self):
+        r"""
+        Return the port the server is listening on.
+        """
+
+        return self.server_address[1]
+
+    def start(self):
+        r"""
+        Serve requests in a background thread.
+        """
+
+        self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        r"""
+        Stop serving requests and close the listening socket.
+        """
+
+        self.shutdown()
+        self.server_close()
+        self.__thread = None
+
+    def configure(self, **kwargs):
+        r"""
+        Change the latency and error injection settings of a running server.
+
+        Description of argument(s):
+        kwargs                      Any of latency, jitter, error_rate,
+                                    error_status, error_uri_regex, page_size
+                                    and max_sessions.  See __init__ for
+                                    details.
+        """
+
+        conversions = {
+            "latency": float,
+            "jitter": float,
+            "error_rate": float,
+            "error_status": int,
+            "error_uri_regex": str,
+            "page_size": int,
+            "max_sessions": int,
+        }
+        for name, value in kwargs.items():
+            if name not in conversions:
+                raise ValueError("Unknown mock server setting: " + name)
+            setattr(self, name, conversions[name](value))
+
+    def set_resource(self, uri, data):
+        r"""
+        Add or replace a resource.  The caller must hold the lock if the
+        server is running.
+
+        Description of argument(s):
+        uri                         The resource path.
+        data                        The resource dictionary.
+        """
+
+        uri = normalize_uri(uri)
+        self.tree[uri] = data
+        self.etags[uri] = 'W/"' + rs.hash_resource(data)[:16] + '"'
+
+    def remove_resource(self, uri):
+        r"""
+        Remove a resource and its link from the Members of its parent
+        collection.  The caller must hold the lock.
+
+        Description of argument(s):
+        uri                         The resource path.
+        """
+
+        uri = normalize_uri(uri)
+        del self.tree[uri]
+        del self.etags[uri]
+        parent_uri = uri.rsplit("/", 1)[0]
+        parent = self.tree.get(parent_uri, None)
+        if parent is None or "Members" not in parent:
+            return
+        parent["Members"] = [
+            member
+            for member in parent["Members"]
+            if normalize_uri(member.get("@odata.id", "")) != uri
+        ]
+        parent["Members@odata.count"] = len(parent["Members"])
+        self.set_resource(parent_uri, parent)
+
+    def add_member(self, collection_uri, data):
+        r"""
+        Add a new member resource to a collection and return its path.  The
+        caller must hold the lock.
+
+        Description of argument(s):
+        collection_uri              The collection resource path.
+        data                        The new member resource dictionary.
+        """
+
+        collection = self.tree[collection_uri]
+        member_id = str(data.get("Id", "")) or str(len(self.tree))
+        while collection_uri + "/" + member_id in self.tree:
+            member_id = str(int(time.time() * 1000000))
+        uri = collection_uri + "/" + member_id
+        data["@odata.id"] = uri
+        data["Id"] = member_id
+        self.set_resource(uri, data)
+        collection.setdefault("Members", []).append({"@odata.id": uri})
+        collection["Members@odata.count"] = len(collection["Members"])
+        self.set_resource(collection_uri, collection)
+
+        return uri
+
+    def add_session_service(self):
+        r"""
+        Add the SessionService resources (which enumerations skip) and
+        advertise the supported query parameters in the service root.
+        """
+
+        self.tree.setdefault("/redfish/v1", {"@odata.id": "/redfish/v1"})
+        root = self.tree["/redfish/v1"]
+        root.setdefault("SessionService", {"@odata.id": session_service_uri})
+        root.setdefault("Links", {}).setdefault(
+            "Sessions", {"@odata.id": sessions_uri}
+        )
+        if self.expand:
+            root["ProtocolFeaturesSupported"] = {
+                "ExpandQuery": {
+                    "ExpandAll": True,
+                    "Levels": True,
+                    "Links": True,
+                    "NoLinks": True,
+                    "MaxLevels": 6,
+                },
+                "SelectQuery": True,
+            }
+        else:
+            root.pop("ProtocolFeaturesSupported", None)
+        self.set_resource("/redfish/v1", root)
+        if session_service_uri not in self.tree:
+            self.set_resource(
+                session_service_uri,
+                {
+                    "@odata.id": session_service_uri,
+                    "@odata.type": "#SessionService.v1_1_8.SessionService",
+                    "Id": "SessionService",
+                    "ServiceEnabled": True,
+                    "SessionTimeout": 3600,
+                    "Sessions": {"@odata.id": sessions_uri},
+                },
+            )
+        # Sessions from the captured tree are not valid here.
+        self.set_resource(
+            sessions_uri,
+            {
+                "@odata.id": sessions_uri,
+                "@odata.type": "#SessionCollection.SessionCollection",
+                "Name": "Session Collection",
+                "Members": [],
+                "Members@odata.count": 0,
+            },
+        )
+        for uri in list(self.tree.keys()):
+            if uri.startswith(sessions_uri + "/"):
+                del self.tree[uri]
+                del self.etags[uri]
+
+    def expand_resource(self, data, levels, links):
+        r"""
+        Return a copy of data with the links to subordinate resources
+        replaced by those resources, to a depth of levels.
+
+        Description of argument(s):
+        data                        The resource dictionary.
+        levels                      The number of levels to expand.
+        links                       If True, links within "Links" properties
+                                    are expanded too ($expand=* or ~).
+        """
+
+        def expand(value, levels, in_links):
+            if isinstance(value, list):
+                return [expand(element, levels, in_links) for element in value]
+            if not isinstance(value, dict):
+                return value
+            uri = normalize_uri(value.get("@odata.id", ""))
+            if (
+                len(value) == 1
+                and uri in self.tree
+                and levels > 0
+                and (links or not in_links)
+            ):
+                return expand(self.tree[uri], levels - 1, False)
+            return {
+                k: v
+                if k == "@odata.id"
+                else expand(v, levels, in_links or k == "Links")
+                for k, v in value.items()
+            }
+
+        return expand(data, int(levels) + 1, False)
+
+    def get_response_body(self, uri, query):
+        r"""
+        Return the body of a GET of uri with the query parameters applied.
+        The caller must hold the lock.
+
+        Description of argument(s):
+        uri                         The normalized resource path.
+        query                       A dictionary of query parameter: value.
+        """
+
+        data = self.tree[uri]
+        expand = query.get("$expand", None)
+        if expand and self.expand:
+            match = re.search(r"\$levels=([0-9]+)", expand)
+            levels = int(match.group(1)) if match else 1
+            data = self.expand_resource(data, levels, expand[0] in "*~")
+        select = query.get("$select", None)
+        if select and self.expand:
+            keep = select.split(",") + select_keep_properties
+            data = {k: v for k, v in data.items() if k in keep}
+        if "Members" in data and (
+            "$skip" in query or "$top" in query or self.page_size
+        ):
+            data = dict(data)
+            members = data["Members"]
+            skip = int(query.get("$skip", 0))
+            top = int(query.get("$top", self.page_size or len(members)))
+            data["Members"] = members[skip: skip + top]
+            data["Members@odata.count"] = len(members)
+            if skip + top < len(members):
+                data["Members@odata.nextLink"] = (
+                    uri + "?$skip=" + str(skip + top) + "&$top=" + str(top)
+                )
+
+        return data
+
+    def reset(self, uri, body):
+        r"""
+        Process a ComputerSystem/Manager/Chassis Reset action.  The caller
+        must hold the lock.
+
+        Description of argument(s):
+        uri                         The path of the resource being reset.
+        body                        The action request body.
+        """
+
+        resource = self.tree.get(uri, None)
+        if resource is None or "PowerState" not in resource:
+            return
+        reset_type = body.get("ResetType", "On")
+        power_state = reset_power_states.get(reset_type, None)
+        if power_state is None:
+            power_state = "Off" if resource["PowerState"] == "On" else "On"
+        resource["PowerState"] = power_state
+        self.set_resource(uri, resource)
+
+
+class redfish_mock_handler_class(http.server.BaseHTTPRequestHandler):
+    r"""
+    The request handler of redfish_mock_server_class.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "RedfishMock/1.0"
+    # The headers and body are written separately, so without this each
+    # keep-alive response waits on the client's delayed ACK (~40ms).
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data=None, headers=None):
+        r"""
+        Send a response with an optional JSON body.
+
+        Description of argument(s):
+        status                      The HTTP status code.
+        data                        The body dictionary or None.
+        headers                     A dictionary of extra headers.
+        """
+
+        body = b"" if data is None else json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("OData-Version", "4.0")
+        if data is not None:
+            self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_error_json(self, status, message_id, message, headers=None):
+        r"""
+        Send a Redfish error response.
+
+        Description of argument(s):
+        status                      The HTTP status code.
+        message_id                  The Base registry message name (e.g.
+                                    "ResourceNotFound").
+        message                     The message text.
+        headers                     A dictionary of extra headers.
+        """
+
+        self.send_json(
+            status,
+            {
+                "error": {
+                    "code": "Base.1.8." + message_id,
+                    "message": message,
+                    "@Message.ExtendedInfo": [
+                        {
+                            "MessageId": "Base.1.8." + message_id,
+                            "Message": message,
+                        }
+                    ],
+                }
+            },
+            headers,
+        )
+
+    def read_body(self):
+        r"""
+        Return the request body decoded as JSON or an empty dictionary.
+        """
+
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            return {}
+
+    def is_authorized(self):
+        r"""
+        Return True if the request carries a valid session token or basic
+        authentication credentials.
+        """
+
+        server = self.server
+        token = self.headers.get("X-Auth-Token", None)
+        if token is not None:
+            with server.lock:
+                return token in server.sessions
+        authorization = self.headers.get("Authorization", "")
+        if authorization.startswith("Basic "):
+            try:
+                credentials = base64.b64decode(authorization[6:]).decode()
+            except ValueError:
+                return False
+            return credentials == server.username + ":" + server.password
+        return False
+
+    def handle_request(self, uri, query):
+        r"""
+        Process the request and send the response.
+
+        Description of argument(s):
+        uri                         The normalized resource path.
+        query                       A dictionary of query parameter: value.
+        """
+
+        server = self.server
+        if uri == "/redfish":
+            self.send_json(200, {"v1": "/redfish/v1/"})
+            return
+        public = (self.command in ("GET", "HEAD") and uri == "/redfish/v1") or (
+            self.command == "POST" and uri == sessions_uri
+        )
+        if not public and not self.is_authorized():
+            self.send_error_json(
+                401, "NoValidSession", "No valid session or credentials."
+            )
+            return
+
+        method = getattr(self, "do_mock_" + self.command, None)
+        if method is None:
+            self.send_error_json(
+                405, "OperationNotAllowed", self.command + " is not allowed."
+            )
+            return
+        method(uri, query)
+
+    def do_mock_GET(self, uri, query):
+        server = self.server
+        data = None
+        with server.lock:
+            found = uri in server.tree
+            if found:
+                etag = server.etags[uri]
+                not_modified = self.headers.get("If-None-Match", None) == etag
+                if not not_modified:
+                    data = copy.deepcopy(server.get_response_body(uri, query))
+        if not found:
+            self.send_error_json(
+                404, "ResourceNotFound", uri + " was not found."
+            )
+        elif not_modified:
+            self.send_json(304, None, {"ETag": etag})
+        else:
+            self.send_json(200, data, {"ETag": etag})
+
+    do_mock_HEAD = do_mock_GET
+
+    def do_mock_PATCH(self, uri, query):
+        server = self.server
+        body = self.read_body()
+        with server.lock:
+            if uri not in server.tree:
+                status = 404
+            elif self.headers.get("If-Match", server.etags[uri]) not in (
+                server.etags[uri],
+                "*",
+            ):
+                status = 412
+            else:
+                resource = server.tree[uri]
+                merge_dicts(resource, body)
+                server.set_resource(uri, resource)
+                status = 200
+                data = copy.deepcopy(resource)
+                etag = server.etags[uri]
+        if status == 404:
+            self.send_error_json(
+                404, "ResourceNotFound", uri + " was not found."
+            )
+        elif status == 412:
+            self.send_error_json(
+                412, "PreconditionFailed", "The ETag does not match."
+            )
+        else:
+            self.send_json(200, data, {"ETag": etag})
+
+    def do_mock_POST(self, uri, query):
+        server = self.server
+        body = self.read_body()
+        if uri == sessions_uri:
+            self.create_session(body)
+            return
+        if "/Actions/" in uri:
+            target_uri = normalize_uri(uri.split("/Actions/")[0])
+            with server.lock:
+                found = target_uri in server.tree
+                if found and uri.endswith(".Reset"):
+                    server.reset(target_uri, body)
+            if not found:
+                self.send_error_json(
+                    404, "ResourceNotFound", target_uri + " was not found."
+                )
+            else:
+                self.send_json(204)
+            return
+        with server.lock:
+            resource = server.tree.get(uri, None)
+            if resource is None or "Members" not in resource:
+                location = None
+            else:
+                location = server.add_member(uri, body)
+                data = copy.deepcopy(server.tree[location])
+        if location is None:
+            self.send_error_json(
+                405, "OperationNotAllowed", "POST is not allowed on " + uri
+            )
+            return
+        self.send_json(201, data, {"Location": location})
+
+    def do_mock_DELETE(self, uri, query):
+        server = self.server
+        with server.lock:
+            found = uri in server.tree
+            if found:
+                server.remove_resource(uri)
+                for token, session_uri in list(server.sessions.items()):
+                    if session_uri == uri:
+                        del server.sessions[token]
+        if not found:
+            self.send_error_json(
+                404, "ResourceNotFound", uri + " was not found."
+            )
+        else:
+            self.send_json(204)
+
+    def create_session(self, body):
+        r"""
+        Create a session for the credentials in body.
+
+        Description of argument(s):
+        body                        The request body (with UserName and
+                                    Password).
+        """
+
+        server = self.server
+        if (
+            body.get("UserName", None) != server.username
+            or body.get("Password", None) != server.password
+        ):
+            self.send_error_json(
+                401, "NoValidSession", "Invalid user name or password."
+            )
+            return
+        with server.lock:
+            if len(server.sessions) >= server.max_sessions:
+                location = None
+            else:
+                token = uuid.uuid4().hex
+                location = server.add_member(
+                    sessions_uri,
+                    {
+                        "@odata.type": "#Session.v1_3_0.Session",
+                        "Id": token[:10],
+                        "Name": "User Session",
+                        "UserName": body["UserName"],
+                    },
+                )
+                server.sessions[token] = location
+                data = copy.deepcopy(server.tree[location])
+        if location is None:
+            self.send_error_json(
+                503,
+                "SessionLimitExceeded",
+                "The session limit has been exceeded.",
+            )
+            return
+        self.send_json(
+            201, data, {"Location": location, "X-Auth-Token": token}
+        )
+
+    def process_request(self):
+        r"""
+        Apply latency and error injection and then handle the request.
+        """
+
+        server = self.server
+        parts = urlsplit(self.path)
+        uri = normalize_uri(unquote(parts.path))
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if (
+            server.error_rate > 0
+            and random.random() < server.error_rate
+            and re.search(server.error_uri_regex, uri)
+        ):
+            # Discard any request body so that the connection may be reused.
+            self.read_body()
+            self.send_error_json(
+                server.error_status,
+                "ServiceTemporarilyUnavailable",
+                "Injected error.",
+                {"Retry-After": "1"},
+            )
+            return
+        self.handle_request(uri, query)
+
+    do_GET = process_request
+    do_HEAD = process_request
+    do_POST = process_request
+    do_PATCH = process_request
+    do_PUT = process_request
+    do_DELETE = process_request
+
+
+def merge_dicts(target, source):
+    r"""
+    Merge source into target, recursing into nested dictionaries, as a
+    Redfish PATCH does.
+
+    Description of argument(s):
+    target                          The dictionary to be updated.
+    source                          The dictionary of changes.
+    """
+
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key, None), dict):
+            merge_dicts(target[key], value)
+        elif value is None:
+            target.pop(key, None)
+        else:
+            target[key] = value
+
+
+# The server started by start_redfish_mock_server.
+server = None
+
+
+def start_redfish_mock_server(tree_path, port=0, **kwargs):
+    r"""
+    Start the mock server in a background thread and return its port.
+
+    Description of argument(s):
+    tree_path                       The path of the tree file or mockup
+                                    directory (see redfish_snapshot.load_tree).
+    port                            The port to listen on (0 for any free
+                                    port).
+    kwargs                          See redfish_mock_server_class.__init__ for
+                                    details.  username and password default to
+                                    ${BMC_USERNAME} and ${BMC_PASSWORD}.
+    """
+
+    global server
+
+    if server is not None:
+        stop_redfish_mock_server()
+    kwargs = fa.args_to_objects(kwargs)
+    for name, var_name in (
+        ("username", "${BMC_USERNAME}"),
+        ("password", "${BMC_PASSWORD}"),
+    ):
+        if name not in kwargs:
+            value = BuiltIn().get_variable_value(var_name, None)
+            if value is not None:
+                kwargs[name] = value
+    server = redfish_mock_server_class(rs.load_tree(tree_path), port, **kwargs)
+    server.start()
+
+    return server.get_port()
+
+
+def stop_redfish_mock_server():
+    r"""
+    Stop the mock server, if running.
+    """
+
+    global server
+
+    if server is not None:
+        server.stop()
+        server = None
+
+
+def configure_redfish_mock_server(**kwargs):
+    r"""
+    Change the latency and error injection settings of the running mock
+    server.
+
+    Example robot code:
+
+    Configure Redfish Mock Server  latency=0.2  error_rate=0.05
+
+    Description of argument(s):
+    kwargs                          See redfish_mock_server_class.configure for
+                                    details.
+    """
+
+    server.configure(**fa.args_to_objects(kwargs))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a Redfish resource tree over HTTPS."
+    )
+    parser.add_argument(
+        "tree_path",
+        help="An enumerate_request JSON/NDJSON/snapshot file or a DMTF mockup"
+        + " directory.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--max_sessions", type=int, default=16)
+    parser.add_argument("--no_expand", action="store_true")
+    parser.add_argument("--page_size", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error_rate", type=float, default=0)
+    parser.add_argument("--error_status", type=int, default=503)
+    parser.add_argument("--error_uri_regex", default="")
+    parser.add_argument("--cert_file", default=None)
+    parser.add_argument("--key_file", default=None)
+    args = parser.parse_args()
+
+    mock_server = redfish_mock_server_class(
+        rs.load_tree(args.tree_path),
+        port=args.port,
+        username=args.username,
+        password=args.password,
+        max_sessions=args.max_sessions,
+        expand=0 if args.no_expand else 1,
+        page_size=args.page_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        error_uri_regex=args.error_uri_regex,
+        cert_file=args.cert_file,
+        key_file=args.key_file,
+        host=args.host,
+    )
+    print(
+        "Serving " + str(len(mock_server.tree)) + " resources on https://"
+        + args.host + ":" + str(mock_server.get_port())
+    )
+    try:
+        mock_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    mock_server.server_close()
+
+
+if __name__ == "__main__":
+    main()
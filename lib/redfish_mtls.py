@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides the mutual TLS (client certificate) client used by the
+*_with_mtls methods of redfish_plus.py when ${MTLS_ENABLED} is True.
+
+Each client certificate is loaded from disk into an SSL context only once
+per process.  Each mtls_session_class object keeps a pool of connections to
+its BMC for each certificate, so that only the first request made with a
+certificate pays for the mutual TLS handshake.  Since a connection is
+authenticated by the certificate it was opened with, connections are never
+shared between certificates.
+
+The responses returned have the status, dict, read and getheader members of
+the DMTF redfish library's responses, so they may be used in the same way.
+"""
+
+import json
+import os
+import ssl
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# The SSL context for each (certificate file, verify) tuple.
+ssl_contexts = {}
+ssl_contexts_lock = threading.Lock()
+
+
+def get_ssl_context(cert_file, verify=False):
+    r"""
+    Return an SSL context holding the client certificate in cert_file,
+    creating it on first use.
+
+    Description of argument(s):
+    cert_file                       The path of a PEM file containing the
+                                    client certificate and its private key.
+    verify                          If True, the server's certificate is
+                                    verified against the default CA
+                                    certificates.  If a string, it is the
+                                    path of a CA bundle to verify against.
+    """
+
+    key = (cert_file, verify)
+    context = ssl_contexts.get(key, None)
+    if context is not None:
+        return context
+
+    context = ssl.create_default_context(
+        cafile=verify if isinstance(verify, str) else None
+    )
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    context.load_cert_chain(cert_file)
+    with ssl_contexts_lock:
+        return ssl_contexts.setdefault(key, context)
+
+
+class ssl_context_adapter_class(HTTPAdapter):
+    r"""
+    A requests transport adapter whose connections use a given SSL context.
+    """
+
+    def __init__(self, ssl_context, **kwargs):
+        r"""
+        Description of argument(s):
+        ssl_context                 The ssl.SSLContext object.
+        kwargs                      Passed to HTTPAdapter (e.g.
+                                    pool_maxsize).
+        """
+
+        self.ssl_context = ssl_context
+        super(ssl_context_adapter_class, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        return super(ssl_context_adapter_class, self).init_poolmanager(
+            *args, **kwargs
+        )
+
+
+def adapt_response(response):
+    r"""
+    Add the members of a DMTF redfish response (status, dict, read and
+    getheader) to a requests response and return it.
+
+    Description of argument(s):
+    response                        A requests.Response object.
+    """
+
+    response.status = response.status_code
+    response.read = response.text
+    response.getheader = response.headers.get
+    try:
+        response.dict = json.loads(response.text) if response.text else {}
+    except ValueError:
+        response.dict = {}
+
+    return response
+
+
+class mtls_session_class:
+    r"""
+    A pooled mutual TLS client for one BMC.
+
+    Example code:
+
+    session = mtls_session_class("https://bmc:443", "/certs", "valid.pem")
+    response = session.request("GET", "/redfish/v1/Systems")
+    """
+
+    def __init__(
+        self,
+        base_url,
+        cert_dir_path,
+        default_certificate,
+        verify=False,
+        pool_maxsize=16,
+    ):
+        r"""
+        Description of argument(s):
+        base_url                    The URL of the BMC (e.g.
+                                    "https://bmc:443").  A host name alone is
+                                    taken to mean https on the default port.
+        cert_dir_path               The directory containing the client
+                                    certificate files.
+        default_certificate         The name of the certificate file used
+                                    when a request does not specify one.
+        verify                      See get_ssl_context.
+        pool_maxsize                The maximum number of connections kept
+                                    open for each certificate.
+        """
+
+        if "://" not in base_url:
+            base_url = "https://" + base_url
+        self.base_url = base_url.rstrip("/")
+        self.cert_dir_path = cert_dir_path
+        self.default_certificate = default_certificate
+        self.verify = verify
+        self.pool_maxsize = int(pool_maxsize)
+        self.lock = threading.Lock()
+        # The requests session for each certificate name.
+        self.sessions = {}
+
+    def get_session(self, certificate_name):
+        r"""
+        Return the requests session whose connections use the given
+        certificate, creating it on first use.
+
+        Description of argument(s):
+        certificate_name            The name of a file in cert_dir_path.
+        """
+
+        session = self.sessions.get(certificate_name, None)
+        if session is not None:
+            return session
+
+        ssl_context = get_ssl_context(
+            os.path.join(self.cert_dir_path, certificate_name), self.verify
+        )
+        session = requests.Session()
+        session.mount(
+            "https://",
+            ssl_context_adapter_class(
+                ssl_context,
+                pool_connections=1,
+                pool_maxsize=self.pool_maxsize,
+            ),
+        )
+        with self.lock:
+            session = self.sessions.setdefault(certificate_name, session)
+
+        return session
+
+    def request(
+        self,
+        method,
+        uri,
+        certificate=None,
+        body=None,
+        headers=None,
+        args=None,
+        timeout=None,
+    ):
+        r"""
+        Send one request and return the response (see adapt_response).
+
+        Description of argument(s):
+        method                      The HTTP method (e.g. "GET").
+        uri                         The resource path (e.g.
+                                    "/redfish/v1/Systems").
+        certificate                 A dictionary whose certificate_name
+                                    entry names the certificate file to use
+                                    (e.g. {"certificate_name": "valid.pem"}).
+                                    The default is default_certificate.
+        body                        The request body, sent as JSON.
+        headers                     A dictionary of request headers.
+        args                        A dictionary of query parameters.
+        timeout                     The timeout in seconds.
+        """
+
+        certificate_name = (certificate or {}).get(
+            "certificate_name", self.default_certificate
+        )
+        request_headers = (
+            {"Cache-Control": "no-cache"}
+            if method == "GET"
+            else {"Content-Type": "application/json"}
+        )
+        request_headers.update(headers or {})
+        response = self.get_session(certificate_name).request(
+            method,
+            self.base_url + uri,
+            json=body,
+            headers=request_headers,
+            params=args,
+            timeout=timeout,
+            verify=self.verify,
+        )
+
+        return adapt_response(response)
+
+    def close(self):
+        r"""
+        Close all pooled connections.
+        """
+
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+        for session in sessions:
+            session.close()
@@ -19,12 +19,18 @@ r"""
 See redfish_plus class prolog below for details.
 """
 
-import json
+import collections
+import time
 
 import func_args as fa
 import gen_print as gp
+import redfish_governor as rgov
+import redfish_mtls as rmtls
+import redfish_retry_policy as rrp
+import redfish_stats as rstats
 import requests
-from redfish.rest.v1 import HttpClient
+import response_cache as rc
+from redfish.rest.v1 import HttpClient, RetriesExhaustedError
 from robot.libraries.BuiltIn import BuiltIn
 
 host = BuiltIn().get_variable_value("${BMC_HOST}")
@@ -68,9 +74,37 @@ class redfish_plus(HttpClient):
         - Automatic valid_status_codes processing (i.e. an exception will be raised if the rest response
           status code is not as expected.
         - Easily used from robot programs.
+        - An optional, per-suite cache of GET responses (see enable_response_cache).
+        - Optional per-request timing records and hooks (see enable_request_timing and add_request_hook).
+        - Per-endpoint latency histograms and request accounting (see redfish_stats.py).
+        - A per-BMC limit on requests in flight and requests per second (see redfish_governor.py).
+        - Pooled mutual TLS connections when ${MTLS_ENABLED} is True (see redfish_mtls.py).
     """
 
     ROBOT_LIBRARY_SCOPE = "TEST SUITE"
+    # Writes the request statistics report at the end of each suite.
+    ROBOT_LIBRARY_LISTENER = rstats.report_listener
+
+    # The response cache is off unless a suite turns it on.
+    _response_cache = None
+    # Request timing is off unless a suite turns it on.
+    _request_timings = None
+    # The timeout used when a request does not give one (see set_default_timeout).
+    _default_timeout = None
+    _request_hooks = ()
+    # The mutual TLS client is created on first use (see get_mtls_session).
+    _mtls_session = None
+    _mtls_base_url = None
+
+    def get_base_url(self):
+        r"""
+        Return the URL of the BMC (e.g. "https://bmc:443").
+        """
+
+        if MTLS_ENABLED == "True":
+            # bmc_redfish skips HttpClient.__init__ in mTLS mode, so the base URL is never set there.
+            return self.get_mtls_session().base_url
+        return super(redfish_plus, self).get_base_url()
 
     def rest_request(self, func, *args, **kwargs):
         r"""
@@ -124,32 +158,303 @@ class redfish_plus(HttpClient):
         As part of a robot test, the programmer has logged out to verify that the get request will generate a
         status code of 401 (i.e. "Unauthorized").
 
-        Timeout for GET/POST/PATCH/DELETE operations. By default 30 seconds, else user defined value.
-        Similarly, Max retry by default 10 attempt for the operation, else user defined value.
+        Timeout for GET/POST/PATCH/DELETE operations. By default 30 seconds (or as set for the endpoint or by
+        set_default_timeout), else user defined value.  Similarly, Max retry by default 10 attempt for the
+        operation, else user defined value.  Retries are made with a capped exponential backoff and fail fast
+        while the BMC's circuit is open.  See redfish_retry_policy.py for details and the robot config
+        variables which change these defaults.
         """
+        # Note: qprint_executing returns without inspecting the stack or building the call line when quiet
+        # is set.
         gp.qprint_executing(stack_frame_ix=3, style=gp.func_line_style_short)
         # Convert python string object definitions to objects (mostly useful for robot callers).
         args = fa.args_to_objects(args)
         kwargs = fa.args_to_objects(kwargs)
-        timeout = kwargs.pop("timeout", 30)
+        policy = rrp.get_retry_policy()
+        timeout = kwargs.pop("timeout", None)
+        if timeout is None:
+            timeout = self._default_timeout
+        timeout = policy.get_timeout(str(args[0]) if args else "", timeout)
         self._timeout = timeout
-        max_retry = kwargs.pop("max_retry", 10)
+        max_retry = policy.get_max_retry(kwargs.pop("max_retry", None))
         self._max_retry = max_retry
         valid_status_codes = kwargs.pop("valid_status_codes", [200, 201, 202, 204])
-
-        response = func(*args, **kwargs)
+        # The policy does the retrying, so each attempt is made only once by the HTTP client.
+        kwargs["max_retry"] = 0
+        # The timeout is passed with each call rather than read from self._timeout, which other threads
+        # sharing this object may change.
+        kwargs["timeout"] = timeout
+
+        circuit = policy.get_circuit(self.get_base_url())
+        attempt = 0
+        while True:
+            circuit.check()
+            try:
+                response = self.send_request(func, *args, **kwargs)
+            except (RetriesExhaustedError, requests.exceptions.RequestException):
+                circuit.record_failure()
+                if attempt >= max_retry or circuit.is_open() or not policy.spend_retry():
+                    raise
+                attempt += 1
+                time.sleep(policy.get_backoff(attempt))
+                continue
+            circuit.record_success()
+            break
         valid_http_status_code(response.status, valid_status_codes)
         return response
 
+    def send_request(self, func, *args, **kwargs):
+        r"""
+        Call func once, subject to the BMC's concurrency governor (see redfish_governor.py), and return the
+        response.  The call is recorded if request timing, hooks or request statistics are enabled.
+
+        Description of argument(s):
+        func                        See rest_request for details.
+        args                        Passed directly to func.
+        kwargs                      Passed directly to func.
+        """
+
+        record = (
+            self._request_timings is not None
+            or self._request_hooks
+            or rstats.is_enabled()
+        )
+        governor = rgov.get_governor(self.get_base_url())
+        governor.acquire()
+        start_time = time.time()
+        status = None
+        num_bytes = 0
+        try:
+            response = func(*args, **kwargs)
+            status = response.status
+            if record:
+                # DMTF responses hold the body in "read", requests responses in "content".
+                num_bytes = len(
+                    getattr(response, "read", None)
+                    or getattr(response, "content", None)
+                    or ""
+                )
+        finally:
+            seconds = time.time() - start_time
+            governor.release(status, seconds)
+            if record:
+                self.record_request(
+                    func.__name__.replace("_with_mtls", "").upper(),
+                    str(args[0]) if args else "",
+                    status,
+                    seconds,
+                    num_bytes,
+                )
+        return response
+
+    def record_request(self, method, uri, status, seconds, num_bytes=0):
+        r"""
+        Save a timing record for one request (if request timing is enabled), account for it in the
+        per-endpoint request statistics (see redfish_stats.py) and pass it to each request hook.
+
+        Description of argument(s):
+        method                      The HTTP method (e.g. "GET").
+        uri                         The resource path.
+        status                      The HTTP status code or None if the request raised an exception.
+        seconds                     The time taken by the request.
+        num_bytes                   The size of the response body.
+        """
+
+        rstats.record_request(method, uri, status, seconds, num_bytes)
+
+        if self._request_timings is not None:
+            self._request_timings.append(
+                {
+                    "method": method,
+                    "uri": uri,
+                    "status": status,
+                    "seconds": round(seconds, 6),
+                }
+            )
+        for hook in self._request_hooks:
+            hook(method, uri, status, seconds)
+
+    def set_default_timeout(self, timeout=None):
+        r"""
+        Set the timeout used by this object's requests which do not give one.  This also applies to the
+        requests made by methods which take no timeout argument (e.g. bmc_redfish.get_members_list).
+
+        Description of argument(s):
+        timeout                     The timeout in seconds, or None for the retry policy's timeout (see
+                                    redfish_retry_policy.py).
+        """
+
+        self._default_timeout = None if timeout is None else int(timeout)
+
+    def enable_request_timing(self, max_entries=10000):
+        r"""
+        Start keeping a timing record (method, URI, status and latency) for each request made by this object.
+
+        Example robot code:
+
+        Redfish.Enable Request Timing
+        ...
+        ${timings}=  Redfish.Get Request Timings
+
+        Description of argument(s):
+        max_entries                 The maximum number of records to keep.  The oldest records are discarded
+                                    first.
+        """
+
+        self._request_timings = collections.deque(maxlen=int(max_entries))
+
+    def disable_request_timing(self):
+        r"""
+        Stop keeping request timing records and discard the records kept so far.
+        """
+
+        self._request_timings = None
+
+    def get_request_timings(self):
+        r"""
+        Return the list of request timing records.
+
+        Example result:
+
+        [
+            {'method': 'GET', 'uri': '/redfish/v1/Systems', 'status': 200, 'seconds': 0.041208},
+            ...
+        ]
+        """
+
+        if self._request_timings is None:
+            return []
+        return list(self._request_timings)
+
+    def add_request_hook(self, hook):
+        r"""
+        Register a function to be called after each request as hook(method, uri, status, seconds).  See
+        record_request for details.
+
+        Description of argument(s):
+        hook                        The function to be called.
+        """
+
+        if hook not in self._request_hooks:
+            self._request_hooks = self._request_hooks + (hook,)
+
+    def remove_request_hook(self, hook):
+        r"""
+        Unregister a function registered with add_request_hook.
+
+        Description of argument(s):
+        hook                        The function to be unregistered.
+        """
+
+        self._request_hooks = tuple(x for x in self._request_hooks if x != hook)
+
+    def enable_response_cache(self, max_entries=256, ttl=5):
+        r"""
+        Turn on caching of GET responses for this suite.
+
+        Responses carrying an ETag are revalidated with an If-None-Match
+        request on every get() and are only re-downloaded if they changed.
+        Responses without an ETag are served from the cache for ttl seconds.
+        POST, PUT, PATCH and DELETE requests discard the cached responses for
+        the URI being written, its sub-resources and its parent collection.
+
+        Note that resp.dict is decoded from the cached body on each access, so
+        callers may safely modify the dictionary they are given.
+
+        Example robot code:
+
+        Suite Setup  Redfish.Enable Response Cache  max_entries=128  ttl=10
+
+        Description of argument(s):
+        max_entries                 The maximum number of responses to keep
+                                    (least recently used are discarded first).
+        ttl                         The number of seconds a response without
+                                    an ETag remains valid.
+        """
+
+        self._response_cache = rc.response_cache(max_entries, ttl)
+
+    def disable_response_cache(self):
+        r"""
+        Turn off caching of GET responses and discard all cached responses.
+        """
+
+        self._response_cache = None
+
+    def clear_response_cache(self):
+        r"""
+        Discard all cached GET responses.
+        """
+
+        if self._response_cache is not None:
+            self._response_cache.clear()
+
+    def get_response_cache_stats(self):
+        r"""
+        Return a dictionary of response cache statistics or an empty
+        dictionary if the cache is not enabled.
+
+        Example result:
+
+        {'hits': 12, 'revalidated': 30, 'misses': 9, 'entries': 9}
+        """
+
+        if self._response_cache is None:
+            return {}
+        return self._response_cache.get_stats()
+
+    def invalidate_response_cache(self, *args):
+        r"""
+        Discard cached responses which may be affected by a write request.
+
+        Description of argument(s):
+        args                        The positional arguments of the write
+                                    request.  The first one is the URI.
+        """
+
+        if self._response_cache is not None and args:
+            self._response_cache.invalidate(str(args[0]))
+
     # Define rest function wrappers.
     def get(self, *args, **kwargs):
         if MTLS_ENABLED == "True":
             return self.rest_request(self.get_with_mtls, *args, **kwargs)
-        else:
+        if (
+            self._response_cache is None
+            or len(args) != 1
+            or "headers" in kwargs
+            or "args" in kwargs
+        ):
             return self.rest_request(
                 super(redfish_plus, self).get, *args, **kwargs
             )
 
+        # Serve the request from the response cache where possible.
+        valid_status_codes = kwargs.pop(
+            "valid_status_codes", [200, 201, 202, 204]
+        )
+        entry = self._response_cache.lookup(args[0])
+        if entry is not None and self._response_cache.is_fresh(entry):
+            valid_http_status_code(entry["response"].status, valid_status_codes)
+            return entry["response"]
+
+        headers = None
+        if entry is not None and entry["etag"] is not None:
+            headers = {"If-None-Match": entry["etag"]}
+        response = self.rest_request(
+            super(redfish_plus, self).get,
+            *args,
+            **kwargs,
+            headers=headers,
+            valid_status_codes=[]
+        )
+        if response.status == 304 and entry is not None:
+            response = self._response_cache.revalidated(entry)
+        else:
+            self._response_cache.store(args[0], response)
+        valid_http_status_code(response.status, valid_status_codes)
+        return response
+
     def head(self, *args, **kwargs):
         if MTLS_ENABLED == "True":
             return self.rest_request(self.head_with_mtls, *args, **kwargs)
@@ -159,6 +464,7 @@ class redfish_plus(HttpClient):
             )
 
     def post(self, *args, **kwargs):
+        self.invalidate_response_cache(*args)
         if MTLS_ENABLED == "True":
             return self.rest_request(self.post_with_mtls, *args, **kwargs)
         else:
@@ -167,6 +473,7 @@ class redfish_plus(HttpClient):
             )
 
     def put(self, *args, **kwargs):
+        self.invalidate_response_cache(*args)
         if MTLS_ENABLED == "True":
             return self.rest_request(self.put_with_mtls, *args, **kwargs)
         else:
@@ -176,12 +483,18 @@ class redfish_plus(HttpClient):
 
     def patch(self, *args, **kwargs):
 
+        self.invalidate_response_cache(*args)
         # Set quiet variable to keep subordinate get() calls quiet.
         quiet = 1
         # If Etag available, then add If-Match header in PATCH request
-        response = self.rest_request(
-            super(redfish_plus, self).get, *args, valid_status_codes=[]
-        )
+        if MTLS_ENABLED == "True":
+            response = self.rest_request(
+                self.get_with_mtls, *args, valid_status_codes=[]
+            )
+        else:
+            response = self.rest_request(
+                super(redfish_plus, self).get, *args, valid_status_codes=[]
+            )
 
         headers = None
         etag = response.getheader("Etag")
@@ -199,6 +512,7 @@ class redfish_plus(HttpClient):
             )
 
     def delete(self, *args, **kwargs):
+        self.invalidate_response_cache(*args)
         if MTLS_ENABLED == "True":
             return self.rest_request(self.delete_with_mtls, *args, **kwargs)
         else:
@@ -209,90 +523,66 @@ class redfish_plus(HttpClient):
     def __del__(self):
         del self
 
-    def get_with_mtls(self, *args, **kwargs):
-        cert_dict = kwargs.pop("certificate", {"certificate_name": VALID_CERT})
-        response = requests.get(
-            url="https://" + host + args[0],
-            cert=CERT_DIR_PATH + "/" + cert_dict["certificate_name"],
-            verify=False,
-            headers={"Cache-Control": "no-cache"},
-        )
-
-        response.status = response.status_code
-        if response.status == 200:
-            response.dict = json.loads(response.text)
-
-        return response
+    def get_mtls_session(self):
+        r"""
+        Return this object's mutual TLS client (see redfish_mtls.py), creating it on first use.
+        """
 
-    def post_with_mtls(self, *args, **kwargs):
-        cert_dict = kwargs.pop("certificate", {"certificate_name": VALID_CERT})
-        body = kwargs.pop("body", {})
-        response = requests.post(
-            url="https://" + host + args[0],
-            json=body,
-            cert=CERT_DIR_PATH + "/" + cert_dict["certificate_name"],
-            verify=False,
-            headers={"Content-Type": "application/json"},
-        )
+        if self._mtls_session is None:
+            self._mtls_session = rmtls.mtls_session_class(
+                self._mtls_base_url or host, CERT_DIR_PATH, VALID_CERT
+            )
+        return self._mtls_session
 
-        response.status = response.status_code
+    def set_mtls_base_url(self, base_url):
+        r"""
+        Set the URL of the BMC to which mutual TLS requests are sent.  The default is ${BMC_HOST}.
 
-        return response
+        Description of argument(s):
+        base_url                    The URL of the BMC (e.g. "https://bmc:443").
+        """
 
-    def patch_with_mtls(self, *args, **kwargs):
-        cert_dict = kwargs.pop("certificate", {"certificate_name": VALID_CERT})
-        body = kwargs.pop("body", {})
-        response = requests.patch(
-            url="https://" + host + args[0],
-            json=body,
-            cert=CERT_DIR_PATH + "/" + cert_dict["certificate_name"],
-            verify=False,
-            headers={"Content-Type": "application/json"},
-        )
+        if self._mtls_session is not None:
+            self._mtls_session.close()
+            self._mtls_session = None
+        self._mtls_base_url = base_url
 
-        response.status = response.status_code
+    def mtls_request(self, method, *args, **kwargs):
+        r"""
+        Send one request with the mutual TLS client and return the response.
 
-        return response
+        Description of argument(s):
+        method                      The HTTP method (e.g. "GET").
+        args                        The resource path.
+        kwargs                      The certificate, body, headers, args and timeout arguments are passed
+                                    to redfish_mtls.mtls_session_class.request.  Others (e.g. max_retry)
+                                    are ignored.
+        """
 
-    def delete_with_mtls(self, *args, **kwargs):
-        cert_dict = kwargs.pop("certificate", {"certificate_name": VALID_CERT})
-        response = requests.delete(
-            url="https://" + host + args[0],
-            cert=CERT_DIR_PATH + "/" + cert_dict["certificate_name"],
-            verify=False,
-            headers={"Content-Type": "application/json"},
+        return self.get_mtls_session().request(
+            method,
+            args[0],
+            certificate=kwargs.get("certificate", None),
+            body=kwargs.get("body", {} if method in ("POST", "PUT", "PATCH") else None),
+            headers=kwargs.get("headers", None),
+            args=kwargs.get("args", None),
+            timeout=kwargs.get("timeout", None),
         )
 
-        response.status = response.status_code
+    def get_with_mtls(self, *args, **kwargs):
+        return self.mtls_request("GET", *args, **kwargs)
 
-        return response
+    def post_with_mtls(self, *args, **kwargs):
+        return self.mtls_request("POST", *args, **kwargs)
 
-    def put_with_mtls(self, *args, **kwargs):
-        cert_dict = kwargs.pop("certificate", {"certificate_name": VALID_CERT})
-        body = kwargs.pop("body", {})
-        response = requests.put(
-            url="https://" + host + args[0],
-            json=body,
-            cert=CERT_DIR_PATH + "/" + cert_dict["certificate_name"],
-            verify=False,
-            headers={"Content-Type": "application/json"},
-        )
+    def patch_with_mtls(self, *args, **kwargs):
+        return self.mtls_request("PATCH", *args, **kwargs)
 
-        response.status = response.status_code
+    def delete_with_mtls(self, *args, **kwargs):
+        return self.mtls_request("DELETE", *args, **kwargs)
 
-        return response
+    def put_with_mtls(self, *args, **kwargs):
+        return self.mtls_request("PUT", *args, **kwargs)
 
     def head_with_mtls(self, *args, **kwargs):
-        cert_dict = kwargs.pop("certificate", {"certificate_name": VALID_CERT})
-        body = kwargs.pop("body", {})
-        response = requests.head(
-            url="https://" + host + args[0],
-            json=body,
-            cert=CERT_DIR_PATH + "/" + cert_dict["certificate_name"],
-            verify=False,
-            headers={"Content-Type": "application/json"},
-        )
-
-        response.status = response.status_code
-
-        return response
+        return self.mtls_request("HEAD", *args, **kwargs)
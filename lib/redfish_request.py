@@ -17,17 +17,87 @@
 
 import json
 import secrets
+import ssl
 import string
+import threading
+import time
 import urllib.request
+from urllib.parse import urlparse
 
+import redfish_governor as rgov
+import redfish_stats as rstats
 import requests
+from requests.adapters import HTTPAdapter
 from robot.api import logger
 from robot.api.deco import keyword
 from robot.libraries.BuiltIn import BuiltIn
 from urllib3.exceptions import InsecureRequestWarning
 
+# Per-host keep-alive sessions shared by every redfish_request instance.  The
+# dictionary is keyed by (scheme://host:port, verify) so that a session only
+# ever carries one SSL context.
+sessions = {}
+# SSL contexts keyed by the requests "verify" value.
+ssl_contexts = {}
+sessions_lock = threading.Lock()
+
+
+def get_ssl_context(verify=False):
+    r"""
+    Return a cached SSL context suitable for the given verify value.
+
+    Building an SSL context (and loading the CA bundle into it) is repeated for
+    every connection when requests is left to its own devices.  Caching one
+    context per verify value lets all pooled connections share it.
+
+    Description of argument(s):
+    verify          False (no certificate verification), True (verify using
+                    the default CA bundle) or the path of a CA bundle file.
+    """
+
+    with sessions_lock:
+        context = ssl_contexts.get(verify, None)
+        if context is not None:
+            return context
+        if verify is False:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif verify is True:
+            context = ssl.create_default_context()
+        else:
+            context = ssl.create_default_context(cafile=verify)
+        ssl_contexts[verify] = context
+
+    return context
+
+
+class ssl_context_adapter(HTTPAdapter):
+    r"""
+    HTTPAdapter which hands a cached SSL context to its connection pools.
+    """
+
+    def __init__(self, ssl_context, **kwargs):
+        r"""
+        Description of argument(s):
+        ssl_context     The ssl.SSLContext to be used for every connection.
+        kwargs          Passed directly to HTTPAdapter (e.g. pool_maxsize).
+        """
+
+        self.ssl_context = ssl_context
+        super(ssl_context_adapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        return super(ssl_context_adapter, self).init_poolmanager(
+            *args, **kwargs
+        )
+
 
 class redfish_request(object):
+    # Writes the request statistics report at the end of each suite.
+    ROBOT_LIBRARY_LISTENER = rstats.report_listener
+
     @staticmethod
     def generate_clientid():
         r"""
@@ -62,6 +132,131 @@ class redfish_request(object):
 
         return form_url
 
+    @staticmethod
+    def get_session(url, verify=False):
+        r"""
+        Return the pooled keep-alive session for the host in url, creating it
+        on first use.
+
+        The pool size and keep-alive behavior may be set from the robot
+        config file:
+        -v REDFISH_POOL_SIZE:10
+        -v REDFISH_KEEP_ALIVE:1
+
+        Description of argument(s):
+        url            A complete url (e.g. "https://xx.xx.xx.xx:443/redfish/v1").
+        verify         See request_get() for details.
+        """
+
+        parsed_url = urlparse(url)
+        key = (parsed_url.scheme + "://" + parsed_url.netloc, verify)
+        session = sessions.get(key, None)
+        if session is not None:
+            return session
+
+        pool_size = int(
+            BuiltIn().get_variable_value("${REDFISH_POOL_SIZE}", 10)
+        )
+        keep_alive = int(
+            BuiltIn().get_variable_value("${REDFISH_KEEP_ALIVE}", 1)
+        )
+        adapter = ssl_context_adapter(
+            get_ssl_context(verify),
+            pool_connections=1,
+            pool_maxsize=pool_size,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        with sessions_lock:
+            # Another thread may have won the race to create the session.
+            return sessions.setdefault(key, session)
+
+    @staticmethod
+    def get_connection_stats():
+        r"""
+        Return a dictionary of connection-reuse statistics for each pooled
+        host.
+
+        Example result:
+
+        {
+            'https://xx.xx.xx.xx:443': {
+                'requests': 42,
+                'connections': 2,
+                'reused': 40
+            }
+        }
+
+        Example robot code:
+
+        ${stats}=  Get Connection Stats
+        Rprint Vars  stats
+        """
+
+        stats = {}
+        for (host, verify), session in list(sessions.items()):
+            host_stats = stats.setdefault(
+                host, {"requests": 0, "connections": 0, "reused": 0}
+            )
+            for adapter in session.adapters.values():
+                for pool_key in adapter.poolmanager.pools.keys():
+                    pool = adapter.poolmanager.pools[pool_key]
+                    host_stats["requests"] += pool.num_requests
+                    host_stats["connections"] += pool.num_connections
+            host_stats["reused"] = max(
+                0, host_stats["requests"] - host_stats["connections"]
+            )
+
+        return stats
+
+    @staticmethod
+    def close_sessions():
+        r"""
+        Close all pooled sessions and their connections.
+
+        The next request to a host will open a fresh session.
+        """
+
+        with sessions_lock:
+            for session in sessions.values():
+                session.close()
+            sessions.clear()
+
+    @staticmethod
+    def send_request(method, url, **kwargs):
+        r"""
+        Send a request on the pooled session for the host in url, subject to
+        the host's concurrency governor (see redfish_governor.py), account for
+        it in the request statistics (see redfish_stats.py) and return the
+        response.
+
+        Description of argument(s):
+        method         The HTTP method (e.g. "GET").
+        url            A complete url.
+        kwargs         Passed directly to requests.Session.request (e.g.
+                       headers, data, timeout, verify).
+        """
+
+        session = redfish_request.get_session(url, kwargs.get("verify", False))
+        governor = rgov.get_governor(url)
+        governor.acquire()
+        start_time = time.time()
+        status = None
+        num_bytes = 0
+        try:
+            response = session.request(method, url, **kwargs)
+            status = response.status_code
+            num_bytes = len(response.content or "")
+        finally:
+            seconds = time.time() - start_time
+            governor.release(status, seconds)
+            rstats.record_request(method, url, status, seconds, num_bytes)
+
+        return response
+
     @staticmethod
     def log_console(response):
         r"""
@@ -153,8 +348,12 @@ class redfish_request(object):
         )
         logger.info(msg, also_console=True)
 
-        response = requests.get(
-            url, headers=headers, timeout=timeout, verify=verify
+        response = redfish_request.send_request(
+            "GET",
+            url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
         )
         redfish_request.log_console(response)
 
@@ -202,8 +401,13 @@ class redfish_request(object):
         )
         logger.info(msg, also_console=True)
 
-        response = requests.patch(
-            url, headers=headers, data=data, timeout=timeout, verify=verify
+        response = redfish_request.send_request(
+            "PATCH",
+            url,
+            headers=headers,
+            data=data,
+            timeout=timeout,
+            verify=verify,
         )
         redfish_request.log_console(response)
 
@@ -251,7 +455,8 @@ class redfish_request(object):
         )
         logger.info(msg, also_console=True)
 
-        response = requests.post(
+        response = redfish_request.send_request(
+            "POST",
             url,
             headers=headers,
             data=json.dumps(data),
@@ -309,7 +514,8 @@ class redfish_request(object):
         )
         logger.info(msg, also_console=True)
 
-        response = requests.put(
+        response = redfish_request.send_request(
+            "PUT",
             url,
             headers=headers,
             files=files,
@@ -365,8 +571,13 @@ class redfish_request(object):
         )
         logger.console(msg="", newline=True)
 
-        response = requests.delete(
-            url, headers=headers, data=data, timeout=timeout, verify=verify
+        response = redfish_request.send_request(
+            "DELETE",
+            url,
+            headers=headers,
+            data=data,
+            timeout=timeout,
+            verify=verify,
         )
         redfish_request.log_console(response)
 
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides the timeout and retry policy used by
+redfish_plus.rest_request.
+
+The policy supplies:
+- The timeout for each request, which may depend on the resource path.
+- The number of times a request which fails to connect is retried, with a
+  capped, jittered exponential backoff between attempts.
+- A circuit breaker per BMC host.  After a number of consecutive connection
+  failures the circuit "opens" and requests fail immediately with
+  circuit_open_error rather than each waiting out its own timeouts and
+  retries.  Once the open time has passed, one request is let through to
+  test the BMC, and the circuit closes when a request succeeds.  Callers
+  which know that the BMC is down (e.g. state.wait_for_comm_cycle) may open
+  and close the circuit explicitly.
+- A budget for the total number of retries in each suite.
+
+The policy may be configured from the robot config file:
+
+-v REDFISH_TIMEOUT:30
+-v REDFISH_MAX_RETRY:10
+-v REDFISH_ENDPOINT_TIMEOUTS:{'UpdateService': 300, 'Dump': 120}
+-v REDFISH_BACKOFF_BASE:1
+-v REDFISH_BACKOFF_MAX:8
+-v REDFISH_CIRCUIT_THRESHOLD:5
+-v REDFISH_CIRCUIT_OPEN_TIME:15
+-v REDFISH_RETRY_BUDGET:0
+
+A timeout or max_retry passed to an individual request takes precedence.
+A REDFISH_CIRCUIT_THRESHOLD or REDFISH_RETRY_BUDGET of 0 disables the
+circuit breaker or the budget.
+"""
+
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import func_args as fa
+import gen_print as gp
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+
+class circuit_open_error(ValueError):
+    r"""
+    Raised for a request to a BMC whose circuit is open.
+    """
+
+
+class circuit_breaker_class:
+    r"""
+    A circuit breaker for the requests to one BMC host.
+    """
+
+    def __init__(self, host, threshold=5, open_time=15):
+        r"""
+        Description of argument(s):
+        host                        The BMC host name (used in messages).
+        threshold                   The number of consecutive connection
+                                    failures which open the circuit.  A value
+                                    of 0 disables the circuit breaker (except
+                                    for open()).
+        open_time                   The number of seconds the circuit stays
+                                    open before a request is let through.
+        """
+
+        self.host = host
+        self.threshold = int(threshold)
+        self.open_time = float(open_time)
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.open_until = 0
+        self.forced_open = False
+
+    def check(self):
+        r"""
+        Raise circuit_open_error if the circuit is open.  Once the open time
+        has passed, one caller is let through (and the circuit stays open for
+        the others) until record_success or record_failure is called.
+        """
+
+        with self.lock:
+            if self.forced_open:
+                message = "The BMC is known to be down."
+            elif self.open_until and time.time() < self.open_until:
+                message = (
+                    "The last " + str(self.failures) + " requests to the BMC"
+                    " failed to connect."
+                )
+            else:
+                if self.open_until:
+                    # Let this request test the BMC.
+                    self.open_until = time.time() + self.open_time
+                return
+        raise circuit_open_error(
+            "The redfish circuit for " + str(self.host) + " is open.  "
+            + message
+        )
+
+    def record_success(self):
+        r"""
+        Close the circuit after a successful request.
+        """
+
+        if self.failures or self.open_until:
+            with self.lock:
+                self.failures = 0
+                self.open_until = 0
+
+    def record_failure(self):
+        r"""
+        Count a connection failure and open the circuit if the threshold has
+        been reached.
+        """
+
+        with self.lock:
+            self.failures += 1
+            if self.threshold and self.failures >= self.threshold:
+                self.open_until = time.time() + self.open_time
+
+    def open(self):
+        r"""
+        Open the circuit until close() is called.
+        """
+
+        with self.lock:
+            self.forced_open = True
+
+    def close(self):
+        r"""
+        Close the circuit.
+        """
+
+        with self.lock:
+            self.forced_open = False
+            self.failures = 0
+            self.open_until = 0
+
+    def is_open(self):
+        r"""
+        Return True if requests would currently be refused.
+        """
+
+        return self.forced_open or time.time() < self.open_until
+
+
+class retry_policy_class:
+    r"""
+    The timeout, retry, circuit breaker and retry budget policy.  See the
+    module description for details.
+
+    A suite may replace the policy with a subclass via set_retry_policy.
+    """
+
+    def __init__(
+        self,
+        timeout=30,
+        max_retry=10,
+        endpoint_timeouts=None,
+        backoff_base=1,
+        backoff_max=8,
+        circuit_threshold=5,
+        circuit_open_time=15,
+        retry_budget=0,
+    ):
+        r"""
+        Description of argument(s):
+        timeout                     The default request timeout in seconds.
+        max_retry                   The default number of retries.
+        endpoint_timeouts           A dictionary of resource path regular
+                                    expression: timeout.  The first match
+                                    is used.
+        backoff_base                The delay in seconds before the first
+                                    retry.  The delay doubles for each
+                                    further retry.
+        backoff_max                 The maximum delay in seconds.
+        circuit_threshold           See circuit_breaker_class.
+        circuit_open_time           See circuit_breaker_class.
+        retry_budget                The maximum number of retries in each
+                                    suite (0 for no limit).
+        """
+
+        self.timeout = int(timeout)
+        self.max_retry = int(max_retry)
+        self.endpoint_timeouts = [
+            (re.compile(regex), int(endpoint_timeout))
+            for regex, endpoint_timeout in (endpoint_timeouts or {}).items()
+        ]
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        self.circuit_threshold = int(circuit_threshold)
+        self.circuit_open_time = float(circuit_open_time)
+        self.retry_budget = int(retry_budget)
+        self.lock = threading.Lock()
+        self.circuits = {}
+        self.budget_suite = None
+        self.retries_used = 0
+
+    def get_timeout(self, uri, timeout=None):
+        r"""
+        Return the timeout for a request.
+
+        Description of argument(s):
+        uri                         The resource path.
+        timeout                     The timeout given by the caller or None.
+        """
+
+        if timeout is not None:
+            return int(timeout)
+        for regex, endpoint_timeout in self.endpoint_timeouts:
+            if regex.search(uri):
+                return endpoint_timeout
+        return self.timeout
+
+    def get_max_retry(self, max_retry=None):
+        r"""
+        Return the maximum number of retries for a request.
+
+        Description of argument(s):
+        max_retry                   The value given by the caller or None.
+        """
+
+        if max_retry is not None:
+            return int(max_retry)
+        return self.max_retry
+
+    def get_backoff(self, attempt):
+        r"""
+        Return the number of seconds to wait before the given retry.
+
+        Description of argument(s):
+        attempt                     The retry number (starting at 1).
+        """
+
+        delay = min(
+            self.backoff_max, self.backoff_base * 2 ** (int(attempt) - 1)
+        )
+        return random.uniform(delay / 2, delay)
+
+    def get_circuit(self, base_url):
+        r"""
+        Return the circuit breaker for the host in base_url.
+
+        Description of argument(s):
+        base_url                    A URL (e.g. "https://bmc:443"), a
+                                    host:port or a host name.  See
+                                    get_circuit_key.
+        """
+
+        host = get_circuit_key(base_url)
+        circuit = self.circuits.get(host, None)
+        if circuit is None:
+            with self.lock:
+                circuit = self.circuits.setdefault(
+                    host,
+                    circuit_breaker_class(
+                        host, self.circuit_threshold, self.circuit_open_time
+                    ),
+                )
+        return circuit
+
+    def spend_retry(self):
+        r"""
+        Take one retry from the current suite's budget.  Return False if the
+        budget has been used up.
+        """
+
+        if not self.retry_budget:
+            return True
+        try:
+            suite = BuiltIn().get_variable_value("${SUITE NAME}", None)
+        except RobotNotRunningError:
+            suite = None
+        with self.lock:
+            if suite != self.budget_suite:
+                self.budget_suite = suite
+                self.retries_used = 0
+            if self.retries_used >= self.retry_budget:
+                return False
+            self.retries_used += 1
+            if self.retries_used == self.retry_budget:
+                gp.qprint_timen(
+                    "The redfish retry budget of "
+                    + str(self.retry_budget)
+                    + " retries for this suite has been used up."
+                )
+        return True
+
+
+# The policy shared by all redfish_plus objects.  None until first used.
+policy = None
+
+
+def get_retry_policy():
+    r"""
+    Return the shared retry policy, creating it from the robot config
+    variables (see the module description) on first use.
+    """
+
+    global policy
+
+    if policy is not None:
+        return policy
+
+    config = {
+        "timeout": "${REDFISH_TIMEOUT}",
+        "max_retry": "${REDFISH_MAX_RETRY}",
+        "endpoint_timeouts": "${REDFISH_ENDPOINT_TIMEOUTS}",
+        "backoff_base": "${REDFISH_BACKOFF_BASE}",
+        "backoff_max": "${REDFISH_BACKOFF_MAX}",
+        "circuit_threshold": "${REDFISH_CIRCUIT_THRESHOLD}",
+        "circuit_open_time": "${REDFISH_CIRCUIT_OPEN_TIME}",
+        "retry_budget": "${REDFISH_RETRY_BUDGET}",
+    }
+    kwargs = {}
+    try:
+        for name, var_name in config.items():
+            value = BuiltIn().get_variable_value(var_name, None)
+            if value is not None:
+                kwargs[name] = fa.source_to_object(value)
+    except RobotNotRunningError:
+        pass
+    policy = retry_policy_class(**kwargs)
+
+    return policy
+
+
+def set_retry_policy(new_policy):
+    r"""
+    Replace the shared retry policy.
+
+    Description of argument(s):
+    new_policy                      A retry_policy_class object (or an object
+                                    of a subclass).
+    """
+
+    global policy
+
+    policy = new_policy
+
+
+def get_circuit_key(url):
+    r"""
+    Return the key of the circuit for the host in url: the host name in
+    lower case without the port, as urlparse returns it.  Requests (which
+    give a base URL) and open_redfish_circuit (which is given ${BMC_HOST})
+    thus find the same circuit.
+
+    Description of argument(s):
+    url                             A URL (e.g. "https://BMC:443"), a
+                                    host:port (e.g. "BMC:443") or a host
+                                    name.
+    """
+
+    url = str(url)
+    if "//" not in url:
+        if url.count(":") > 1 and not url.startswith("["):
+            # A bare IPv6 address.
+            return url.lower()
+        url = "//" + url
+    return urlparse(url).hostname or url
+
+
+def open_redfish_circuit(host=None):
+    r"""
+    Make redfish requests to host fail immediately until
+    close_redfish_circuit is called.  This is useful while the BMC is known
+    to be down, e.g. during a reboot.
+
+    Description of argument(s):
+    host                            The BMC host name (or host:port).  The
+                                    default is ${BMC_HOST}.
+    """
+
+    if host is None:
+        host = BuiltIn().get_variable_value("${BMC_HOST}")
+    get_retry_policy().get_circuit(host).open()
+
+
+def close_redfish_circuit(host=None):
+    r"""
+    Allow redfish requests to host again.  See open_redfish_circuit.
+
+    Description of argument(s):
+    host                            The BMC host name (or host:port).  The
+                                    default is ${BMC_HOST}.
+    """
+
+    if host is None:
+        host = BuiltIn().get_variable_value("${BMC_HOST}")
+    get_retry_policy().get_circuit(host).close()
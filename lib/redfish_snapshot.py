@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+Redfish tree snapshot functions used by bmc_redfish_utils.enumerate_request.
+
+A snapshot is a dictionary of resource path: entry where each entry is a
+dictionary such as:
+
+{
+    "etag": 'W/"1e5a4c2f"',
+    "hash": "9f86d081884c7d65...",
+    "body": {"@odata.id": "/redfish/v1/Systems/system", ...},
+}
+
+The ETag (which may be None) allows a later enumeration to revalidate the
+resource with a conditional GET.  The hash allows the bodies of two
+snapshots to be compared quickly.
+
+load_tree reads a resource tree from a snapshot or from any of the other
+files written by enumerate_request (see redfish_mock_server.py and
+redfish_index.py).
+"""
+
+import hashlib
+import json
+import os
+
+import redfish_enumeration as rfe
+
+
+def hash_resource(data):
+    r"""
+    Return a hash string for the resource data which does not depend on the
+    order of its keys.
+
+    Description of argument(s):
+    data                            The resource dictionary.
+    """
+
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def create_entry(data, etag=None):
+    r"""
+    Return a snapshot entry for the resource data.
+
+    Description of argument(s):
+    data                            The resource dictionary.
+    etag                            The ETag of the response or None.
+    """
+
+    return {"etag": etag, "hash": hash_resource(data), "body": data}
+
+
+def load_snapshot(file_path):
+    r"""
+    Return the snapshot saved in file_path or an empty dictionary if the file
+    does not exist.
+
+    Description of argument(s):
+    file_path                       The path of the snapshot file.
+    """
+
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, "r") as file:
+        return json.load(file)
+
+
+def save_snapshot(snapshot, file_path):
+    r"""
+    Save the snapshot to file_path.
+
+    The snapshot is written to a temporary file which then replaces file_path
+    so that an interrupted save does not destroy the previous snapshot.
+
+    Description of argument(s):
+    snapshot                        The snapshot dictionary.
+    file_path                       The path of the snapshot file.
+    """
+
+    temp_file_path = file_path + ".tmp"
+    with open(temp_file_path, "w") as file:
+        json.dump(snapshot, file, sort_keys=True)
+    os.replace(temp_file_path, file_path)
+
+
+def diff_properties(old_data, new_data, prefix=""):
+    r"""
+    Return a dictionary of property path: {"old": old value, "new": new value}
+    for each property which differs between old_data and new_data.
+
+    Nested dictionaries (and lists of equal length) are compared element by
+    element, so that property paths look like "Status/Health" or
+    "Members/3/@odata.id".  A property which is missing on one side has a
+    value of None on that side.
+
+    Description of argument(s):
+    old_data                        The old resource dictionary.
+    new_data                        The new resource dictionary.
+    prefix                          The property path of old_data/new_data
+                                    (used for recursion).
+    """
+
+    changes = {}
+    if isinstance(old_data, dict) and isinstance(new_data, dict):
+        keys = sorted(set(old_data.keys()) | set(new_data.keys()))
+        for key in keys:
+            changes.update(
+                diff_properties(
+                    old_data.get(key, None),
+                    new_data.get(key, None),
+                    prefix + str(key) + "/",
+                )
+            )
+        return changes
+    if (
+        isinstance(old_data, list)
+        and isinstance(new_data, list)
+        and len(old_data) == len(new_data)
+    ):
+        for ix in range(len(old_data)):
+            changes.update(
+                diff_properties(
+                    old_data[ix], new_data[ix], prefix + str(ix) + "/"
+                )
+            )
+        return changes
+    if old_data != new_data:
+        changes[prefix.rstrip("/")] = {"old": old_data, "new": new_data}
+    return changes
+
+
+def diff_snapshots(old_snapshot, new_snapshot):
+    r"""
+    Return a dictionary describing the differences between two snapshots.
+
+    Example result:
+
+    {
+        "added": ["/redfish/v1/Systems/system/LogServices/EventLog/Entries/7"],
+        "removed": [],
+        "modified": {
+            "/redfish/v1/Systems/system": {
+                "PowerState": {"old": "Off", "new": "On"},
+            },
+        },
+    }
+
+    Description of argument(s):
+    old_snapshot                    The earlier snapshot.
+    new_snapshot                    The later snapshot.
+    """
+
+    old_uris = set(old_snapshot.keys())
+    new_uris = set(new_snapshot.keys())
+    modified = {}
+    for uri in sorted(old_uris & new_uris):
+        old_entry = old_snapshot[uri]
+        new_entry = new_snapshot[uri]
+        if old_entry["hash"] == new_entry["hash"]:
+            continue
+        modified[uri] = diff_properties(old_entry["body"], new_entry["body"])
+
+    return {
+        "added": sorted(new_uris - old_uris),
+        "removed": sorted(old_uris - new_uris),
+        "modified": modified,
+    }
+
+
+def load_mockup_dir(dir_path):
+    r"""
+    Return a tree dictionary of resource path: resource loaded from the
+    index.json files of a DMTF mockup directory.
+
+    Description of argument(s):
+    dir_path                        The mockup directory path.  This may be the
+                                    directory containing "redfish" or the one
+                                    holding the service root index.json.
+    """
+
+    if os.path.isdir(os.path.join(dir_path, "redfish")):
+        uri_prefix = ""
+    else:
+        uri_prefix = "/redfish/v1"
+    tree = {}
+    for root, dirs, files in os.walk(dir_path):
+        if "index.json" not in files:
+            continue
+        with open(os.path.join(root, "index.json"), "r") as file:
+            data = json.load(file)
+        rel_path = os.path.relpath(root, dir_path).replace(os.sep, "/")
+        uri = uri_prefix + ("" if rel_path == "." else "/" + rel_path)
+        if isinstance(data, dict):
+            uri = data.get("@odata.id", uri)
+        tree[rfe.normalize_uri(uri)] = data
+
+    return tree
+
+
+def load_tree(tree_path):
+    r"""
+    Return a tree dictionary of resource path: resource loaded from
+    tree_path.
+
+    The tree may be any of:
+    - The JSON output of bmc_redfish_utils.enumerate_request.
+    - The NDJSON output_file of enumerate_request.
+    - A snapshot file (see the module description).
+    - A DMTF mockup directory (e.g. from Redfish-Mockup-Creator) containing
+      index.json files.
+
+    Description of argument(s):
+    tree_path                       The path of the tree file or mockup
+                                    directory.
+    """
+
+    if os.path.isdir(tree_path):
+        return load_mockup_dir(tree_path)
+
+    with open(tree_path, "r") as file:
+        text = file.read()
+    try:
+        tree = json.loads(text)
+    except ValueError:
+        # NDJSON: one {resource path: resource} object per line.
+        tree = {}
+        for line in text.splitlines():
+            if line.strip():
+                tree.update(json.loads(line))
+    if tree and all(
+        isinstance(entry, dict) and "body" in entry and "hash" in entry
+        for entry in tree.values()
+    ):
+        tree = {uri: entry["body"] for uri, entry in tree.items()}
+
+    return {rfe.normalize_uri(uri): data for uri, data in tree.items()}
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides a listener for the Redfish EventService Server-Sent
+Events (SSE) stream.
+
+The listener runs in a background thread and keeps a snapshot of the most
+recent resource change and power related event for each resource.
+state.wait_state uses it to re-check the machine state as soon as such an
+event arrives for the system, chassis or manager (rather than, e.g., for a
+sensor) instead of waiting for the next polling interval.  When the
+BMC does not offer an SSE stream, the listener is not started and
+wait_state simply polls.
+
+Example robot code:
+
+Suite Setup  Start Redfish SSE Listener
+Suite Teardown  Stop Redfish SSE Listener
+"""
+
+import json
+import threading
+import time
+
+import gen_print as gp
+import redfish_governor as rgov
+import requests
+from robot.libraries.BuiltIn import BuiltIn
+
+# Events whose MessageId contains any of these strings are of interest.
+state_event_message_ids = [
+    "ResourceChanged",
+    "ResourceUpdated",
+    "StatusChange",
+    "Power",
+    "Reset",
+    "BootProgress",
+]
+
+
+class redfish_sse_listener_class:
+    r"""
+    Listen to a Redfish SSE stream and keep a snapshot of the state related
+    events received.
+
+    Example code:
+
+    listener = redfish_sse_listener_class(base_url, username, password)
+    if listener.start():
+        listener.wait_for_event(10)
+        ...
+        listener.stop()
+    """
+
+    def __init__(
+        self, base_url, username, password, timeout=10, origins=None
+    ):
+        r"""
+        Create a listener object.  No connection is made until start() is
+        called.
+
+        Description of argument(s):
+        base_url                    The BMC URL (e.g. "https://bmc:443").
+        username                    The redfish user name.
+        password                    The redfish password.
+        timeout                     The timeout in seconds used to connect to
+                                    the BMC.
+        origins                     A list of the resource paths (e.g.
+                                    "/redfish/v1/Systems/system") whose events
+                                    are of interest, or None for all.  Events
+                                    from any other OriginOfCondition (e.g. a
+                                    sensor or a log service) are ignored.
+        """
+
+        self.__base_url = base_url.rstrip("/")
+        self.__auth = (username, password)
+        self.__timeout = int(timeout)
+        self.__sse_uri = None
+        self.__thread = None
+        self.__last_event_id = None
+        self.__stop = threading.Event()
+        self.__condition = threading.Condition()
+        self.__event_count = 0
+        self.__snapshot = {}
+        self.__origins = None
+        if origins is not None:
+            self.__origins = [origin.rstrip("/") for origin in origins]
+        gp.register_passwords(password)
+
+    def governed_get(self, path, **kwargs):
+        r"""
+        Send a GET request, subject to the BMC's concurrency governor (see
+        redfish_governor.py), and return the response.  For a stream, the
+        governor slot is held only until the response headers arrive.
+
+        Description of argument(s):
+        path                        The resource path.
+        kwargs                      Passed directly to requests.get.
+        """
+
+        governor = rgov.get_governor(self.__base_url)
+        governor.acquire()
+        status = None
+        start_time = time.time()
+        try:
+            response = requests.get(
+                self.__base_url + path,
+                auth=self.__auth,
+                verify=False,
+                **kwargs
+            )
+            status = response.status_code
+        finally:
+            governor.release(status, time.time() - start_time)
+
+        return response
+
+    def get_sse_uri(self):
+        r"""
+        Return the EventService ServerSentEventUri or None if the BMC does not
+        support SSE.
+        """
+
+        try:
+            response = self.governed_get(
+                "/redfish/v1/EventService", timeout=self.__timeout
+            )
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            event_service = response.json()
+        except ValueError:
+            return None
+        if not event_service.get("ServiceEnabled", True):
+            return None
+        return event_service.get("ServerSentEventUri", None)
+
+    def start(self):
+        r"""
+        Start listening in a background thread.  Return True if the listener
+        was started or False if the BMC does not support SSE.
+        """
+
+        if self.is_running():
+            return True
+        self.__sse_uri = self.get_sse_uri()
+        if self.__sse_uri is None:
+            return False
+        # Each listening thread has its own stop event so that a thread left
+        # over from an earlier stop() cannot be revived by this start().
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(
+            target=self.listen, args=(self.__stop,), daemon=True
+        )
+        self.__thread.start()
+        return True
+
+    def stop(self):
+        r"""
+        Stop listening.
+
+        The background thread ends when it next receives data or when its read
+        times out (see listen).  It is not waited for because closing a stream
+        which another thread is reading blocks until that read completes.
+        """
+
+        self.__stop.set()
+        self.__thread = None
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def is_running(self):
+        r"""
+        Return True if the background thread is running.
+        """
+
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def listen(self, stop_event, read_timeout=60):
+        r"""
+        Read the SSE stream until stop_event is set.  The stream is re-opened
+        (after a short pause) whenever it ends, e.g. when the BMC reboots, or
+        when no data has arrived for read_timeout seconds.  The ID of the last
+        event received is sent with the new request so that the BMC may
+        replay any events which were missed.
+
+        Description of argument(s):
+        stop_event                  A threading.Event which is set when the
+                                    listener is to stop.
+        read_timeout                The number of seconds without data after
+                                    which the stream is re-opened.
+        """
+
+        while not stop_event.is_set():
+            headers = {"Accept": "text/event-stream"}
+            if self.__last_event_id is not None:
+                headers["Last-Event-ID"] = self.__last_event_id
+            try:
+                with self.governed_get(
+                    self.__sse_uri,
+                    stream=True,
+                    headers=headers,
+                    timeout=(self.__timeout, read_timeout),
+                ) as response:
+                    if response.status_code == 200:
+                        self.read_stream(response, stop_event)
+            except requests.exceptions.RequestException:
+                pass
+            stop_event.wait(2)
+
+    def read_stream(self, response, stop_event):
+        r"""
+        Parse the event stream and process each event's data.
+
+        Description of argument(s):
+        response                    A streaming requests response.
+        stop_event                  See listen for details.
+        """
+
+        data_lines = []
+        # Read a byte at a time so that each event is processed as soon as it
+        # arrives rather than when a larger buffer fills.
+        for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+            if stop_event.is_set():
+                return
+            if line is None:
+                continue
+            if line == "":
+                # A blank line ends an event.
+                if data_lines:
+                    self.process_event_data("\n".join(data_lines))
+                data_lines = []
+            elif line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            elif line.startswith("id:"):
+                self.__last_event_id = line[3:].strip()
+
+    def process_event_data(self, data):
+        r"""
+        Update the snapshot with the state related events in data and wake up
+        any waiters.
+
+        Description of argument(s):
+        data                        The data of one SSE event (a JSON Event
+                                    resource).
+        """
+
+        try:
+            events = json.loads(data).get("Events", [])
+        except (ValueError, AttributeError):
+            return
+
+        matched = False
+        for event in events:
+            message_id = event.get("MessageId", "")
+            if not any(x in message_id for x in state_event_message_ids):
+                continue
+            origin = event.get("OriginOfCondition", {})
+            if isinstance(origin, dict):
+                origin = origin.get("@odata.id", "")
+            if self.__origins is not None and (
+                str(origin).rstrip("/") not in self.__origins
+            ):
+                continue
+            self.__snapshot[origin] = {
+                "message_id": message_id,
+                "message_args": event.get("MessageArgs", []),
+                "time": time.time(),
+            }
+            matched = True
+
+        if matched:
+            with self.__condition:
+                self.__event_count += 1
+                self.__condition.notify_all()
+
+    def get_event_count(self):
+        r"""
+        Return the number of state related events received so far.
+        """
+
+        return self.__event_count
+
+    def get_snapshot(self):
+        r"""
+        Return a copy of the snapshot, a dictionary of resource path: most
+        recent state related event for that resource.
+
+        Example result:
+
+        {
+            '/redfish/v1/Systems/system': {
+                'message_id': 'ResourceEvent.1.0.ResourceChanged',
+                'message_args': [],
+                'time': 1760770000.5,
+            },
+        }
+        """
+
+        return dict(self.__snapshot)
+
+    def wait_for_event(self, timeout, event_count=None):
+        r"""
+        Wait until a state related event newer than event_count arrives or
+        until timeout seconds have passed.  Return True if an event arrived.
+
+        Description of argument(s):
+        timeout                     The maximum number of seconds to wait.
+        event_count                 The event count (see get_event_count)
+                                    already seen by the caller.  Defaults to
+                                    the current event count.
+        """
+
+        with self.__condition:
+            if event_count is None:
+                event_count = self.__event_count
+            return self.__condition.wait_for(
+                lambda: self.__event_count > event_count
+                or self.__stop.is_set(),
+                timeout,
+            ) and not self.__stop.is_set()
+
+
+# The listener shared by state.py and robot callers of this module.
+listener = None
+
+
+def start_redfish_sse_listener():
+    r"""
+    Start the shared SSE listener for ${BMC_HOST}.  Return True if the BMC
+    supports SSE (and the listener is running) or False otherwise.
+    """
+
+    global listener
+
+    if listener is None:
+        base_url = (
+            "https://"
+            + str(BuiltIn().get_variable_value("${BMC_HOST}"))
+            + ":"
+            + str(BuiltIn().get_variable_value("${HTTPS_PORT}", "443"))
+        )
+        # Only the resources read by the redfish state probe are of interest.
+        origins = [
+            "/redfish/v1/Managers/"
+            + BuiltIn().get_variable_value("${BMC_ID}", "bmc"),
+            "/redfish/v1/Chassis/"
+            + BuiltIn().get_variable_value("${CHASSIS_ID}", "chassis"),
+            "/redfish/v1/Systems/"
+            + BuiltIn().get_variable_value("${SYSTEM_ID}", "system"),
+        ]
+        listener = redfish_sse_listener_class(
+            base_url,
+            BuiltIn().get_variable_value("${BMC_USERNAME}"),
+            BuiltIn().get_variable_value("${BMC_PASSWORD}"),
+            origins=origins,
+        )
+    started = listener.start()
+    if not started:
+        gp.qprint_timen(
+            "The BMC does not support Redfish SSE, state waits will poll."
+        )
+    return started
+
+
+def stop_redfish_sse_listener():
+    r"""
+    Stop the shared SSE listener, if running.
+    """
+
+    if listener is not None:
+        listener.stop()
+
+
+def get_redfish_sse_listener():
+    r"""
+    Return the shared SSE listener if it is running or None.
+    """
+
+    if listener is not None and listener.is_running():
+        return listener
+    return None
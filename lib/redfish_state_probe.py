@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module provides a redfish state probe which is used by state.get_state
+and the "Redfish Get States" keyword in utils.robot.
+
+The probe keeps one long-lived redfish session for all of its state reads
+rather than creating and deleting a session for each read.  It logs in again
+only when the BMC rejects the session (HTTP 401), e.g. after a BMC reboot or
+after "Redfish Delete All Sessions".
+"""
+
+import gen_print as gp
+from bmc_redfish import bmc_redfish
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import DotDict
+
+
+class redfish_state_probe_class:
+    r"""
+    Read the BMC, chassis, host and boot progress states over one redfish
+    session.
+
+    Example code:
+
+    probe = redfish_state_probe_class()
+    states = probe.get_states()
+    ...
+    probe.logout()
+    """
+
+    def __init__(self, timeout=10, max_retry=2):
+        r"""
+        Create a redfish state probe object.  No connection is made until
+        get_states() is called.
+
+        Description of argument(s):
+        timeout                     The timeout in seconds for each redfish
+                                    request.
+        max_retry                   The number of times a request is retried
+                                    on connection failure.
+        """
+
+        self.__timeout = int(timeout)
+        self.__max_retry = int(max_retry)
+        self.__redfish = None
+
+    def login(self):
+        r"""
+        Create the redfish client (if necessary) and log in.
+        """
+
+        if self.__redfish is None:
+            base_url = (
+                "https://"
+                + str(BuiltIn().get_variable_value("${BMC_HOST}"))
+                + ":"
+                + str(BuiltIn().get_variable_value("${HTTPS_PORT}", "443"))
+            )
+            self.__redfish = bmc_redfish(
+                base_url,
+                BuiltIn().get_variable_value("${BMC_USERNAME}"),
+                BuiltIn().get_variable_value("${BMC_PASSWORD}"),
+            )
+        self.__redfish.login()
+
+    def logout(self):
+        r"""
+        Delete the probe's redfish session, if any.
+        """
+
+        if self.__redfish is None:
+            return
+        try:
+            self.__redfish.logout()
+        finally:
+            self.__redfish = None
+
+    def read_properties(self, uris):
+        r"""
+        GET each uri and return a list of the resulting dictionaries.  If the
+        BMC rejects the session, return None.
+
+        Description of argument(s):
+        uris                        A list of resource paths.
+        """
+
+        # Set quiet variable to keep subordinate get() calls quiet.
+        quiet = 1
+        properties = []
+        for uri in uris:
+            resp = self.__redfish.get(
+                uri,
+                valid_status_codes=[200, 401],
+                timeout=self.__timeout,
+                max_retry=self.__max_retry,
+            )
+            if resp.status == 401:
+                return None
+            properties.append(resp.dict)
+
+        return properties
+
+    def get_states(self):
+        r"""
+        Return a dictionary containing the bmc, chassis, host and
+        boot_progress states.
+
+        The values are the same as those returned by the "Redfish Get States"
+        keyword:
+        bmc                         Managers/${BMC_ID} Status.State.
+        chassis                     Chassis/${CHASSIS_ID} PowerState.
+        host                        Systems/${SYSTEM_ID} Status.State.
+        boot_progress               Systems/${SYSTEM_ID} BootProgress.LastState
+                                    or, if BootProgress is not supported, its
+                                    PowerState.
+        """
+
+        uris = [
+            "/redfish/v1/Managers/"
+            + BuiltIn().get_variable_value("${BMC_ID}", "bmc"),
+            "/redfish/v1/Chassis/"
+            + BuiltIn().get_variable_value("${CHASSIS_ID}", "chassis"),
+            "/redfish/v1/Systems/"
+            + BuiltIn().get_variable_value("${SYSTEM_ID}", "system"),
+        ]
+
+        if self.__redfish is None:
+            self.login()
+        properties = self.read_properties(uris)
+        if properties is None:
+            gp.dprint_timen("The redfish session was rejected, logging in.")
+            self.login()
+            properties = self.read_properties(uris)
+            if properties is None:
+                raise ValueError(
+                    "The BMC rejected a new redfish session with status 401."
+                )
+
+        manager, chassis, system = properties
+        if "BootProgress" in system:
+            boot_progress = system["BootProgress"]["LastState"]
+        else:
+            boot_progress = system["PowerState"]
+
+        return DotDict(
+            [
+                ("bmc", manager["Status"]["State"]),
+                ("chassis", chassis["PowerState"]),
+                ("host", system["Status"]["State"]),
+                ("boot_progress", boot_progress),
+            ]
+        )
+
+
+# The probe shared by state.py and robot callers of this module.
+probe = redfish_state_probe_class()
+
+
+def get_redfish_states():
+    r"""
+    Return the bmc, chassis, host and boot_progress states using the shared
+    state probe.  See redfish_state_probe_class.get_states for details.
+
+    As with the "Redfish Get States" keyword formerly run by state.py, a
+    failed read is retried once.
+    """
+
+    try:
+        return probe.get_states()
+    except Exception as ex:
+        gp.dprint_timen("Retrying the redfish state read after: " + str(ex))
+        return probe.get_states()
+
+
+def close_redfish_state_probe():
+    r"""
+    Delete the shared state probe's redfish session.  A later call to
+    get_redfish_states will log in again.
+    """
+
+    probe.logout()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module keeps per-endpoint accounting of the redfish requests made by
+redfish_plus.py and redfish_request.py.
+
+Each request is recorded against its method and URI template (the resource
+path with IDs collapsed, e.g. "/redfish/v1/Systems/system/Processors/{id}")
+in a log-linear latency histogram, along with its status, response size and
+retry count.  A request counts as a retry when the previous request for the
+same method and URI failed (i.e. raised an exception or returned 429 or a
+5xx status), since that is how callers such as Wait Until Keyword Succeeds
+retry.  Recording a request costs a few microseconds, so accounting
+is on by default.  It may be turned off in the robot config file:
+
+-v REDFISH_REQUEST_STATS:0
+
+At the end of each suite the report (see get_request_stats_report) is
+written to redfish_request_stats.json in the robot output directory.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+# The histogram has this many buckets per doubling of latency, i.e. each
+# bucket spans about 9% of its value.
+sub_buckets = 8
+
+# The number of slowest requests kept for the report.
+num_slowest = 20
+
+report_file_name = "redfish_request_stats.json"
+
+# Path segments which contain a digit are IDs, except for these.
+id_exceptions = ["v1"]
+
+# Long alphanumeric segments (e.g. session IDs) are IDs too.
+id_regex = re.compile(r"[0-9]|^[0-9A-Za-z_-]{24,}$")
+
+
+@lru_cache(maxsize=4096)
+def uri_template(uri):
+    r"""
+    Return the URI template for uri, i.e. its path with the query removed and
+    each segment which looks like an ID replaced by "{id}".
+
+    Example:
+
+    uri_template("/redfish/v1/Systems/system/LogServices/EventLog/Entries/17?$top=5")
+
+    Returns:
+
+    "/redfish/v1/Systems/system/LogServices/EventLog/Entries/{id}"
+
+    Description of argument(s):
+    uri                             A resource path or complete URL.
+    """
+
+    path = urlsplit(uri).path.rstrip("/") or "/"
+    return "/".join(
+        "{id}"
+        if segment not in id_exceptions and id_regex.search(segment)
+        else segment
+        for segment in path.split("/")
+    )
+
+
+class latency_histogram:
+    r"""
+    A log-linear (HDR style) histogram of latencies.  Memory use is bounded
+    by the range of latencies seen rather than the number of samples.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        r"""
+        Add one latency to the histogram.
+
+        Description of argument(s):
+        seconds                     The latency in seconds.
+        """
+
+        microseconds = max(seconds * 1000000, 1)
+        ix = int(math.log2(microseconds) * sub_buckets)
+        self.buckets[ix] = self.buckets.get(ix, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def get_percentile(self, percentile):
+        r"""
+        Return the latency in seconds at the given percentile.
+
+        Description of argument(s):
+        percentile                  The percentile (e.g. 95).
+        """
+
+        if not self.count:
+            return 0.0
+        target = math.ceil(self.count * float(percentile) / 100)
+        seen = 0
+        for ix in sorted(self.buckets):
+            seen += self.buckets[ix]
+            if seen >= target:
+                break
+        # Use the middle of the bucket, limited to the values actually seen.
+        seconds = 2 ** ((ix + 0.5) / sub_buckets) / 1000000
+        return min(max(seconds, self.min), self.max)
+
+
+class request_stats_class:
+    r"""
+    Accounting for the requests made to each endpoint.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        r"""
+        Discard all accounting.
+        """
+
+        with self.lock:
+            self.endpoints = {}
+            self.slowest = []
+            # The (method, uri) of each request whose last attempt failed.
+            self.failed = set()
+            self.start_time = time.time()
+
+    def record(self, method, uri, status, seconds, num_bytes=0, retries=0):
+        r"""
+        Account for one request.
+
+        Description of argument(s):
+        method                      The HTTP method (e.g. "GET").
+        uri                         The resource path or URL.
+        status                      The HTTP status code or None if the
+                                    request raised an exception.
+        seconds                     The time taken by the request.
+        num_bytes                   The size of the response body.
+        retries                     The number of times the request was
+                                    retried by the caller before this attempt
+                                    (in addition to those detected as
+                                    described in the module description).
+        """
+
+        template = uri_template(uri)
+        key = (method, template)
+        failed = status is None or status == 429 or status >= 500
+        with self.lock:
+            if failed:
+                if (method, uri) in self.failed:
+                    retries += 1
+                else:
+                    self.failed.add((method, uri))
+            elif self.failed and (method, uri) in self.failed:
+                self.failed.discard((method, uri))
+                retries += 1
+            endpoint = self.endpoints.get(key, None)
+            if endpoint is None:
+                endpoint = self.endpoints[key] = {
+                    "histogram": latency_histogram(),
+                    "statuses": {},
+                    "bytes": 0,
+                    "retries": 0,
+                }
+            endpoint["histogram"].record(seconds)
+            endpoint["statuses"][status] = (
+                endpoint["statuses"].get(status, 0) + 1
+            )
+            endpoint["bytes"] += num_bytes
+            endpoint["retries"] += retries
+            entry = (seconds, time.time(), method, uri, status)
+            if len(self.slowest) < num_slowest:
+                heapq.heappush(self.slowest, entry)
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def get_report(self):
+        r"""
+        Return the report dictionary.  See get_request_stats_report for
+        details.
+        """
+
+        with self.lock:
+            endpoints = []
+            for (method, template), endpoint in self.endpoints.items():
+                histogram = endpoint["histogram"]
+                errors = sum(
+                    count
+                    for status, count in endpoint["statuses"].items()
+                    if status is None or status >= 400
+                )
+                endpoints.append(
+                    {
+                        "method": method,
+                        "uri": template,
+                        "count": histogram.count,
+                        "errors": errors,
+                        "retries": endpoint["retries"],
+                        "bytes": endpoint["bytes"],
+                        "total_seconds": round(histogram.total, 6),
+                        "min": round(histogram.min, 6),
+                        "p50": round(histogram.get_percentile(50), 6),
+                        "p95": round(histogram.get_percentile(95), 6),
+                        "p99": round(histogram.get_percentile(99), 6),
+                        "max": round(histogram.max, 6),
+                        "statuses": {
+                            str(status): count
+                            for status, count in endpoint["statuses"].items()
+                        },
+                    }
+                )
+            slowest = [
+                {
+                    "method": method,
+                    "uri": uri,
+                    "status": status,
+                    "seconds": round(seconds, 6),
+                    "time": round(end_time, 3),
+                }
+                for seconds, end_time, method, uri, status in sorted(
+                    self.slowest, reverse=True
+                )
+            ]
+            start_time = self.start_time
+
+        endpoints.sort(key=lambda x: x["total_seconds"], reverse=True)
+        return {
+            "start_time": round(start_time, 3),
+            "end_time": round(time.time(), 3),
+            "requests": sum(x["count"] for x in endpoints),
+            "seconds": round(sum(x["total_seconds"] for x in endpoints), 6),
+            "retries": sum(x["retries"] for x in endpoints),
+            "endpoints": endpoints,
+            "slowest": slowest,
+        }
+
+
+# The accounting shared by all redfish libraries in this process.
+stats = request_stats_class()
+
+# Whether accounting is enabled.  None until first checked.
+enabled = None
+
+
+def is_enabled():
+    r"""
+    Return True if request accounting is enabled (see the module description).
+    """
+
+    global enabled
+
+    if enabled is None:
+        try:
+            enabled = bool(
+                int(BuiltIn().get_variable_value("${REDFISH_REQUEST_STATS}", 1))
+            )
+        except RobotNotRunningError:
+            enabled = True
+    return enabled
+
+
+def record_request(method, uri, status, seconds, num_bytes=0, retries=0):
+    r"""
+    Account for one request if accounting is enabled.  See
+    request_stats_class.record for details.
+    """
+
+    if is_enabled():
+        stats.record(method, uri, status, seconds, num_bytes, retries)
+
+
+def reset_request_stats():
+    r"""
+    Discard all request accounting.
+    """
+
+    stats.reset()
+
+
+def get_request_stats_report():
+    r"""
+    Return a dictionary describing the requests made so far.
+
+    Endpoints are sorted by the total time spent on them, largest first.
+
+    Example result:
+
+    {
+        'start_time': 1760770000.123,
+        'end_time': 1760770360.456,
+        'requests': 1204,
+        'seconds': 97.5,
+        'retries': 3,
+        'endpoints': [
+            {
+                'method': 'GET',
+                'uri': '/redfish/v1/Systems/system/Processors/{id}',
+                'count': 96,
+                'errors': 0,
+                'retries': 0,
+                'bytes': 301056,
+                'total_seconds': 12.3,
+                'min': 0.08,
+                'p50': 0.121,
+                'p95': 0.203,
+                'p99': 0.35,
+                'max': 0.41,
+                'statuses': {'200': 96},
+            },
+            ...
+        ],
+        'slowest': [
+            {'method': 'POST', 'uri': '/redfish/v1/UpdateService/...',
+             'status': 202, 'seconds': 8.2, 'time': 1760770100.5},
+            ...
+        ],
+    }
+    """
+
+    return stats.get_report()
+
+
+def write_request_stats_report(file_path=None):
+    r"""
+    Write the report (see get_request_stats_report) as JSON and return the
+    file path.
+
+    Description of argument(s):
+    file_path                       The path of the file to be written.  The
+                                    default is redfish_request_stats.json in
+                                    ${OUTPUT DIR}.
+    """
+
+    if file_path is None:
+        output_dir = BuiltIn().get_variable_value("${OUTPUT DIR}", ".")
+        file_path = os.path.join(output_dir, report_file_name)
+    with open(file_path, "w") as file:
+        json.dump(get_request_stats_report(), file, indent=4)
+
+    return file_path
+
+
+class report_listener_class:
+    r"""
+    A robot library listener which writes the request report at the end of
+    each suite.  Since the accounting is shared, the file written last
+    covers the whole run.
+
+    Robot calls a library listener once for each library instance, so the
+    one listener shared by redfish_plus, redfish_request and their children
+    sees each end_suite several times.  The report is written only for the
+    first of these.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        self.last_suite_id = None
+
+    def end_suite(self, name, attributes):
+        suite_id = attributes.get("id", name)
+        if suite_id == self.last_suite_id:
+            return
+        self.last_suite_id = suite_id
+        if is_enabled() and stats.endpoints:
+            write_request_stats_report()
+
+
+report_listener = report_listener_class()
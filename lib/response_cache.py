@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+Define the response_cache class.
+"""
+
+import collections
+import threading
+import time
+
+
+class response_cache:
+    r"""
+    An LRU cache of redfish GET responses keyed by URI.
+
+    Responses which carry an ETag are always revalidated by the caller with an
+    If-None-Match request.  Responses without an ETag are considered fresh for
+    ttl seconds.  Write requests must call invalidate() with the URI being
+    written so that the affected cached responses are discarded.
+
+    Example code:
+
+    cache = response_cache(max_entries=256, ttl=5)
+    entry = cache.lookup("/redfish/v1/Managers/bmc")
+    if entry is not None and cache.is_fresh(entry):
+        response = entry["response"]
+    ...
+    cache.store("/redfish/v1/Managers/bmc", response)
+    cache.invalidate("/redfish/v1/Managers/bmc/Actions/Manager.Reset")
+    """
+
+    def __init__(self, max_entries=256, ttl=5):
+        r"""
+        Create a response cache object.
+
+        Description of argument(s):
+        max_entries                 The maximum number of responses to keep.  The least recently used
+                                    response is discarded when the cache is full.
+        ttl                         The number of seconds for which a response without an ETag may be
+                                    served without asking the BMC again.
+        """
+
+        self.__max_entries = int(max_entries)
+        self.__ttl = float(ttl)
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    @staticmethod
+    def cache_key(uri):
+        r"""
+        Return the cache key for the given URI.
+
+        Description of argument(s):
+        uri                         A resource path which may include a query string (e.g.
+                                    "/redfish/v1/Systems/?$expand=.").
+        """
+
+        path, sep, query = uri.partition("?")
+        return (path.rstrip("/") or path) + sep + query
+
+    def lookup(self, uri):
+        r"""
+        Return the cache entry for uri or None.
+
+        A cache entry is a dictionary with "response", "etag" and "time" keys.
+
+        Description of argument(s):
+        uri                         The resource path.
+        """
+
+        key = self.cache_key(uri)
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            if entry is None:
+                self.__stats["misses"] += 1
+                return None
+            self.__entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry):
+        r"""
+        Return True if the entry may be served without contacting the BMC.
+
+        Description of argument(s):
+        entry                       A cache entry returned by lookup().
+        """
+
+        if entry["etag"] is not None:
+            return False
+        if time.time() - entry["time"] >= self.__ttl:
+            return False
+        with self.__lock:
+            self.__stats["hits"] += 1
+        return True
+
+    def revalidated(self, entry):
+        r"""
+        Note that the BMC confirmed the entry is current (HTTP 304) and return
+        its response.
+
+        Description of argument(s):
+        entry                       A cache entry returned by lookup().
+        """
+
+        entry["time"] = time.time()
+        with self.__lock:
+            self.__stats["revalidated"] += 1
+        return entry["response"]
+
+    def store(self, uri, response):
+        r"""
+        Save a response in the cache.  Only responses with a status of 200 are
+        kept.
+
+        Description of argument(s):
+        uri                         The resource path.
+        response                    The redfish response object.
+        """
+
+        if response.status != 200:
+            return
+        key = self.cache_key(uri)
+        entry = {
+            "response": response,
+            "etag": response.getheader("ETag"),
+            "time": time.time(),
+        }
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, uri):
+        r"""
+        Discard every cached response which may be affected by a write to uri.
+
+        This is the URI itself, everything below it and its parent collection.
+        For an action URI (e.g.
+        "/redfish/v1/Systems/system/Actions/ComputerSystem.Reset") the resource
+        owning the action and everything below it is discarded.
+
+        Description of argument(s):
+        uri                         The resource path being written.
+        """
+
+        path = self.cache_key(uri.partition("?")[0])
+        if "/Actions/" in path:
+            prefix = path.split("/Actions/")[0]
+            parent = None
+        else:
+            prefix = path
+            parent = path.rsplit("/", 1)[0]
+
+        with self.__lock:
+            for key in list(self.__entries.keys()):
+                key_path = key.partition("?")[0]
+                if (
+                    key_path == prefix
+                    or key_path.startswith(prefix + "/")
+                    or key_path == parent
+                ):
+                    del self.__entries[key]
+
+    def clear(self):
+        r"""
+        Discard all cached responses.
+        """
+
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self):
+        r"""
+        Return a dictionary of cache statistics (hits, revalidated, misses and
+        entries).
+        """
+
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["entries"] = len(self.__entries)
+        return stats
@@ -46,14 +46,23 @@ import importlib.util
 import os
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import bmc_ssh_utils as bsu
 import gen_cmd as gc
 import gen_print as gp
 import gen_robot_utils as gru
 import gen_valid as gv
+import poll_scheduler as ps
+import reachability_probe as rp
+import redfish_retry_policy as rrp
+import redfish_sse as rsse
+import redfish_state_probe as rsp
+import state_timeline as stl
 from robot.libraries.BuiltIn import BuiltIn
-from robot.utils import DotDict
+from robot.utils import DotDict, timestr_to_secs
 
 base_path = (
     os.path.dirname(os.path.dirname(importlib.util.find_spec("gen_robot_print").origin))
@@ -83,6 +92,24 @@ default_os_req_states = ["os_ping", "os_login", "os_run_cmd"]
 # or the local epoch time.
 USE_BMC_EPOCH_TIME = int(os.environ.get("USE_BMC_EPOCH_TIME", 0))
 
+# get_state runs the following sub-state probes concurrently.  Each entry is
+# the number of seconds get_state waits for the probe.  A probe which has
+# not finished by then leaves its sub-states at their initial values and
+# is left to finish in the background.
+probe_deadlines = {
+    "ping": 5,
+    "packet_loss": 10,
+    "redfish": 45,
+    "os_ping": 5,
+}
+
+# The thread pool for the sub-state probes.  It is created on first use.
+probe_executor = None
+
+# The future of each probe which is still running, so that a probe which
+# outlives its deadline is not started again while it runs.
+running_probes = {}
+
 # Useful state constant definition(s).
 # When a user calls get_state w/o specifying req_states, default_req_states
 # is used as its value.
@@ -192,9 +219,17 @@ invalid_state_match = DotDict(
 def return_state_constant(state_name="default_state"):
     r"""
     Return the named state dictionary constant.
+
+    Description of argument(s):
+    state_name                      The name of a state constant defined in
+                                    this module (e.g. "standby_match_state").
+                                    TypeError is raised if this is not a
+                                    string.
     """
 
-    return eval(state_name)
+    if not isinstance(state_name, str):
+        raise TypeError("state_name must be a string.")
+    return globals()[state_name]
 
 
 def anchor_state(state):
@@ -240,6 +275,126 @@ def expressions_key():
     return "<expressions>"
 
 
+class state_matcher_class:
+    r"""
+    A match state (see compare_states) prepared for repeated use: its regular
+    expressions are compiled and its expressions are compiled to code
+    objects once, when the object is created.
+
+    Example code:
+
+    matcher = get_state_matcher(standby_match_state)
+    while not matcher.match(get_state(req_states=matcher.req_states)):
+        time.sleep(1)
+    """
+
+    def __init__(self, match_state, match_type="and"):
+        r"""
+        Description of argument(s):
+        match_state                 See compare_states.
+        match_type                  See compare_states.
+        """
+
+        self.match_state = match_state
+        self.match_type = match_type
+        self.default_match = match_type == "and"
+        # The sub-states the match state refers to (i.e. the req_states
+        # argument for get_state).
+        self.req_states = [
+            key for key in match_state.keys() if key != expressions_key()
+        ]
+        # A list of (key, compiled regex) and (None, code object) tuples, in
+        # the order of the match state's entries.
+        self.tests = []
+        for key, match_state_value in match_state.items():
+            # Blank match_state_value means "don't care".
+            if match_state_value == "":
+                continue
+            if key == expressions_key():
+                for expr in match_state_value:
+                    self.tests.append(
+                        (None, compile(expr, expressions_key(), "eval"))
+                    )
+            else:
+                self.tests.append((key, re.compile(match_state_value)))
+
+    def match(self, state):
+        r"""
+        Return True if the state matches and False if it does not.  See
+        compare_states for details.
+
+        Description of argument(s):
+        state                       A state dictionary such as the one
+                                    returned by the get_state function.
+        """
+
+        default_match = self.default_match
+        for key, test in self.tests:
+            if key is None:
+                # Expressions may refer to the state and to this module's
+                # globals (e.g. re).
+                match = eval(test, globals(), {"state": state})
+            else:
+                try:
+                    match = test.match(str(state[key])) is not None
+                except KeyError:
+                    match = False
+            if match != default_match:
+                return match
+
+        return default_match
+
+    def __repr__(self):
+        return repr(self.match_state)
+
+
+# The state matchers created by get_state_matcher, keyed by match type and
+# match state items.
+state_matchers = {}
+max_state_matchers = 256
+
+
+def get_state_matcher(match_state, match_type="and"):
+    r"""
+    Return a state_matcher_class object for match_state.  Matchers are cached
+    so that callers which check the same match state repeatedly (e.g.
+    wait_state) compile it only once.
+
+    Description of argument(s):
+    match_state                     A match state dictionary (see
+                                    compare_states), a string accepted by
+                                    return_state_constant or a
+                                    state_matcher_class object, which is
+                                    returned as is.
+    match_type                      See compare_states.
+    """
+
+    if isinstance(match_state, state_matcher_class):
+        return match_state
+    try:
+        match_state = return_state_constant(match_state)
+    except TypeError:
+        pass
+
+    try:
+        key = (match_type,) + tuple(
+            (item_key, tuple(value) if isinstance(value, list) else value)
+            for item_key, value in match_state.items()
+        )
+        matcher = state_matchers.get(key, None)
+    except TypeError:
+        # The match state has unhashable values, so it can not be cached.
+        return state_matcher_class(match_state, match_type)
+    if matcher is None:
+        if len(state_matchers) >= max_state_matchers:
+            state_matchers.clear()
+        matcher = state_matchers[key] = state_matcher_class(
+            match_state, match_type
+        )
+
+    return matcher
+
+
 def compare_states(state, match_state, match_type="and"):
     r"""
     Compare 2 state dictionaries.  Return True if they match and False if they
@@ -264,6 +419,8 @@ def compare_states(state, match_state, match_type="and"):
                     return_state_constant (e.g. "standby_match_state").  In
                     such a case this function will call return_state_constant
                     to convert it to a proper dictionary as described above.
+                    It may also be a state_matcher_class object (see
+                    get_state_matcher).
 
                     Finally, one special value is accepted for the key field:
                     expression_key().  If such an entry exists, its value is
@@ -280,37 +437,99 @@ def compare_states(state, match_state, match_type="and"):
     match_type      This may be 'and' or 'or'.
     """
 
-    error_message = gv.valid_value(match_type, valid_values=["and", "or"])
-    if error_message != "":
+    if match_type not in ["and", "or"]:
+        error_message = gv.valid_value(match_type, valid_values=["and", "or"])
         BuiltIn().fail(gp.sprint_error(error_message))
 
+    return get_state_matcher(match_state, match_type).match(state)
+
+
+def get_ping_rc(ping_stats):
+    r"""
+    Return 0 if a host answered a reachability probe and 1 otherwise, as the
+    ping program would.
+
+    Description of argument(s):
+    ping_stats                      The statistics returned by
+                                    reachability_probe.probe_host or None if
+                                    the probe did not finish.
+    """
+
+    if ping_stats is not None and ping_stats["received"] > 0:
+        return 0
+    return 1
+
+
+def get_redfish_probe_states():
+    r"""
+    Return a status, ret_values tuple for the redfish states in the form
+    returned by BuiltIn().run_keyword_and_ignore_error.
+    """
+
     try:
-        match_state = return_state_constant(match_state)
-    except TypeError:
-        pass
+        return "PASS", rsp.get_redfish_states()
+    except Exception as ex:
+        return "FAIL", str(ex)
 
-    default_match = match_type == "and"
-    for key, match_state_value in match_state.items():
-        # Blank match_state_value means "don't care".
-        if match_state_value == "":
-            continue
-        if key == expressions_key():
-            for expr in match_state_value:
-                # Use python interpreter to evaluate the expression.
-                match = eval(expr)
-                if match != default_match:
-                    return match
-        else:
-            try:
-                match = (
-                    re.match(match_state_value, str(state[key])) is not None
-                )
-            except KeyError:
-                match = False
-            if match != default_match:
-                return match
 
-    return default_match
+def start_probe(probe_name, func, *args):
+    r"""
+    Start a sub-state probe on the probe thread pool and return a
+    (future, start_time) tuple for finish_probe.  If the same probe is still
+    running from an earlier call, its future is returned instead.
+
+    Description of argument(s):
+    probe_name                      The probe name (see probe_deadlines).
+    func                            The function which does the probing.
+    args                            The arguments of func.
+    """
+
+    global probe_executor
+
+    if probe_executor is None:
+        probe_executor = ThreadPoolExecutor(
+            max_workers=2 * len(probe_deadlines),
+            thread_name_prefix="state_probe",
+        )
+    future = running_probes.get(probe_name, None)
+    if future is None or future.done():
+        future = probe_executor.submit(func, *args)
+        running_probes[probe_name] = future
+
+    return future, time.time()
+
+
+def finish_probe(probe_name, probe, default, probe_seconds):
+    r"""
+    Wait for a sub-state probe started by start_probe to finish and return
+    its result, or default if it does not finish by its deadline.  The
+    time waited is saved in probe_seconds.
+
+    Description of argument(s):
+    probe_name                      The probe name (see probe_deadlines).
+    probe                           The (future, start_time) tuple returned
+                                    by start_probe.
+    default                         The value to return if the probe does
+                                    not finish in time.
+    probe_seconds                   The dictionary in which the probe's
+                                    latency is saved.
+    """
+
+    future, start_time = probe
+    remaining = probe_deadlines[probe_name] - (time.time() - start_time)
+    try:
+        result = future.result(timeout=max(0, remaining))
+    except FutureTimeoutError:
+        gp.qprint_timen(
+            "The " + probe_name + " probe did not finish within "
+            + str(probe_deadlines[probe_name]) + " seconds."
+        )
+        result = default
+    else:
+        running_probes.pop(probe_name, None)
+    probe_seconds[probe_name] = "%.3f" % (time.time() - start_time)
+
+    return result
 
 
 def get_os_state(
@@ -320,6 +539,7 @@ def get_os_state(
     req_states=default_os_req_states,
     os_up=True,
     quiet=None,
+    ping_rc=None,
 ):
     r"""
     Get component states for the operating system such as ping, login,
@@ -343,6 +563,9 @@ def get_os_state(
     quiet        Indicates whether status details (e.g. curl commands) should
                  be written to the console.
                  Defaults to either global value of ${QUIET} or to 1.
+    ping_rc      The return code of an OS ping already run by the caller (e.g.
+                 concurrently with other probes by get_state).  If None, this
+                 function pings the OS itself (see reachability_probe.py).
     """
 
     quiet = int(gp.get_var_value(quiet, 0))
@@ -386,13 +609,9 @@ def get_os_state(
     if os_up:
         if "os_ping" in req_states:
             # See if the OS pings.
-            rc, out_buf = gc.shell_cmd(
-                "ping -c 1 -w 2 " + os_host,
-                print_output=0,
-                show_err=0,
-                ignore_err=1,
-            )
-            if rc == 0:
+            if ping_rc is None:
+                ping_rc = get_ping_rc(rp.probe_host(os_host, 1, 2))
+            if ping_rc == 0:
                 os_ping = 1
 
         # Programming note: All attributes which do not require an ssh login
@@ -422,10 +641,14 @@ def get_os_state(
                 gp.dprint_vars(output, stderr)
                 gp.dprint_vars(rc, 1)
 
+    sub_state_values = {
+        "os_ping": os_ping,
+        "os_login": os_login,
+        "os_run_cmd": os_run_cmd,
+    }
     os_state = DotDict()
     for sub_state in req_states:
-        cmd_buf = "os_state['" + sub_state + "'] = str(" + sub_state + ")"
-        exec(cmd_buf)
+        os_state[sub_state] = str(sub_state_values[sub_state])
 
     return os_state
 
@@ -446,6 +669,11 @@ def get_state(
 
     Note that all substate values are strings.
 
+    The ping, packet_loss, redfish and os_ping sub-states are probed
+    concurrently with each other and with the BMC ssh commands, each within
+    its deadline (see probe_deadlines).  In debug mode, the state also has a
+    probe_seconds entry giving the time taken by each probe.
+
     Note: If elapsed_boot_time is included in req_states, it is the caller's
     duty to call set_start_boot_seconds() in order to set global
     start_boot_seconds.  elapsed_boot_time is the current time minus
@@ -541,32 +769,43 @@ def get_state(
     requested_host = ""
     attempts_left = ""
 
-    # Get the component states.
-    if "ping" in req_states:
-        # See if the OS pings.
-        rc, out_buf = gc.shell_cmd(
-            "ping -c 1 -w 2 " + bmc_host,
-            print_output=0,
-            show_err=0,
-            ignore_err=1,
-        )
-        if rc == 0:
-            ping = 1
+    master_req_rf = [
+        "redfish",
+        "host",
+        "requested_host",
+        "attempts_left",
+        "boot_progress",
+        "chassis",
+        "requested_chassisbmcrequested_bmc",
+    ]
 
+    req_rf = [
+        sub_state for sub_state in req_states if sub_state in master_req_rf
+    ]
+    need_rf = len(req_rf) > 0
+
+    # Start the probes which may run concurrently.  The ssh commands below
+    # run robot keywords, which may only be run by this thread.
+    probes = {}
+    if "ping" in req_states:
+        probes["ping"] = start_probe("ping", rp.probe_host, bmc_host, 1, 2)
     if "packet_loss" in req_states:
-        # See if the OS pings.
-        cmd_buf = (
-            "ping -c 5 -w 5 "
-            + bmc_host
-            + " | egrep 'packet loss' | sed -re 's/.* ([0-9]+)%.*/\\1/g'"
+        probes["packet_loss"] = start_probe(
+            "packet_loss", rp.probe_host, bmc_host, 5, 1
         )
-        rc, out_buf = gc.shell_cmd(
-            cmd_buf, print_output=0, show_err=0, ignore_err=1
+    if need_rf:
+        # The state probe keeps one redfish session across polls.
+        gp.dprint_issuing("rsp.get_redfish_states()")
+        probes["redfish"] = start_probe("redfish", get_redfish_probe_states)
+    if os_host != "" and "os_ping" in req_states:
+        probes["os_ping"] = start_probe(
+            "os_ping", rp.probe_host, os_host, 1, 2
         )
-        if rc == 0:
-            packet_loss = out_buf.rstrip("\n")
+    probe_seconds = DotDict()
 
+    # Get the component states.
     if "uptime" in req_states:
+        start_time = time.time()
         # Sometimes reading uptime results in a blank value. Call with
         # wait_until_keyword_succeeds to ensure a non-blank value is obtained.
         remote_cmd_buf = (
@@ -590,8 +829,10 @@ def get_state(
                 uptime = stdout
         except AssertionError as my_assertion_error:
             pass
+        probe_seconds["uptime"] = "%.3f" % (time.time() - start_time)
 
     if "epoch_seconds" in req_states or "elapsed_boot_time" in req_states:
+        start_time = time.time()
         date_cmd_buf = "date -u +%s"
         if USE_BMC_EPOCH_TIME:
             cmd_buf = ["BMC Execute Command", date_cmd_buf, "quiet=${1}"]
@@ -610,39 +851,34 @@ def get_state(
             )
             if shell_rc == 0:
                 epoch_seconds = out_buf.rstrip("\n")
+        probe_seconds["epoch_seconds"] = "%.3f" % (time.time() - start_time)
 
     if "elapsed_boot_time" in req_states:
         global start_boot_seconds
         elapsed_boot_time = int(epoch_seconds) - start_boot_seconds
 
-    master_req_rf = [
-        "redfish",
-        "host",
-        "requested_host",
-        "attempts_left",
-        "boot_progress",
-        "chassis",
-        "requested_chassisbmcrequested_bmc",
-    ]
+    if "ping" in probes:
+        ping_stats = finish_probe("ping", probes["ping"], None, probe_seconds)
+        gp.dprint_var(ping_stats)
+        if get_ping_rc(ping_stats) == 0:
+            ping = 1
+
+    if "packet_loss" in probes:
+        packet_loss_stats = finish_probe(
+            "packet_loss", probes["packet_loss"], None, probe_seconds
+        )
+        gp.dprint_var(packet_loss_stats)
+        if packet_loss_stats is not None:
+            packet_loss = packet_loss_stats["loss"]
 
-    req_rf = [
-        sub_state for sub_state in req_states if sub_state in master_req_rf
-    ]
-    need_rf = len(req_rf) > 0
     state = DotDict()
     if need_rf:
-        cmd_buf = ["Redfish Get States"]
-        gp.dprint_issuing(cmd_buf)
-        try:
-            status, ret_values = BuiltIn().run_keyword_and_ignore_error(
-                *cmd_buf
-            )
-        except Exception as ex:
-            # Robot raised UserKeywordExecutionFailed error exception.
-            gp.dprint_issuing("Retrying Redfish Get States")
-            status, ret_values = BuiltIn().run_keyword_and_ignore_error(
-                *cmd_buf
-            )
+        status, ret_values = finish_probe(
+            "redfish",
+            probes["redfish"],
+            ("FAIL", "The redfish probe timed out."),
+            probe_seconds,
+        )
 
         gp.dprint_vars(status, ret_values)
         if status == "PASS":
@@ -656,18 +892,38 @@ def get_state(
             state["bmc"] = ret_values["bmc"]
             state["boot_progress"] = ret_values["boot_progress"]
 
+    sub_state_values = {
+        "ping": ping,
+        "packet_loss": packet_loss,
+        "uptime": uptime,
+        "epoch_seconds": epoch_seconds,
+        "elapsed_boot_time": elapsed_boot_time,
+        "redfish": redfish,
+        "chassis": chassis,
+        "requested_chassis": requested_chassis,
+        "bmc": bmc,
+        "requested_bmc": requested_bmc,
+        "boot_progress": boot_progress,
+        "host": host,
+        "requested_host": requested_host,
+        "attempts_left": attempts_left,
+    }
     for sub_state in req_states:
         if sub_state in state:
             continue
         if sub_state.startswith("os_"):
             # We pass "os_" requests on to get_os_state.
             continue
-        cmd_buf = "state['" + sub_state + "'] = str(" + sub_state + ")"
-        exec(cmd_buf)
+        state[sub_state] = str(sub_state_values[sub_state])
+
+    if int(gp.get_stack_var("debug", 0)):
+        # The os_ping latency is added below.
+        state["probe_seconds"] = probe_seconds
 
     if os_host == "":
         # The caller has not specified an os_host so as far as we're concerned,
         # it doesn't exist.
+        stl.record_state(state)
         return state
 
     os_req_states = [
@@ -686,6 +942,11 @@ def get_state(
             if sub_state in req_states:
                 os_up_match[sub_state] = master_os_up_match[sub_state]
         os_up = compare_states(state, os_up_match)
+        ping_rc = None
+        if "os_ping" in probes:
+            ping_rc = get_ping_rc(
+                finish_probe("os_ping", probes["os_ping"], None, probe_seconds)
+            )
         os_state = get_os_state(
             os_host=os_host,
             os_username=os_username,
@@ -693,10 +954,13 @@ def get_state(
             req_states=os_req_states,
             os_up=os_up,
             quiet=quiet,
+            ping_rc=ping_rc,
         )
         # Append os_state dictionary to ours.
         state.update(os_state)
 
+    stl.record_state(state)
+
     return state
 
 
@@ -744,6 +1008,8 @@ def check_state(
                       ...  bmc=^Ready$
                       ...  boot_progress=^OSStart$
                       ${state}=  Check State  &{match_state}
+                      This may also be a state_matcher_class object (see
+                      get_state_matcher).
     invert            If this flag is set, this function will succeed if the
                       states do NOT match.
     print_string      This function will print this string to the console prior
@@ -769,15 +1035,8 @@ def check_state(
 
     gp.gp_print(print_string)
 
-    try:
-        match_state = return_state_constant(match_state)
-    except TypeError:
-        pass
-
-    req_states = list(match_state.keys())
-    # Remove special-case match key from req_states.
-    if expressions_key() in req_states:
-        req_states.remove(expressions_key())
+    matcher = get_state_matcher(match_state)
+    req_states = matcher.req_states
     # Initialize state.
     state = get_state(
         bmc_host=bmc_host,
@@ -799,7 +1058,7 @@ def check_state(
         # appropriately.
         return state
 
-    match = compare_states(state, match_state)
+    match = matcher.match(state)
 
     if invert and match:
         fail_msg = (
@@ -819,6 +1078,69 @@ def check_state(
     return state
 
 
+def wait_until_state_succeeds(scheduler, wait_time, cmd_buf, listener=None):
+    r"""
+    Run the keyword in cmd_buf until it succeeds and return its result and
+    the number of times it was run.  The delay before each new run is taken
+    from the scheduler.  If the Redfish SSE listener is given, the keyword is
+    also run again when the listener receives a state related event, but no
+    sooner than the scheduler's min_interval after the previous run.
+    If the keyword does not succeed within wait_time, raise AssertionError as
+    wait_until_keyword_succeeds does.
+
+    Description of argument(s):
+    scheduler                       A poll_scheduler_class object.
+    wait_time                       The total amount of time to wait (in Robot
+                                    Framework's time format).
+    cmd_buf                         The keyword name and its arguments.
+    listener                        A running redfish_sse_listener_class
+                                    object or None.
+    """
+
+    start_time = time.time()
+    end_time = start_time + timestr_to_secs(wait_time)
+    polls = 0
+    while True:
+        if listener is not None:
+            event_count = listener.get_event_count()
+        poll_time = time.time()
+        status, ret_values = BuiltIn().run_keyword_and_ignore_error(*cmd_buf)
+        polls += 1
+        if status == "PASS":
+            return ret_values, polls
+        now = time.time()
+        remaining_secs = end_time - now
+        if remaining_secs <= 0:
+            raise AssertionError(
+                "Keyword '"
+                + cmd_buf[0]
+                + "' failed after retrying for "
+                + str(wait_time)
+                + ". The last error was: "
+                + str(ret_values)
+            )
+        # The last poll is made at the deadline rather than after it.
+        wake_time = now + min(
+            scheduler.next_delay(now - start_time), remaining_secs
+        )
+        if listener is not None and listener.is_running():
+            if listener.wait_for_event(wake_time - now, event_count):
+                # Poll early, but keep polls min_interval apart so that a
+                # burst of events does not cause back to back state checks.
+                wake_time = min(wake_time, poll_time + scheduler.min_interval)
+            elif listener.is_running():
+                continue
+            # Otherwise, the listener has stopped (wait_for_event returns at
+            # once) and the rest of the delay is slept below.
+        # Sleep in short slices so that an exit_wait_early_message set by a
+        # signal handler is acted upon promptly.
+        while exit_wait_early_message == "":
+            sleep_secs = wake_time - time.time()
+            if sleep_secs <= 0:
+                break
+            time.sleep(min(sleep_secs, 1))
+
+
 def wait_state(
     match_state=(),
     wait_time="1 min",
@@ -831,6 +1153,8 @@ def wait_state(
     os_username="",
     os_password="",
     quiet=None,
+    strategy=None,
+    history_key="",
 ):
     r"""
     Wait for the Open BMC machine's composite state to match the specified
@@ -848,9 +1172,13 @@ def wait_state(
     wait_time         The total amount of time to wait for the desired state.
                       This value may be expressed in Robot Framework's time
                       format (e.g. 1 minute, 2 min 3 s, 4.5).
-    interval          The amount of time between state checks.
-                      This value may be expressed in Robot Framework's time
-                      format (e.g. 1 minute, 2 min 3 s, 4.5).
+    interval          The amount of time between state checks (the longest
+                      amount of time for the exponential and learned
+                      strategies).  This value may be expressed in Robot
+                      Framework's time format (e.g. 1 minute, 2 min 3 s,
+                      4.5).  If the Redfish SSE listener is running (see
+                      redfish_sse.py), the state is also checked as soon as a
+                      state related event arrives.
     invert            If this flag is set, this function will for the state of
                       the machine to cease to match the match state.
     bmc_host          The DNS name or IP address of the BMC.
@@ -868,6 +1196,15 @@ def wait_state(
     quiet             Indicates whether status details should be written to the
                       console.  Defaults to either global value of ${QUIET} or
                       to 1.
+    strategy          The polling strategy ("fixed", "exponential" or
+                      "learned").  See poll_scheduler.py for details.  This
+                      defaults to global ${WAIT_STATE_POLL_STRATEGY} or to
+                      "learned".
+    history_key       The key under which the duration of this wait is
+                      recorded for the learned strategy (e.g. the boot type).
+                      Waits with different keys should be expected to take
+                      different amounts of time.  If "", the duration is not
+                      recorded and the learned strategy polls every interval.
     """
 
     quiet = int(gp.get_var_value(quiet, 0))
@@ -877,15 +1214,30 @@ def wait_state(
     except TypeError:
         pass
 
+    sse_listener = rsse.get_redfish_sse_listener()
+    scheduler = ps.poll_scheduler_class(
+        strategy, timestr_to_secs(interval), history_key=history_key
+    )
+
     if not quiet:
         if invert:
             alt_text = "cease to "
         else:
             alt_text = ""
+        if sse_listener is None:
+            event_text = ""
+        else:
+            event_text = "(and on each Redfish state event) "
+        if scheduler.strategy == "exponential" or scheduler.window:
+            interval_text = "at most every " + str(interval)
+        else:
+            interval_text = "every " + str(interval)
         gp.print_timen(
-            "Checking every "
-            + str(interval)
-            + " for up to "
+            "Checking "
+            + interval_text
+            + " "
+            + event_text
+            + "for up to "
             + str(wait_time)
             + " for the state of the machine to "
             + alt_text
@@ -903,9 +1255,10 @@ def wait_state(
         # In debug we print state so no need to print the "#".
         print_string = ""
     check_state_quiet = 1 - debug
+    # The match state is compiled once for all of the checks.
     cmd_buf = [
         "Check State",
-        match_state,
+        get_state_matcher(match_state),
         "invert=${" + str(invert) + "}",
         "print_string=" + print_string,
         "bmc_host=" + bmc_host,
@@ -917,11 +1270,19 @@ def wait_state(
         "quiet=${" + str(check_state_quiet) + "}",
     ]
     gp.dprint_issuing(cmd_buf)
+    start_time = time.time()
     try:
-        state = BuiltIn().wait_until_keyword_succeeds(
-            wait_time, interval, *cmd_buf
+        state, polls = wait_until_state_succeeds(
+            scheduler, wait_time, cmd_buf, sse_listener
         )
     except AssertionError as my_assertion_error:
+        gp.lprint_timen(
+            "The wait failed after "
+            + str(scheduler.polls + 1)
+            + " polls over "
+            + "%.1f" % (time.time() - start_time)
+            + " seconds."
+        )
         gp.printn()
         message = my_assertion_error.args[0]
         BuiltIn().fail(message)
@@ -934,8 +1295,20 @@ def wait_state(
         set_exit_wait_early_message("")
         BuiltIn().fail(gp.sprint_error(message))
 
+    wait_seconds = time.time() - start_time
+    scheduler.record_success(wait_seconds)
+    poll_message = (
+        "The wait took "
+        + str(polls)
+        + " polls over "
+        + "%.1f" % wait_seconds
+        + " seconds."
+    )
+    gp.lprint_timen(poll_message)
+
     if not quiet:
         gp.printn()
+        gp.print_timen(poll_message)
         if invert:
             gp.print_timen("The states no longer match:")
         else:
@@ -991,7 +1364,13 @@ def wait_for_comm_cycle(start_boot_seconds, quiet=None):
             (expressions_key(), [expr]),
         ]
     )
-    wait_state(match_state, wait_time="12 mins", interval="5 seconds")
+    # Uptime is read over ssh.  Until the BMC has rebooted, make any redfish
+    # requests fail fast rather than wait out their timeouts and retries.
+    rrp.open_redfish_circuit()
+    try:
+        wait_state(match_state, wait_time="12 mins", interval="5 seconds")
+    finally:
+        rrp.close_redfish_circuit()
 
     gp.qprint_timen("Verifying that Redfish API interface is working.")
     match_state = DotDict([("redfish", "^1$")])
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026, Arm Limited or its affiliates. All rights reserved.
+# SPDX-License-Identifier : Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""
+This module records the state samples taken during each boot as a time
+series and breaks each boot down into phases.
+
+While a timeline is running (see start_state_timeline), every state
+returned by state.get_state (including those taken by check_state and
+wait_state) is appended to an NDJSON file, one compact JSON object per
+line.  The first line describes the boot:
+
+{"boot":"Redfish Power On","start":1792312194.512}
+{"t":0.412,"ping":"1","chassis":"Off",...}
+{"t":12.906,"ping":"1","chassis":"On",...}
+
+t is the number of seconds since the start of the boot.
+
+When the timeline is stopped, the boot is broken down into phases between
+these milestones, each the first sample in which it was seen.  The power on
+begins after the last sample with chassis Off or, for restarts in which the
+chassis stays on, at the last sample in which boot_progress moved back (e.g.
+from OSRunning to None) or os_login went from 1 to 0.
+
+chassis On                          The first sample of the power on.
+boot_progress <value>               Each new boot_progress value (e.g.
+                                    "boot_progress OSRunning").
+os_login                            os_login is 1.
+chassis Off                         For boots which end with chassis Off,
+                                    the start of the final Off samples.
+
+The phases of each boot are appended to state_timeline_phases.ndjson so
+that boot times can be compared across runs.  print_state_timeline_summary
+prints the minimum, average and maximum of each phase for each boot type.
+
+The timelines are written to ${STATE_TIMELINE_DIR} (default
+${OUTPUT DIR}/state_timeline).  Recording may be turned off with
+${STATE_TIMELINE}.
+
+-v STATE_TIMELINE:1
+-v STATE_TIMELINE_DIR:<path>
+
+The phase breakdown is tested by the examples in get_milestones, which may
+be run with "python3 -m doctest state_timeline.py" from the lib directory.
+"""
+
+import json
+import os
+import re
+import time
+
+import gen_print as gp
+import gen_robot_utils as gru
+
+phases_file_name = "state_timeline_phases.ndjson"
+
+# The boot_progress values which do not mark a milestone.
+no_boot_progress = [None, "", "NA", "None"]
+
+# The order of the Redfish BootProgress LastState values during a boot.  A
+# move to an earlier value shows that the machine has been restarted.
+boot_progress_order = [
+    "None",
+    "PrimaryProcessorInitializationStarted",
+    "BusInitializationStarted",
+    "MemoryInitializationStarted",
+    "SecondaryProcessorInitializationStarted",
+    "PCIResourceConfigStarted",
+    "SystemHardwareInitializationComplete",
+    "SetupEntered",
+    "OSBootStarted",
+    "OSRunning",
+]
+
+
+def get_timeline_dir_path():
+    r"""
+    Return the path of the directory to which timelines are written,
+    creating it if necessary.
+    """
+
+    dir_path = gru.get_robot_var_value("${STATE_TIMELINE_DIR}", None)
+    if dir_path is None:
+        dir_path = os.path.join(
+            gru.get_robot_var_value("${OUTPUT DIR}", "."), "state_timeline"
+        )
+    os.makedirs(dir_path, exist_ok=True)
+
+    return dir_path
+
+
+def get_power_on_ix(samples):
+    r"""
+    Return the index of the first sample of the last power on (see the
+    module description).
+
+    Description of argument(s):
+    samples                         See get_milestones.
+    """
+
+    first_ix = 0
+    last_rank = None
+    last_os_login = None
+    for ix, (seconds, chassis, boot_progress, os_login) in enumerate(
+        samples
+    ):
+        if chassis == "Off":
+            first_ix = ix + 1
+        if boot_progress in boot_progress_order:
+            rank = boot_progress_order.index(boot_progress)
+            if last_rank is not None and rank < last_rank:
+                first_ix = ix
+            last_rank = rank
+        if os_login is not None:
+            if last_os_login == "1" and os_login == "0":
+                first_ix = ix
+            last_os_login = os_login
+
+    return first_ix
+
+
+def get_milestones(samples):
+    r"""
+    Return a list of (milestone, seconds) tuples for the samples of one boot
+    (see the module description).
+
+    Example of a restart in which the chassis stays on:
+
+    >>> samples = [
+    ...     (0.4, "On", "OSRunning", "1"),
+    ...     (5.0, "On", "OSRunning", "0"),
+    ...     (9.0, "On", "None", "0"),
+    ...     (20.0, "On", "PrimaryProcessorInitializationStarted", "0"),
+    ...     (60.0, "On", "OSRunning", "0"),
+    ...     (75.0, "On", "OSRunning", "1"),
+    ... ]
+    >>> for name, seconds in get_milestones(samples):
+    ...     print(name, seconds)
+    chassis On 9.0
+    boot_progress PrimaryProcessorInitializationStarted 20.0
+    boot_progress OSRunning 60.0
+    os_login 75.0
+
+    Description of argument(s):
+    samples                         A list of (seconds, chassis,
+                                    boot_progress, os_login) tuples.
+    """
+
+    milestones = []
+    seen = set()
+
+    def add(name, seconds):
+        if name not in seen:
+            seen.add(name)
+            milestones.append((name, seconds))
+
+    # Only the samples of the last power on belong to the boot.
+    first_ix = get_power_on_ix(samples)
+    for seconds, chassis, boot_progress, os_login in samples[first_ix:]:
+        if chassis == "On":
+            add("chassis On", seconds)
+        if "chassis On" in seen and boot_progress not in no_boot_progress:
+            add("boot_progress " + boot_progress, seconds)
+        if os_login == "1":
+            add("os_login", seconds)
+
+    if samples and samples[-1][1] == "Off":
+        off_ix = len(samples) - 1
+        while off_ix > 0 and samples[off_ix - 1][1] == "Off":
+            off_ix -= 1
+        add("chassis Off", samples[off_ix][0])
+
+    return milestones
+
+
+def get_phases(milestones):
+    r"""
+    Return a dictionary of phase: seconds, in order, for a list of
+    milestones (see get_milestones).  Each phase is named
+    "<milestone> -> <milestone>" and the first starts at "start".
+
+    Description of argument(s):
+    milestones                      A list of (milestone, seconds) tuples.
+    """
+
+    phases = {}
+    previous_name, previous_seconds = "start", 0.0
+    for name, seconds in milestones:
+        phases[previous_name + " -> " + name] = round(
+            seconds - previous_seconds, 3
+        )
+        previous_name, previous_seconds = name, seconds
+
+    return phases
+
+
+class state_timeline_class:
+    r"""
+    The timeline of one boot.  See the module description for details.
+    """
+
+    def __init__(self, file_path, boot_name):
+        r"""
+        Description of argument(s):
+        file_path                   The path of the NDJSON file.
+        boot_name                   The name of the boot (e.g. "Redfish Power
+                                    On").
+        """
+
+        self.file_path = file_path
+        self.boot_name = boot_name
+        self.start_time = time.time()
+        # Only the sub-states used for the phases are kept in memory.
+        self.samples = []
+        # Each sample is written out as it is taken, so that the timeline of
+        # a boot which hangs may be read while the boot runs.
+        self.file = open(file_path, "w", buffering=1)
+        self.file.write(
+            json.dumps(
+                {"boot": boot_name, "start": round(self.start_time, 3)},
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+
+    def record(self, state):
+        r"""
+        Append one state sample to the timeline.
+
+        Description of argument(s):
+        state                       The state dictionary returned by
+                                    get_state.
+        """
+
+        seconds = round(time.time() - self.start_time, 3)
+        self.samples.append(
+            (
+                seconds,
+                state.get("chassis", None),
+                state.get("boot_progress", None),
+                state.get("os_login", None),
+            )
+        )
+        sample = {"t": seconds}
+        sample.update(state)
+        self.file.write(
+            json.dumps(sample, separators=(",", ":"), default=str) + "\n"
+        )
+
+    def close(self):
+        r"""
+        Close the timeline file and return the dictionary of phases (see
+        get_phases).
+        """
+
+        self.file.close()
+
+        return get_phases(get_milestones(self.samples))
+
+
+# The running timeline.  None when no boot is being recorded.
+timeline = None
+
+# A list of (boot name, status, phases) tuples, one per recorded boot.
+phase_results = []
+
+
+def start_state_timeline(boot_name):
+    r"""
+    Start recording the states of a boot.  Any running timeline is stopped
+    first.
+
+    Description of argument(s):
+    boot_name                       The name of the boot (e.g. "Redfish Power
+                                    On").
+    """
+
+    global timeline
+
+    if timeline is not None:
+        stop_state_timeline()
+    if not int(gru.get_robot_var_value("${STATE_TIMELINE}", 1)):
+        return
+    file_name = (
+        time.strftime("%y%m%d.%H%M%S.")
+        + re.sub(r"[^\w.-]+", "_", boot_name)
+        + ".ndjson"
+    )
+    timeline = state_timeline_class(
+        os.path.join(get_timeline_dir_path(), file_name), boot_name
+    )
+
+
+def record_state(state):
+    r"""
+    Append a state sample to the running timeline, if any.
+
+    Description of argument(s):
+    state                           The state dictionary returned by
+                                    get_state.
+    """
+
+    if timeline is not None:
+        timeline.record(state)
+
+
+def stop_state_timeline(status="PASS"):
+    r"""
+    Stop recording the states of a boot and return its phases (see
+    get_phases), or None if no timeline was running.  The phases are also
+    appended to state_timeline_phases.ndjson.
+
+    Description of argument(s):
+    status                          The result of the boot ("PASS" or
+                                    "FAIL").  Only passing boots are
+                                    included in the summary.
+    """
+
+    global timeline
+
+    if timeline is None:
+        return None
+    stopped_timeline = timeline
+    timeline = None
+    phases = stopped_timeline.close()
+    phase_results.append((stopped_timeline.boot_name, status, phases))
+    phases_file_path = os.path.join(
+        os.path.dirname(stopped_timeline.file_path), phases_file_name
+    )
+    with open(phases_file_path, "a") as file:
+        file.write(
+            json.dumps(
+                {
+                    "boot": stopped_timeline.boot_name,
+                    "start": round(stopped_timeline.start_time, 3),
+                    "status": status,
+                    "timeline": os.path.basename(stopped_timeline.file_path),
+                    "phases": phases,
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+
+    return phases
+
+
+def get_state_timeline_summary():
+    r"""
+    Return a dictionary of boot name: phase: statistics for the passing
+    boots recorded in this run.  The statistics are a dictionary with count,
+    min, avg and max keys.
+    """
+
+    durations = {}
+    for boot_name, status, phases in phase_results:
+        if status != "PASS":
+            continue
+        boot_durations = durations.setdefault(boot_name, {})
+        for phase, seconds in phases.items():
+            boot_durations.setdefault(phase, []).append(seconds)
+
+    summary = {}
+    for boot_name, boot_durations in durations.items():
+        summary[boot_name] = {
+            phase: {
+                "count": len(seconds),
+                "min": min(seconds),
+                "avg": round(sum(seconds) / len(seconds), 3),
+                "max": max(seconds),
+            }
+            for phase, seconds in boot_durations.items()
+        }
+
+    return summary
+
+
+def print_state_timeline_summary():
+    r"""
+    Print the phase statistics of the boots recorded in this run (see
+    get_state_timeline_summary).
+    """
+
+    summary = get_state_timeline_summary()
+    if summary:
+        gp.qprint_timen("Boot phase durations in seconds:")
+        gp.qprint_var(summary)